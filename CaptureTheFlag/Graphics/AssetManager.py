@@ -0,0 +1,66 @@
+import os
+import time
+
+import pygame
+
+## Loads the images used by the game, decoding each image file only once.
+## Each image is converted to the display's pixel format when it's loaded, so it can be blitted without
+## being converted again, and the same surface is then shared by everything that uses the image.  Since
+## the surfaces are shared, they must not be modified; copy an image first if it needs to be changed.
+## Images can only be loaded after the display mode has been set.
+class AssetManager(object):
+    ## The loaded images, keyed by their normalized filepaths.
+    __ImagesByFilepath = {}
+
+    ## The number of times an image has been requested.
+    RequestCount = 0
+    ## The number of image files that have been decoded.
+    LoadCount = 0
+    ## The total size of the pixel data of all loaded images, in bytes.
+    LoadedByteCount = 0
+    ## The total time spent decoding and converting images, in seconds.
+    DecodeTimeInSeconds = 0.0
+
+    ## Gets an image, loading it if it hasn't been loaded yet.
+    ## \param[in]   image_filepath - The filepath of the image.
+    ## \return  The image as a pygame.Surface in the display's pixel format.  It is shared, so it must not be modified.
+    @staticmethod
+    def GetImage(image_filepath):
+        # CHECK IF THE IMAGE HAS ALREADY BEEN LOADED.
+        AssetManager.RequestCount += 1
+        normalized_filepath = os.path.normpath(image_filepath)
+        image = AssetManager.__ImagesByFilepath.get(normalized_filepath)
+        if image is not None:
+            return image
+
+        # DECODE THE IMAGE AND CONVERT IT TO THE DISPLAY'S PIXEL FORMAT.
+        # Images with per-pixel transparency keep it.
+        start_time_in_seconds = time.perf_counter()
+        image = pygame.image.load(normalized_filepath)
+        image_has_alpha = bool(image.get_flags() & pygame.SRCALPHA)
+        image = image.convert_alpha() if image_has_alpha else image.convert()
+        AssetManager.DecodeTimeInSeconds += time.perf_counter() - start_time_in_seconds
+
+        # STORE THE IMAGE.
+        AssetManager.LoadCount += 1
+        AssetManager.LoadedByteCount += image.get_pitch() * image.get_height()
+        AssetManager.__ImagesByFilepath[normalized_filepath] = image
+        return image
+
+    ## Discards all loaded images, so that they're loaded again the next time they're requested.
+    ## This must be called if the display's pixel format changes.  The statistics are not reset.
+    @staticmethod
+    def Clear():
+        AssetManager.__ImagesByFilepath.clear()
+
+    ## Describes how many images have been loaded and how long it took.
+    ## \return  A single-line summary of the loading statistics.
+    @staticmethod
+    def GetStatisticsSummary():
+        MILLISECONDS_PER_SECOND = 1000
+        BYTES_PER_KIBIBYTE = 1024
+        return '{} image requests, {} images decoded, {:.1f} KiB, {:.1f} ms decoding'.format(
+            AssetManager.RequestCount,
+            AssetManager.LoadCount,
+            AssetManager.LoadedByteCount / BYTES_PER_KIBIBYTE,
+            AssetManager.DecodeTimeInSeconds * MILLISECONDS_PER_SECOND)
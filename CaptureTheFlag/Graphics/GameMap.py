@@ -38,6 +38,13 @@ class GameMap(object):
         ## a two-tuple of the coordinates of the block the object is currently occupying and the 
         ## value is the object.
         self.Map = {}
+        ## All walls in the map.
+        self.__Walls = []
+        ## All objects in the map other than walls.
+        self.__DynamicObjects = []
+        ## A counter that is incremented whenever a wall is added to or removed from the map.
+        ## Anything drawn from the walls alone can be reused as long as this hasn't changed.
+        self.StaticVersion = 0
         
         # PARSE MAP FILE.
         self.ParseMap()
@@ -78,6 +85,11 @@ class GameMap(object):
                         x_position,
                         y_position)
                     self.Map[(row_index, column_index)] = object
+                    if isinstance(object, Wall):
+                        self.__Walls.append(object)
+                        self.StaticVersion += 1
+                    else:
+                        self.__DynamicObjects.append(object)
                 except KeyError:
                     # If the mapping didn't exist, then the current space is unoccupied.
                     pass
@@ -93,6 +105,16 @@ class GameMap(object):
             player_found = (isinstance(object, Player))
             if player_found:
                 return object
+
+    ## Gets all walls from the game map.
+    ## \return  A list of all Wall objects in the map.
+    def GetWalls(self):
+        return list(self.__Walls)
+
+    ## Gets all objects other than walls from the game map.
+    ## \return  A list of all non-Wall objects in the map.
+    def GetDynamicObjects(self):
+        return list(self.__DynamicObjects)
                 
     ## Gets the grid position for the specified coordinates.
     ## \param[in]   coordinates - A two-tuple of the X and Y coordinates.
@@ -111,4 +133,9 @@ class GameMap(object):
     ## \date    08/25/2018
     def RemoveObject(self, object):
         grid_position = self.GetGridPosition(object.TopLeftCornerPosition)
-        self.Map.pop(grid_position)
+        removed_object = self.Map.pop(grid_position)
+        if isinstance(removed_object, Wall):
+            self.__Walls.remove(removed_object)
+            self.StaticVersion += 1
+        else:
+            self.__DynamicObjects.remove(removed_object)
@@ -16,22 +16,50 @@ class GameWindow():
         self.Screen = pygame.display.set_mode((height, width))
         self.Screen.fill((0,0,0))
 
+        ## The walls of the map drawn once onto a cleared surface the size of the screen.
+        ## Walls never move, so each frame starts by drawing this instead of every wall.
+        self.__Background = None
+        ## The (game map, GameMap.StaticVersion) two-tuple that the background was drawn from.
+        self.__BackgroundKey = None
+
     ## Updates the screen by clearing it and drawing all of the sprites in their new positions
     ## based on the game map.
     ## \param[in]   game_map - The game map to use in redrawing all objects to the screen.
     ## \author  Michael Watkinson
     ## \date    08/25/2018
     def Update(self, game_map):
-        # CLEAR THE GAME WINDOW.
-        self.Clear()
+        # DRAW THE BACKGROUND.
+        # This clears the game window and draws all of the walls at once.
+        background = self.GetBackground(game_map)
+        self.Screen.blit(background, (0, 0))
         
-        # DRAW ALL OBJECTS IN THE GAME MAP.
-        for game_object in game_map.Map.values():
+        # DRAW ALL OTHER OBJECTS IN THE GAME MAP.
+        for game_object in game_map.GetDynamicObjects():
             self.__DrawImage(game_object)
         
         # UPDATE THE DISPLAY TO MAKE THE UPDATED OBJECTS VISIBLE.
         pygame.display.update()
 
+    ## Gets the background for a map, redrawing it only if this is a different map
+    ## or its walls have changed since the background was last drawn.
+    ## \param[in]   game_map - The GameMap to get the background for.
+    ## \return  A surface the size of the screen with all of the walls in the map drawn on it.
+    def GetBackground(self, game_map):
+        # CHECK IF THE BACKGROUND IS STILL UP TO DATE.
+        background_key = (game_map, game_map.StaticVersion)
+        background_up_to_date = (self.__Background is not None) and (background_key == self.__BackgroundKey)
+        if background_up_to_date:
+            return self.__Background
+
+        # DRAW THE WALLS ONTO A CLEARED BACKGROUND.
+        background = pygame.Surface(self.Screen.get_size()).convert()
+        background.fill((0,0,0))
+        for wall in game_map.GetWalls():
+            background.blit(wall.Image, wall.TopLeftCornerPosition)
+        self.__Background = background
+        self.__BackgroundKey = background_key
+        return background
+
     ## Clears the screen.
     ## \author  CJ Harper
     ## \date    08/04/2018
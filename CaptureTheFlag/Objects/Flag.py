@@ -1,5 +1,5 @@
-import pygame
 import Constants
+from Graphics.AssetManager import AssetManager
 from .GameObject import GameObject
 
 ## The flag the player is trying to obtain and bring back to the goal.
@@ -13,7 +13,7 @@ class Flag(GameObject):
     ## \date    08/25/2018
     def __init__(self, initial_x_position, initial_y_position):
         GameObject.__init__(self, initial_x_position, initial_y_position)
-        self.Image = pygame.image.load(Constants.FLAG_IMAGE_FILEPATH).convert()
+        self.Image = AssetManager.GetImage(Constants.FLAG_IMAGE_FILEPATH)
 
     ## Moves the flag to the specified location.
     ## \param[in]   x_position - The X position to move the flag to.
@@ -1,5 +1,5 @@
-import pygame
 import Constants
+from Graphics.AssetManager import AssetManager
 from .GameObject import GameObject
 
 ## Represents the goal the player is trying to get the flag into.
@@ -13,5 +13,5 @@ class Goal(GameObject):
     ## \date    08/25/2018
     def __init__(self, x_position, y_position):
         GameObject.__init__(self, x_position, y_position)
-        self.Image = pygame.image.load(Constants.GOAL_IMAGE_FILEPATH).convert()
+        self.Image = AssetManager.GetImage(Constants.GOAL_IMAGE_FILEPATH)
     
\ No newline at end of file
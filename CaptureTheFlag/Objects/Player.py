@@ -1,5 +1,5 @@
-import pygame
 import Constants
+from Graphics.AssetManager import AssetManager
 from .GameObject import GameObject
 
 ## Represents the player character.
@@ -13,8 +13,8 @@ class Player(GameObject):
     ## \date    08/25/2018
     def __init__(self, initial_x_position : int, initial_y_position : int):
         GameObject.__init__(self, initial_x_position, initial_y_position)
-        self.__DefaultImage = pygame.image.load(Constants.PLAYER_IMAGE_FILEPATH).convert()
-        self.__WithFlagImage = pygame.image.load(Constants.PLAYER_WITH_FLAG_IMAGE_FILEPATH).convert()
+        self.__DefaultImage = AssetManager.GetImage(Constants.PLAYER_IMAGE_FILEPATH)
+        self.__WithFlagImage = AssetManager.GetImage(Constants.PLAYER_WITH_FLAG_IMAGE_FILEPATH)
 
         ## The current image to show for the player. The default image is used until an action occurs
         ## which would change this from the default.
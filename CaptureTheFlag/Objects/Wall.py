@@ -1,5 +1,5 @@
-import pygame
 import Constants
+from Graphics.AssetManager import AssetManager
 from .GameObject import GameObject
 
 ## Represents a wall or a boundary in the game that the player cannot cross.
@@ -13,5 +13,5 @@ class Wall(GameObject):
     ## \date    08/25/2018
     def __init__(self, x_position, y_position):
         GameObject.__init__(self, x_position, y_position)
-        self.Image = pygame.image.load(Constants.WALL_IMAGE_FILEPATH).convert()
+        self.Image = AssetManager.GetImage(Constants.WALL_IMAGE_FILEPATH)
     
\ No newline at end of file
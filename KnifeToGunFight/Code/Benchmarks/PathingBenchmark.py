@@ -0,0 +1,74 @@
+import os
+import random
+import sys
+import time
+
+import pygame
+
+## Times each pathing engine finding paths to the player on every level map.
+## Paths are found from a fixed set of random grid positions on each level so that
+## every engine does the same work, and the path cache is cleared before every path
+## so that only the search itself is measured.
+## \param[in]   paths_per_level - The number of paths to find on each level.
+## \param[in]   random_seed - The seed for choosing the start positions of the paths.
+def RunBenchmark(paths_per_level = 200, random_seed = 0):
+    # These are imported here since they must be imported after the current directory has been set.
+    from Graphics.LevelMap import LevelMap
+    from Math.Vector2 import Vector2
+    from Utilities.Pathing import Pathing, PathingEngine
+
+    # BENCHMARK EACH LEVEL.
+    level_number = 1
+    while os.path.exists('../Maps/Level{}.txt'.format(level_number)):
+        # CHOOSE THE PATHS TO FIND.
+        level_map = LevelMap('../Maps/Level{}.txt'.format(level_number))
+        player_column_index, player_row_index = level_map.GetGridPosition(level_map.GetPlayer().Coordinates.center)
+        destination_grid_position = Vector2(player_column_index, player_row_index)
+        random_number_generator = random.Random(random_seed)
+        start_grid_positions = [
+            Vector2(random_number_generator.randrange(level_map.MapWidth), random_number_generator.randrange(level_map.MapHeight))
+            for path_index in range(paths_per_level)]
+
+        # TIME EACH ENGINE.
+        print('Level{} ({}x{}):'.format(level_number, level_map.MapWidth, level_map.MapHeight))
+        for engine in PathingEngine:
+            pathing = Pathing(level_map, engine)
+            total_path_length = 0
+            start_time_in_seconds = time.perf_counter()
+            for start_grid_position in start_grid_positions:
+                pathing.ClearCache()
+                path = pathing.GetPath(start_grid_position, destination_grid_position)
+                if path is not None:
+                    total_path_length += len(path)
+            elapsed_time_in_seconds = time.perf_counter() - start_time_in_seconds
+
+            # REPORT THE RESULTS.
+            # The total path length is reported so that engines can be checked to find equally short paths.
+            MICROSECONDS_PER_SECOND = 1000000
+            microseconds_per_path = (elapsed_time_in_seconds * MICROSECONDS_PER_SECOND) / paths_per_level
+            expanded_node_count = ''
+            if PathingEngine.ThirdPartyAStar != engine:
+                expanded_node_count = '  {} nodes expanded'.format(pathing.GridSearch.TotalExpandedNodeCount)
+            print('    {:<16} {:>10.1f} us/path  total length {}{}'.format(
+                engine.name,
+                microseconds_per_path,
+                total_path_length,
+                expanded_node_count))
+
+        level_number += 1
+
+if __name__ == '__main__':
+    # SET CWD.
+    # Paths to images and maps are relative to the main code directory.
+    code_directory_path = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+    os.chdir(code_directory_path)
+    sys.path.insert(0, code_directory_path)
+
+    # INITIALIZE PYGAME WITHOUT A VISIBLE WINDOW.
+    # A display is still needed since game objects convert their images when created.
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+
+    # RUN THE BENCHMARK.
+    RunBenchmark()
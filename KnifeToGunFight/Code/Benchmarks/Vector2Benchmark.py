@@ -0,0 +1,171 @@
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+import pygame
+
+## A copy of the original mutable Vector2, kept only so that the benchmark can compare against it.
+## Its components are stored in a per-instance dictionary, and its hash is the XOR of its components,
+## which gives every (x, y) and (y, x) pair, and every (n, n) position, the same hash.
+class MutableVector2(object):
+    ## Initializes the vector's components.
+    ## \param[in]   x - The x component.
+    ## \param[in]   y - The y component.
+    def __init__(self, x, y):
+        self.X = x
+        self.Y = y
+
+    ## Returns the vector as an (x, y) tuple.
+    ## \return  The vector as an (x, y) tuple.
+    def AsXYTuple(self):
+        return (self.X, self.Y)
+
+    ## Iterates over the components, so the vector can be used where the map expects an (x, y) tuple.
+    ## The original vector didn't support this, so it slightly slows down the original vector's A* results.
+    def __iter__(self):
+        return iter((self.X, self.Y))
+
+    ## Compares the vector to another vector.
+    ## \return  True if the two vectors have the same components, or false otherwise.
+    def __eq__(self, other):
+        if isinstance(other, MutableVector2):
+            return (self.X == other.X) and (self.Y == other.Y)
+        return False
+
+    ## Returns a hash value for the vector.
+    ## \return  The hash of the vector.
+    def __hash__(self):
+        return self.X ^ self.Y
+
+## Times creating vectors and measures how much memory each one takes.
+## \param[in]   vector_class - The vector class to benchmark.
+## \param[in]   vector_count - The number of vectors to create.
+## \return  A (microseconds per vector, bytes per vector) two-tuple.
+def MeasureAllocation(vector_class, vector_count):
+    # TIME CREATING THE VECTORS.
+    start_time_in_seconds = time.perf_counter()
+    vectors = [vector_class(index, -index) for index in range(vector_count)]
+    elapsed_time_in_seconds = time.perf_counter() - start_time_in_seconds
+
+    # MEASURE THE MEMORY USED BY THE VECTORS.
+    # The memory for the list holding the vectors is measured separately so it can be excluded.
+    del vectors
+    tracemalloc.start()
+    empty_vectors = [None] * vector_count
+    list_size_in_bytes, _ = tracemalloc.get_traced_memory()
+    vectors = [vector_class(index, -index) for index in range(vector_count)]
+    total_size_in_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del empty_vectors
+
+    MICROSECONDS_PER_SECOND = 1000000
+    microseconds_per_vector = (elapsed_time_in_seconds * MICROSECONDS_PER_SECOND) / vector_count
+    bytes_per_vector = (total_size_in_bytes - (2 * list_size_in_bytes)) / vector_count
+    return (microseconds_per_vector, bytes_per_vector)
+
+## Times storing and looking up every grid position of a square grid in a dictionary,
+## which is what A* does with the nodes it visits.
+## \param[in]   vector_class - The vector class to benchmark.
+## \param[in]   grid_size - The number of rows and columns in the grid.
+## \return  A (microseconds per position, number of distinct hashes) two-tuple.
+def MeasureDictionaryLookups(vector_class, grid_size):
+    # TIME STORING AND LOOKING UP EACH POSITION.
+    grid_positions = [vector_class(column_index, row_index) for row_index in range(grid_size) for column_index in range(grid_size)]
+    start_time_in_seconds = time.perf_counter()
+    values_per_grid_position = {}
+    for grid_position in grid_positions:
+        values_per_grid_position[grid_position] = True
+    for grid_position in grid_positions:
+        values_per_grid_position[vector_class(grid_position.X, grid_position.Y)]
+    elapsed_time_in_seconds = time.perf_counter() - start_time_in_seconds
+
+    MICROSECONDS_PER_SECOND = 1000000
+    microseconds_per_position = (elapsed_time_in_seconds * MICROSECONDS_PER_SECOND) / len(grid_positions)
+    distinct_hash_count = len(set(hash(grid_position) for grid_position in grid_positions))
+    return (microseconds_per_position, distinct_hash_count)
+
+## Times the third-party A* search, which stores vectors as dictionary keys, finding paths to the player
+## on every level map.
+## \param[in]   vector_class - The vector class for Pathing to use.
+## \param[in]   paths_per_level - The number of paths to find on each level.
+## \param[in]   random_seed - The seed for choosing the start positions of the paths.
+## \return  The average time to find a path, in microseconds.
+def MeasureAStar(vector_class, paths_per_level, random_seed):
+    # These are imported here since they must be imported after the current directory has been set.
+    from Graphics.LevelMap import LevelMap
+    import Utilities.Pathing
+    from Utilities.Pathing import Pathing, PathingEngine
+
+    # SEARCH USING THE VECTOR CLASS.
+    # Pathing creates neighboring grid positions with its module's Vector2, so it's
+    # temporarily replaced for the duration of the benchmark.
+    original_vector_class = Utilities.Pathing.Vector2
+    Utilities.Pathing.Vector2 = vector_class
+    try:
+        path_count = 0
+        elapsed_time_in_seconds = 0
+        level_number = 1
+        while os.path.exists('../Maps/Level{}.txt'.format(level_number)):
+            # CHOOSE THE PATHS TO FIND.
+            level_map = LevelMap('../Maps/Level{}.txt'.format(level_number))
+            player_column_index, player_row_index = level_map.GetGridPosition(level_map.GetPlayer().Coordinates.center)
+            destination_grid_position = vector_class(player_column_index, player_row_index)
+            random_number_generator = random.Random(random_seed)
+            start_grid_positions = [
+                vector_class(random_number_generator.randrange(level_map.MapWidth), random_number_generator.randrange(level_map.MapHeight))
+                for path_index in range(paths_per_level)]
+
+            # FIND THE PATHS.
+            pathing = Pathing(level_map, PathingEngine.ThirdPartyAStar)
+            start_time_in_seconds = time.perf_counter()
+            for start_grid_position in start_grid_positions:
+                pathing.ClearCache()
+                pathing.GetPath(start_grid_position, destination_grid_position)
+            elapsed_time_in_seconds += time.perf_counter() - start_time_in_seconds
+            path_count += paths_per_level
+            level_number += 1
+    finally:
+        Utilities.Pathing.Vector2 = original_vector_class
+
+    MICROSECONDS_PER_SECOND = 1000000
+    return (elapsed_time_in_seconds * MICROSECONDS_PER_SECOND) / path_count
+
+## Compares the immutable, slotted Vector2 to the original mutable one.
+## \param[in]   vector_count - The number of vectors to create when measuring allocation.
+## \param[in]   grid_size - The number of rows and columns in the grid used for dictionary lookups.
+## \param[in]   paths_per_level - The number of A* paths to find on each level.
+## \param[in]   random_seed - The seed for choosing the start positions of the paths.
+def RunBenchmark(vector_count = 200000, grid_size = 128, paths_per_level = 100, random_seed = 0):
+    # This is imported here since it must be imported after the current directory has been set.
+    from Math.Vector2 import Vector2
+
+    # BENCHMARK EACH VECTOR CLASS.
+    for vector_class in (MutableVector2, Vector2):
+        microseconds_per_vector, bytes_per_vector = MeasureAllocation(vector_class, vector_count)
+        microseconds_per_position, distinct_hash_count = MeasureDictionaryLookups(vector_class, grid_size)
+        microseconds_per_path = MeasureAStar(vector_class, paths_per_level, random_seed)
+        print('{}:'.format(vector_class.__name__))
+        print('    allocation      {:>8.3f} us/vector  {:>6.1f} bytes/vector'.format(microseconds_per_vector, bytes_per_vector))
+        print('    dictionary      {:>8.3f} us/position  {} distinct hashes for {} positions'.format(
+            microseconds_per_position,
+            distinct_hash_count,
+            grid_size * grid_size))
+        print('    third-party A*  {:>8.1f} us/path'.format(microseconds_per_path))
+
+if __name__ == '__main__':
+    # SET CWD.
+    # Paths to images and maps are relative to the main code directory.
+    code_directory_path = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+    os.chdir(code_directory_path)
+    sys.path.insert(0, code_directory_path)
+
+    # INITIALIZE PYGAME WITHOUT A VISIBLE WINDOW.
+    # A display is still needed since game objects convert their images when created.
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+
+    # RUN THE BENCHMARK.
+    RunBenchmark()
@@ -1,4 +1,5 @@
 from Graphics.Color import Color
+from Graphics.LayeredSpriteRenderer import LayeredSpriteRenderer
 from Graphics.Sprite import Sprite
 import pygame
 
@@ -9,54 +10,139 @@ class GameWindow():
     ## Create the game window.
     ## \param[in]   height - The height in pixels of the game window screen.
     ## \param[in]   width - The width in pixels of the game window screen.
+    ## \param[in]   use_dirty_rectangles - True to only redraw and update the parts of the screen that objects
+    ##      were drawn on in the current or previous frame; false to redraw and update the whole screen every frame.
+    ## \param[in]   use_sprite_groups - True to draw through a LayeredSpriteRenderer, which only redraws the
+    ##      sprites that changed; false to draw each object directly.
     ## \author  Michael Watkinson
     ## \date    09/01/2018
-    def __init__(self, height : int, width : int):
+    def __init__(self, height : int, width : int, use_dirty_rectangles = False, use_sprite_groups = False):
         # INITIALIZE THE SCREEN.
         self.Screen = pygame.display.set_mode((height, width))
         self.Screen.fill((0,0,0))
 
+        ## True if only the parts of the screen that changed are redrawn each frame.
+        self.UseDirtyRectangles = use_dirty_rectangles
+        ## Draws the game map through layered sprite groups, if enabled.
+        self.SpriteRenderer = LayeredSpriteRenderer() if use_sprite_groups else None
+        ## The walls of the level drawn once onto a cleared surface the size of the screen.
+        ## Walls never move, so each frame starts by drawing this instead of every wall.
+        self.__Background = None
+        ## The (game map, LevelMap.StaticVersion) two-tuple that the background was drawn from.
+        self.__BackgroundKey = None
+        ## The background that was last drawn to the whole screen when using dirty rectangles.
+        ## If the background changes, or the screen was last drawn by something other than Update(),
+        ## the whole screen must be redrawn.
+        self.__DrawnBackground = None
+        ## The rectangles of the screen that objects were drawn on in the previous frame.
+        self.__PreviousDirtyRectangles = []
+
     ## Updates the screen by clearing it and drawing all of the sprites in their new positions
     ## based on the game map.
     ## \param[in]   game_map - The game map to use in redrawing all objects to the screen.
     ## \author  Michael Watkinson
     ## \date    09/01/2018
     def Update(self, game_map):
-        # CLEAR THE GAME WINDOW.
-        self.Clear()
-        
-        # DRAW ALL OBJECTS IN THE GAME MAP.
-        for game_object in game_map.Map.values():
-            self.__DrawImage(game_object)
+        # DRAW THROUGH THE SPRITE GROUPS IF ENABLED.
+        # They keep track of which parts of the screen changed themselves.
+        if self.SpriteRenderer is not None:
+            background = self.GetBackground(game_map)
+            dirty_rectangles = self.SpriteRenderer.Draw(self.Screen, game_map, background)
+            if self.UseDirtyRectangles:
+                pygame.display.update(dirty_rectangles)
+            else:
+                pygame.display.update()
+            return
+
+        # DRAW THE BACKGROUND.
+        # This clears the game window and draws all of the walls at once.  When using dirty rectangles,
+        # the background only needs to be restored where objects were drawn in the previous frame.
+        background = self.GetBackground(game_map)
+        redraw_whole_screen = (not self.UseDirtyRectangles) or (background is not self.__DrawnBackground)
+        if redraw_whole_screen:
+            self.Screen.blit(background, (0, 0))
+        else:
+            self.Screen.blits(
+                ((background, rectangle, rectangle) for rectangle in self.__PreviousDirtyRectangles),
+                doreturn = False)
+
+        # DRAW ALL OTHER OBJECTS IN THE GAME MAP.
+        dirty_rectangles = []
+        teleporter = game_map.GetTeleporter()
+        if teleporter:
+            dirty_rectangles.append(self.__DrawImage(teleporter))
+        for enemy in game_map.GetEnemies():
+            dirty_rectangles.append(self.__DrawImage(enemy))
+        player = game_map.GetPlayer()
+        if player:
+            dirty_rectangles.append(self.__DrawImage(player))
 
         # RENDER THE PLAYER'S SWORD.
         # It doesn't fall into the normal game object system.
-        player = game_map.GetPlayer()
         if player:
-            player.Sword.Render(self.Screen)
+            sword_rectangle = player.Sword.Render(self.Screen)
+            if sword_rectangle is not None:
+                dirty_rectangles.append(sword_rectangle)
 
         # DRAW ALL LASERS.
         # Lasers can occupy the same space as enemies so they
         # are not stored in the map.
         # \todo Update map to store a list of objects
         # rather than be a dictionary.
-        for laser in game_map.Lasers:
-            self.__DrawImage(laser)
+        dirty_rectangles.extend(game_map.Lasers.Render(self.Screen))
         
         # UPDATE THE DISPLAY TO MAKE THE UPDATED OBJECTS VISIBLE.
-        pygame.display.update()
+        # With dirty rectangles, only the places where objects were drawn in the previous frame,
+        # and so may have been erased, and where they were drawn in this frame are updated.
+        if redraw_whole_screen:
+            pygame.display.update()
+        else:
+            pygame.display.update(self.__PreviousDirtyRectangles + dirty_rectangles)
+        if self.UseDirtyRectangles:
+            self.__DrawnBackground = background
+            self.__PreviousDirtyRectangles = dirty_rectangles
+
+    ## Marks the whole screen as needing to be redrawn by the next Update().
+    ## This must be called after anything other than Update() draws to the screen.
+    def Invalidate(self):
+        self.__DrawnBackground = None
+        self.__PreviousDirtyRectangles = []
+        if self.SpriteRenderer is not None:
+            self.SpriteRenderer.Invalidate()
+
+    ## Gets the background for a level, redrawing it only if this is a different level
+    ## or its walls have changed since the background was last drawn.
+    ## \param[in]   game_map - The LevelMap to get the background for.
+    ## \return  A surface the size of the screen with all of the walls on the map drawn on it.
+    def GetBackground(self, game_map):
+        # CHECK IF THE BACKGROUND IS STILL UP TO DATE.
+        background_key = (game_map, game_map.StaticVersion)
+        background_up_to_date = (self.__Background is not None) and (background_key == self.__BackgroundKey)
+        if background_up_to_date:
+            return self.__Background
+
+        # DRAW THE WALLS ONTO A CLEARED BACKGROUND.
+        background = pygame.Surface(self.Screen.get_size()).convert()
+        background.fill((0,0,0))
+        for wall in game_map.GetWalls():
+            background.blit(wall.Image, wall.TopLeftCornerPosition)
+        self.__Background = background
+        self.__BackgroundKey = background_key
+        return background
 
     ## Clears the screen.
     ## \author  Michael Watkinson
     ## \date    09/01/2018
     def Clear(self):
         self.Screen.fill((0,0,0))
+        self.Invalidate()
 
     ## Draws the game object to the screen.
     ## \param[in]   game_object - The game object to draw to the screen.
+    ## \return  The pygame.Rect of the screen that was drawn on.
     ## \author  Michael Watkinson
     ## \date    09/01/2018
     def __DrawImage(self, game_object):
         # DRAW THE IMAGE TO THE SCREEN.
         # Objects are drawn in relation to their top-left corner.
-        self.Screen.blit(game_object.Image, game_object.TopLeftCornerPosition)
+        return self.Screen.blit(game_object.Image, game_object.TopLeftCornerPosition)
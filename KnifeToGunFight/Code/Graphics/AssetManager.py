@@ -0,0 +1,103 @@
+import os
+import time
+
+import pygame
+
+from Graphics.TextureAtlas import TextureAtlas
+
+## Loads the images used by the game, decoding each image file only once.
+## Each image is converted to the display's pixel format when it's loaded, so it can be blitted without
+## being converted again, and the same surface is then shared by everything that uses the image.  Since
+## the surfaces are shared, they must not be modified; copy an image first if it needs to be changed.
+## Images packed into a TextureAtlas with LoadAtlas() are taken from the atlas instead of their own files.
+## Images can only be loaded after the display mode has been set.
+class AssetManager(object):
+    ## The loaded images, keyed by their normalized filepaths.
+    __ImagesByFilepath = {}
+    ## The TextureAtlas that images are taken from if they're packed into it, if any.
+    __Atlas = None
+
+    ## The number of times an image has been requested.
+    RequestCount = 0
+    ## The number of image files that have been decoded.
+    LoadCount = 0
+    ## The total size of the pixel data of all loaded images, in bytes.
+    LoadedByteCount = 0
+    ## The total time spent decoding and converting images, in seconds.
+    DecodeTimeInSeconds = 0.0
+    ## The number of images that have been taken from the atlas rather than decoded from their own files.
+    AtlasImageCount = 0
+
+    ## Loads a texture atlas that images will be taken from, packing it first if its saved copy is missing or stale.
+    ## Any images that have already been loaded are discarded, so that they're taken from the atlas next time.
+    ## \param[in]   image_filepaths - The filepaths of the images to pack into the atlas.
+    ## \param[in]   atlas_filepath - The filepath of the saved PNG of the atlas.
+    ## \param[in]   index_filepath - The filepath of the saved JSON index of the atlas.
+    ## \return  The TextureAtlas.
+    @staticmethod
+    def LoadAtlas(image_filepaths, atlas_filepath, index_filepath):
+        # LOAD THE ATLAS.
+        start_time_in_seconds = time.perf_counter()
+        atlas = TextureAtlas.LoadOrPack(image_filepaths, atlas_filepath, index_filepath)
+        AssetManager.DecodeTimeInSeconds += time.perf_counter() - start_time_in_seconds
+        AssetManager.LoadCount += atlas.DecodedFileCount
+        AssetManager.LoadedByteCount += atlas.Image.get_pitch() * atlas.Image.get_height()
+
+        # TAKE IMAGES FROM THE ATLAS FROM NOW ON.
+        AssetManager.Clear()
+        AssetManager.__Atlas = atlas
+        return atlas
+
+    ## Gets an image, loading it if it hasn't been loaded yet.
+    ## \param[in]   image_filepath - The filepath of the image.
+    ## \return  The image as a pygame.Surface in the display's pixel format.  It is shared, so it must not be modified.
+    @staticmethod
+    def GetImage(image_filepath):
+        # CHECK IF THE IMAGE HAS ALREADY BEEN LOADED.
+        AssetManager.RequestCount += 1
+        normalized_filepath = os.path.normpath(image_filepath)
+        image = AssetManager.__ImagesByFilepath.get(normalized_filepath)
+        if image is not None:
+            return image
+
+        # TAKE THE IMAGE FROM THE ATLAS IF IT'S IN THE ATLAS.
+        # The atlas has already been decoded and converted, so this only creates a view of its pixels.
+        image_in_atlas = (AssetManager.__Atlas is not None) and AssetManager.__Atlas.Contains(normalized_filepath)
+        if image_in_atlas:
+            AssetManager.AtlasImageCount += 1
+            image = AssetManager.__Atlas.GetImage(normalized_filepath)
+            AssetManager.__ImagesByFilepath[normalized_filepath] = image
+            return image
+
+        # DECODE THE IMAGE AND CONVERT IT TO THE DISPLAY'S PIXEL FORMAT.
+        # Images with per-pixel transparency keep it.
+        start_time_in_seconds = time.perf_counter()
+        image = pygame.image.load(normalized_filepath)
+        image_has_alpha = bool(image.get_flags() & pygame.SRCALPHA)
+        image = image.convert_alpha() if image_has_alpha else image.convert()
+        AssetManager.DecodeTimeInSeconds += time.perf_counter() - start_time_in_seconds
+
+        # STORE THE IMAGE.
+        AssetManager.LoadCount += 1
+        AssetManager.LoadedByteCount += image.get_pitch() * image.get_height()
+        AssetManager.__ImagesByFilepath[normalized_filepath] = image
+        return image
+
+    ## Discards all loaded images, so that they're loaded again the next time they're requested.
+    ## The atlas, if any, is kept.  The statistics are not reset.
+    @staticmethod
+    def Clear():
+        AssetManager.__ImagesByFilepath.clear()
+
+    ## Describes how many images have been loaded and how long it took.
+    ## \return  A single-line summary of the loading statistics.
+    @staticmethod
+    def GetStatisticsSummary():
+        MILLISECONDS_PER_SECOND = 1000
+        BYTES_PER_KIBIBYTE = 1024
+        return '{} image requests, {} images decoded, {} images from the atlas, {:.1f} KiB, {:.1f} ms decoding'.format(
+            AssetManager.RequestCount,
+            AssetManager.LoadCount,
+            AssetManager.AtlasImageCount,
+            AssetManager.LoadedByteCount / BYTES_PER_KIBIBYTE,
+            AssetManager.DecodeTimeInSeconds * MILLISECONDS_PER_SECOND)
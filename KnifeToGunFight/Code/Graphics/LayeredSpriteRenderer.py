@@ -0,0 +1,169 @@
+from enum import IntEnum
+
+import pygame
+
+## The layers that sprites are drawn in, from back to front.
+class RenderLayer(IntEnum):
+    Background = 0
+    Actors = 1
+    Projectiles = 2
+    Effects = 3
+
+## A sprite that shows an image at a position, and is only marked as needing to be redrawn when either changes.
+class RenderedSprite(pygame.sprite.DirtySprite):
+    ## Constructor.  The sprite starts out hidden.
+    ## \param[in]   layer - The RenderLayer to draw the sprite in.
+    def __init__(self, layer):
+        pygame.sprite.DirtySprite.__init__(self)
+        self.layer = int(layer)
+        self.image = pygame.Surface((0, 0))
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.visible = 0
+        self.dirty = 0
+
+    ## Shows an image at a position.
+    ## \param[in]   image - The pygame.Surface to show.
+    ## \param[in]   top_left_position - The (x, y) screen position to show the top-left corner of the image at.
+    def Show(self, image, top_left_position):
+        # CHECK IF ANYTHING CHANGED.
+        top_left_position = (int(top_left_position[0]), int(top_left_position[1]))
+        unchanged = (self.visible and (image is self.image) and (top_left_position == self.rect.topleft))
+        if unchanged:
+            return
+
+        # MARK THE SPRITE TO BE REDRAWN.
+        self.image = image
+        self.rect = image.get_rect(topleft = top_left_position)
+        self.visible = 1
+        self.dirty = 1
+
+    ## Hides the sprite.
+    def Hide(self):
+        if self.visible:
+            self.visible = 0
+
+## Draws a LevelMap through a pygame.sprite.LayeredDirty group, which only redraws the sprites that have changed.
+## Each object on the map is registered as a sprite once, and sprites are only added or removed when the
+## map's LevelMap.MembershipVersion changes.  Objects are drawn in the order of their RenderLayer: the walls
+## as a single background image, then the teleporter, enemies and player, then lasers, then the player's sword.
+class LayeredSpriteRenderer(object):
+    ## Constructor.
+    def __init__(self):
+        ## The map the sprites are registered for.
+        self.__GameMap = None
+        ## The LevelMap.MembershipVersion that the actor sprites were last registered for.
+        self.__MembershipVersion = None
+        ## The group that draws all of the sprites.
+        self.__Group = pygame.sprite.LayeredDirty()
+        ## The sprite for the background of walls.
+        self.__BackgroundSprite = None
+        ## The sprite for each teleporter, enemy and player on the map, keyed by the GameObject.
+        self.__ActorSprites = {}
+        ## The sprites for lasers.  Each is reused for whichever laser is at its index in the
+        ## lasers on the map, and sprites beyond the number of lasers are hidden.
+        self.__ProjectileSprites = []
+        ## The number of projectile sprites that were shown in the previous frame.
+        self.__ShownProjectileCount = 0
+        ## The sprite for the player's sword.
+        self.__SwordSprite = None
+
+    ## Discards all sprites, so that the whole screen is redrawn by the next Draw().
+    ## This must be called after anything other than Draw() draws to the screen.
+    def Invalidate(self):
+        self.__GameMap = None
+
+    ## Draws the changed parts of a map to a surface.
+    ## \param[in]   screen - The pygame.Surface to draw to.  It must still contain what was drawn by the previous
+    ##      call, unless Invalidate() has been called.
+    ## \param[in]   game_map - The LevelMap to draw.
+    ## \param[in]   background - The pygame.Surface containing the walls of the map.
+    ## \return  A list of the rectangles of the screen that were changed.
+    def Draw(self, screen, game_map, background):
+        # REGISTER THE SPRITES IF THIS IS A DIFFERENT MAP.
+        if game_map is not self.__GameMap:
+            self.__RegisterSprites(game_map)
+
+        # REGISTER ANY ADDED OR REMOVED ACTORS.
+        if game_map.MembershipVersion != self.__MembershipVersion:
+            self.__RegisterActorSprites(game_map)
+
+        # UPDATE THE SPRITES.
+        self.__BackgroundSprite.Show(background, (0, 0))
+        for game_object, actor_sprite in self.__ActorSprites.items():
+            actor_sprite.Show(game_object.Image, game_object.TopLeftCornerPosition)
+        self.__UpdateProjectileSprites(game_map.Lasers.GetImagesAndPositions())
+        self.__UpdateSwordSprite(game_map.GetPlayer())
+
+        # DRAW THE CHANGED SPRITES.
+        return self.__Group.draw(screen)
+
+    ## Registers new sprites for everything on a map, replacing any existing sprites.
+    ## \param[in]   game_map - The LevelMap to register sprites for.
+    def __RegisterSprites(self, game_map):
+        # CREATE A NEW GROUP.
+        self.__Group = pygame.sprite.LayeredDirty()
+        self.__GameMap = game_map
+        self.__MembershipVersion = None
+        self.__ActorSprites = {}
+        self.__ProjectileSprites = []
+        self.__ShownProjectileCount = 0
+
+        # REGISTER THE SPRITES THAT EXIST FOR EVERY MAP.
+        self.__BackgroundSprite = RenderedSprite(RenderLayer.Background)
+        self.__SwordSprite = RenderedSprite(RenderLayer.Effects)
+        self.__Group.add(self.__BackgroundSprite, self.__SwordSprite)
+
+    ## Adds sprites for any actors that have been added to a map, and removes sprites for any that have been removed.
+    ## \param[in]   game_map - The LevelMap to register actor sprites for.
+    def __RegisterActorSprites(self, game_map):
+        # GET THE ACTORS IN THE ORDER THEY SHOULD BE DRAWN.
+        actors = game_map.GetEnemies()
+        teleporter = game_map.GetTeleporter()
+        if teleporter:
+            actors.insert(0, teleporter)
+        player = game_map.GetPlayer()
+        if player:
+            actors.append(player)
+
+        # REMOVE THE SPRITES FOR ACTORS THAT ARE NO LONGER ON THE MAP.
+        # Removed sprites are erased by the next draw.
+        current_actors = set(actors)
+        for game_object in list(self.__ActorSprites):
+            if game_object not in current_actors:
+                self.__Group.remove(self.__ActorSprites.pop(game_object))
+
+        # ADD SPRITES FOR ACTORS THAT ARE NEW TO THE MAP.
+        for game_object in actors:
+            if game_object not in self.__ActorSprites:
+                actor_sprite = RenderedSprite(RenderLayer.Actors)
+                self.__ActorSprites[game_object] = actor_sprite
+                self.__Group.add(actor_sprite)
+        self.__MembershipVersion = game_map.MembershipVersion
+
+    ## Shows a projectile sprite for each laser, and hides any left over.
+    ## \param[in]   images_and_positions - A list with an (image, top-left position) two-tuple for each laser.
+    def __UpdateProjectileSprites(self, images_and_positions):
+        # ADD SPRITES IF THERE ARE MORE LASERS THAN EVER BEFORE.
+        while len(self.__ProjectileSprites) < len(images_and_positions):
+            projectile_sprite = RenderedSprite(RenderLayer.Projectiles)
+            self.__ProjectileSprites.append(projectile_sprite)
+            self.__Group.add(projectile_sprite)
+
+        # SHOW EACH LASER.
+        for projectile_sprite, (image, top_left_position) in zip(self.__ProjectileSprites, images_and_positions):
+            projectile_sprite.Show(image, top_left_position)
+
+        # HIDE THE SPRITES THAT WERE SHOWING LASERS THAT ARE GONE.
+        for projectile_sprite in self.__ProjectileSprites[len(images_and_positions):self.__ShownProjectileCount]:
+            projectile_sprite.Hide()
+        self.__ShownProjectileCount = len(images_and_positions)
+
+    ## Shows the sword sprite if the player is swinging their sword, or hides it otherwise.
+    ## \param[in]   player - The Player, or None if there isn't one.
+    def __UpdateSwordSprite(self, player):
+        sword_image = player.Sword.GetSwingImage() if player else None
+        if sword_image is None:
+            self.__SwordSprite.Hide()
+        else:
+            image, top_left_position = sword_image
+            self.__SwordSprite.Show(image, top_left_position)
@@ -1,5 +1,8 @@
+import math
+
 import pygame
 
+from Graphics.OccupancyGrid import OccupancyGrid
 from Objects.GameObject import GameObject
 from Objects.Enemy import Enemy
 from Objects.LittleRobot import LittleRobot
@@ -7,6 +10,10 @@ from Objects.Player import Player
 from Objects.Wall import Wall
 from Objects.Teleporter import Teleporter
 from Objects.Turret import Turret
+from Utilities.ChangeLog import ChangeLog
+from Utilities.LaserEngine import LaserEngine
+from Utilities.LaserPool import LaserPool
+from Utilities.LineOfSight import LineOfSight
 
 # A mapping of ASCII character map objects to game object classes.
 class GameObjectMapping(object):
@@ -27,7 +34,15 @@ class GameObjectMapping(object):
 
 # Class for displaying the map of a level.
 class LevelMap(object):
-    def __init__(self, currentLevelFilePath):
+    ## The maximum number of wall changes remembered for GetWallCellsChangedSince().
+    WALL_CHANGE_LOG_LENGTH = 1024
+
+    ## Constructor.
+    ## \param[in]   currentLevelFilePath - The filepath of the level to load.
+    ## \param[in]   use_laser_engine - True to simulate lasers with the batched LaserEngine if NumPy
+    ##      is installed.  Otherwise, each laser is simulated as its own GameObject in a LaserPool.
+    ## \param[in]   laser_capacity - The maximum number of lasers that can be on the map at once.
+    def __init__(self, currentLevelFilePath, use_laser_engine = True, laser_capacity = LaserPool.DEFAULT_CAPACITY):
         # Define the path to the current level.
         self.LevelMapFilepath = currentLevelFilePath
 
@@ -35,15 +50,71 @@ class LevelMap(object):
         self.MapWidth = 0
         ## The height of the map.
         self.MapHeight = 0
-        ## The map containing all of the game objects as a dictionary.  They key of the dictionary is
-        ## a two-tuple of the coordinates of the block the object is currently occupying and the value is the object.
-        self.Map = {}
+        ## The map containing all of the game objects as a dense grid.  It can be read like a dictionary whose key
+        ## is a two-tuple of the coordinates of the block the object is currently occupying and the value is the object.
+        self.Map = OccupancyGrid(0, 0)
         ## The lasers on the map. These are stored separately since they can occupy the same space as other objects.
-        self.Lasers = []
-        
+        ## This is either a LaserEngine or a LaserPool, which both support the same operations.
+        if use_laser_engine and LaserEngine.IsAvailable:
+            self.Lasers = LaserEngine(self, laser_capacity)
+        else:
+            self.Lasers = LaserPool(self, laser_capacity)
+
+        # The objects on the map are also indexed by type so that they can be retrieved
+        # without searching through the entire map.
+        ## The player on the map, if any.
+        self.__Player = None
+        ## The teleporter on the map, if any.
+        self.__Teleporter = None
+        ## All enemies on the map.
+        self.__Enemies = set()
+        ## All walls on the map.
+        self.__Walls = set()
+        ## The most recent cells to gain or lose a wall.
+        self.__WallChangeLog = ChangeLog(LevelMap.WALL_CHANGE_LOG_LENGTH)
+        ## A counter that is incremented whenever any object is added to or removed from the map.
+        ## Unlike Version, it doesn't change when objects only move.
+        self.MembershipVersion = 0
+        ## A static collision grid for the walls on the map, in row-major order.
+        ## Each cell is 1 if it contains a wall and 0 otherwise.
+        self.WallGrid = bytearray()
+        ## Which grid positions can see each other past the walls.
+        self.__LineOfSight = LineOfSight(self.WallGrid, 0, 0)
+        ## The StaticVersion the line of sight was last checked against.
+        self.__LineOfSightStaticVersion = None
+
         # Build the map.
         self.ParseMap()
 
+    ## Gets a counter that is incremented whenever any cell of the map becomes occupied or unoccupied.
+    ## Anything computed from the layout of the map can be reused as long as this hasn't changed.
+    @property
+    def Version(self):
+        return self.Map.Version
+
+    ## Gets a counter that is incremented whenever a wall is added to or removed from the map.
+    ## Only walls block paths for good, since other objects move out of the way, so anything drawn
+    ## or computed from the walls alone can be reused as long as this hasn't changed.
+    @property
+    def StaticVersion(self):
+        return self.__WallChangeLog.Version
+
+    ## Gets which grid positions can see each other past the walls.
+    ## Any cached visibility is discarded first if the walls have changed since it was last used.
+    @property
+    def LineOfSight(self):
+        if self.__LineOfSightStaticVersion != self.StaticVersion:
+            self.__LineOfSight.Clear()
+            self.__LineOfSightStaticVersion = self.StaticVersion
+        return self.__LineOfSight
+
+    ## Gets the cells that have gained or lost a wall since a version of the map.
+    ## \param[in]   static_version - A previous value of StaticVersion.
+    ## \return  A set of the indices of the changed cells in WallGrid, or None if the changes
+    ##      since the version are too old to still be remembered.
+    def GetWallCellsChangedSince(self, static_version):
+        return self.__WallChangeLog.GetCellsChangedSince(static_version)
+
     # Opens up the file for the map of the given level and builds the game objects and map.
     def ParseMap(self):
         # READ THE MAP FILE.
@@ -56,6 +127,8 @@ class LevelMap(object):
         # DETERMINE THE HEIGHT AND WIDTH OF THE MAP.
         self.MapHeight = len(map_rows)
         self.MapWidth = len(max(map_rows, key = len))
+        self.Map = OccupancyGrid(self.MapWidth, self.MapHeight)
+        self.WallGrid = bytearray(self.MapWidth * self.MapHeight)
 
         # Loop through the file and create game objects for the map.
         for row_index, row in enumerate(map_rows):
@@ -72,46 +145,51 @@ class LevelMap(object):
 
                 if mappedObject is not None:
                     self.Map[(column_index, row_index)] = mappedObject
+                    self.__AddToIndexes(mappedObject)
+
+        # PREPARE TO CHECK WHICH GRID POSITIONS CAN SEE EACH OTHER.
+        # Visibility is only found for positions as they're checked.
+        self.__LineOfSight = LineOfSight(self.WallGrid, self.MapWidth, self.MapHeight)
+        self.__LineOfSightStaticVersion = self.StaticVersion
+
+    ## Checks if there is a clear line of sight between two game objects, ignoring everything but walls.
+    ## \param[in]   game_object - One GameObject.
+    ## \param[in]   other_game_object - The other GameObject.
+    ## \return  True if a straight line between the centers of the grid positions containing the
+    ##      objects' centers doesn't touch a wall; false otherwise.
+    def HasLineOfSight(self, game_object, other_game_object):
+        grid_position = self.GetGridPosition(game_object.Coordinates.center)
+        other_grid_position = self.GetGridPosition(other_game_object.Coordinates.center)
+        return self.LineOfSight.IsVisible(grid_position, other_grid_position)
 
     ## Gets the player object from the game map.
     ## \return  The Player object.
     ## \author  Michael Watkinson
     ## \date    09/01/2018
     def GetPlayer(self):
-        # SEARCH THROUGH ALL THE OBJECTS IN THE MAP FOR THE PLAYER OBJECT.
-        for object in self.Map.values():
-            # Check if the current object is the player.
-            player_found = (isinstance(object, Player))
-            if player_found:
-                return object
+        return self.__Player
                 
     ## Gets all enemies from the game map.
     ## \return  A list of all Enemy objects on the map.
     ## \author  Tom Rogan
     ## \date    09/01/2018
     def GetEnemies(self):
-        # SEARCH THROUGH ALL THE OBJECTS IN THE MAP FOR THE ENEMY OBJECTS.
-        return [object for object in self.Map.values() if isinstance(object, Enemy)]
+        # A copy is returned so that enemies can be removed from the map while iterating.
+        return list(self.__Enemies)
         
     ## Gets all walls from the game map.
     ## \return  A list of all Wall objects on the map.
     ## \author  Michael Watkinson
     ## \date    09/02/2018
     def GetWalls(self):
-        # SEARCH THROUGH ALL THE OBJECTS IN THE MAP FOR THE ENEMY OBJECTS.
-        return [object for object in self.Map.values() if isinstance(object, Wall)]
+        return list(self.__Walls)
 
     ## Gets the teleporter object from the game map.
     ## \return  The Teleporter object.
     ## \author  CJ Harper
     ## \date    09/01/2018
     def GetTeleporter(self):
-        # SEARCH THROUGH ALL THE OBJECTS IN THE MAP FOR THE TELEPORTER OBJECT.
-        for object in self.Map.values():
-            # Check if the current object is the teleporter.
-            teleporter_found = (isinstance(object, Teleporter))
-            if teleporter_found:
-                return object
+        return self.__Teleporter
                 
     ## Gets the grid position for the specified coordinates.
     ## \param[in]   coordinates - A two-tuple of the X and Y coordinates.
@@ -126,6 +204,159 @@ class LevelMap(object):
         grid_column_index = int(x_coordinate / GameObject.WidthPixels)
         return (grid_column_index, grid_row_index)
                 
+    ## Gets the objects on the map that could be colliding with a rectangle.
+    ## Every object on the map is the size of a single grid cell and is stored in the cell
+    ## containing its top-left corner, so only the cells whose objects could reach into the
+    ## rectangle need to be checked (at most 3x3 cells, or 2x2 when the rectangle is aligned
+    ## to the grid), regardless of the size of the map.
+    ## \param[in]   rectangle - The pygame.Rect to find candidates for.
+    ## \return  The candidate objects, in row-major order of the cells they occupy.
+    def GetCollisionCandidates(self, rectangle):
+        # DETERMINE THE RANGE OF CELLS TO CHECK.
+        # The range is clamped to the map since no objects exist outside of it.
+        first_column_index = max(0, (rectangle.left - GameObject.WidthPixels + 1) // GameObject.WidthPixels)
+        last_column_index = min(self.MapWidth - 1, (rectangle.right - 1) // GameObject.WidthPixels)
+        first_row_index = max(0, (rectangle.top - GameObject.HeightPixels + 1) // GameObject.HeightPixels)
+        last_row_index = min(self.MapHeight - 1, (rectangle.bottom - 1) // GameObject.HeightPixels)
+
+        # GET THE OBJECTS IN THE CELLS.
+        cells = self.Map.Cells
+        for row_index in range(first_row_index, last_row_index + 1):
+            row_start_cell_index = row_index * self.MapWidth
+            for column_index in range(first_column_index, last_column_index + 1):
+                game_object = cells[row_start_cell_index + column_index]
+                if game_object is not None:
+                    yield game_object
+
+    ## Checks if a rectangle collides with any wall on the map.
+    ## Walls occupy exactly one grid cell, so this only needs to check the few cells under the rectangle.
+    ## \param[in]   rectangle - The pygame.Rect to check.
+    ## \return  True if the rectangle collides with a wall; false otherwise.
+    def RectangleCollidesWithWall(self, rectangle):
+        # CHECK THE CELLS UNDER THE RECTANGLE.
+        first_column_index = rectangle.left // GameObject.WidthPixels
+        last_column_index = (rectangle.right - 1) // GameObject.WidthPixels
+        first_row_index = rectangle.top // GameObject.HeightPixels
+        last_row_index = (rectangle.bottom - 1) // GameObject.HeightPixels
+        return self.__AnyWallInCells(first_column_index, last_column_index, first_row_index, last_row_index)
+
+    ## Determines how far an object the size of a grid cell can travel in a straight line before it
+    ## collides with a wall or leaves the map.  The grid is walked one cell boundary at a time (a DDA
+    ## raycast), so the cost depends on how many cells are crossed rather than how far the object moves.
+    ## Like pygame.Rect, the object's position is rounded down to whole pixels when checking for collisions.
+    ## \param[in]   top_left_position - The starting position of the object's top-left corner
+    ##      in pixels, as a Vector2.  The components may be fractional.
+    ## \param[in]   trajectory - The normalized Vector2 direction the object is traveling in.
+    ## \return  The distance in pixels the object can travel.  It is 0 if the object is already
+    ##      colliding with a wall or out of bounds.
+    def GetDistanceUntilWallImpact(self, top_left_position, trajectory):
+        # CHECK IF THE OBJECT IS ALREADY OUT OF BOUNDS.
+        # The object is out of bounds once it no longer overlaps the map at all.
+        x_position, y_position = top_left_position
+        x_direction, y_direction = trajectory
+        map_width_in_pixels = self.MapWidth * GameObject.WidthPixels
+        map_height_in_pixels = self.MapHeight * GameObject.HeightPixels
+        x_in_bounds = (-GameObject.WidthPixels < math.floor(x_position) < map_width_in_pixels)
+        y_in_bounds = (-GameObject.HeightPixels < math.floor(y_position) < map_height_in_pixels)
+        if not (x_in_bounds and y_in_bounds):
+            return 0
+
+        # DETERMINE HOW FAR THE OBJECT CAN TRAVEL BEFORE LEAVING THE MAP.
+        exit_distance = math.inf
+        if x_direction > 0:
+            exit_distance = min(exit_distance, (map_width_in_pixels - x_position) / x_direction)
+        elif x_direction < 0:
+            exit_distance = min(exit_distance, (x_position + GameObject.WidthPixels - 1) / -x_direction)
+        if y_direction > 0:
+            exit_distance = min(exit_distance, (map_height_in_pixels - y_position) / y_direction)
+        elif y_direction < 0:
+            exit_distance = min(exit_distance, (y_position + GameObject.HeightPixels - 1) / -y_direction)
+
+        # CHECK THE CELLS UNDER THE OBJECT AT ITS STARTING POSITION.
+        first_column_index, last_column_index, next_first_column_distance, next_last_column_distance, column_crossing_distance = \
+            LevelMap.__GetCellRangeCrossings(x_position, x_direction, GameObject.WidthPixels)
+        first_row_index, last_row_index, next_first_row_distance, next_last_row_distance, row_crossing_distance = \
+            LevelMap.__GetCellRangeCrossings(y_position, y_direction, GameObject.HeightPixels)
+        if self.__AnyWallInCells(first_column_index, last_column_index, first_row_index, last_row_index):
+            return 0
+
+        # WALK THE CELL BOUNDARIES UNTIL A WALL IS FOUND OR THE OBJECT LEAVES THE MAP.
+        # The object is checked each time one of its edges crosses into a new column or row of cells.
+        # Only the newly covered cells need to be checked, which are on the leading edge of the object.
+        column_step = 1 if (x_direction > 0) else -1
+        row_step = 1 if (y_direction > 0) else -1
+        while True:
+            # FIND THE NEXT EDGE TO CROSS A CELL BOUNDARY.
+            distance = min(next_first_column_distance, next_last_column_distance, next_first_row_distance, next_last_row_distance)
+            if distance >= exit_distance:
+                return exit_distance
+
+            # MOVE THE EDGE INTO THE NEXT COLUMN OR ROW.
+            if distance == next_first_column_distance:
+                first_column_index += column_step
+                next_first_column_distance += column_crossing_distance
+                hit_wall = (x_direction < 0) and self.__AnyWallInCells(first_column_index, first_column_index, first_row_index, last_row_index)
+            elif distance == next_last_column_distance:
+                last_column_index += column_step
+                next_last_column_distance += column_crossing_distance
+                hit_wall = (x_direction > 0) and self.__AnyWallInCells(last_column_index, last_column_index, first_row_index, last_row_index)
+            elif distance == next_first_row_distance:
+                first_row_index += row_step
+                next_first_row_distance += row_crossing_distance
+                hit_wall = (y_direction < 0) and self.__AnyWallInCells(first_column_index, last_column_index, first_row_index, first_row_index)
+            else:
+                last_row_index += row_step
+                next_last_row_distance += row_crossing_distance
+                hit_wall = (y_direction > 0) and self.__AnyWallInCells(first_column_index, last_column_index, last_row_index, last_row_index)
+            if hit_wall:
+                return distance
+
+    ## Determines the range of cells along one axis covered by an object the size of a grid cell, and how far
+    ## the object must travel for each end of the range to move into the next cell.
+    ## \param[in]   position - The position of the object's leading corner along the axis, in pixels.
+    ## \param[in]   direction - The component of the object's normalized trajectory along the axis.
+    ## \param[in]   cell_size - The size of a cell along the axis, in pixels.
+    ## \return  A five-tuple of the first and last cell covered, the distances along the trajectory for the
+    ##      first and last cell to next change, and the distance along the trajectory to cross an entire cell.
+    @staticmethod
+    def __GetCellRangeCrossings(position, direction, cell_size):
+        # DETERMINE THE RANGE OF CELLS COVERED.
+        # Positions are rounded down to whole pixels like pygame.Rect does, so the last cell
+        # is only reached once the object is at least a whole pixel into it.
+        first_cell_index = math.floor(position / cell_size)
+        last_cell_index = math.floor((position - 1) / cell_size) + 1
+        if direction == 0:
+            return (first_cell_index, last_cell_index, math.inf, math.inf, math.inf)
+
+        # DETERMINE WHEN EACH END OF THE RANGE CHANGES.
+        crossing_distance = cell_size / abs(direction)
+        if direction > 0:
+            next_first_cell_distance = (((first_cell_index + 1) * cell_size) - position) / direction
+            next_last_cell_distance = ((last_cell_index * cell_size) + 1 - position) / direction
+        else:
+            next_first_cell_distance = (position - (first_cell_index * cell_size)) / -direction
+            next_last_cell_distance = (position - ((last_cell_index - 1) * cell_size) - 1) / -direction
+        return (first_cell_index, last_cell_index, next_first_cell_distance, next_last_cell_distance, crossing_distance)
+
+    ## Checks if any cell in a range of cells contains a wall.
+    ## \param[in]   first_column_index - The first column of the range.
+    ## \param[in]   last_column_index - The last column of the range, inclusive.
+    ## \param[in]   first_row_index - The first row of the range.
+    ## \param[in]   last_row_index - The last row of the range, inclusive.
+    ## \return  True if any of the cells contain a wall; false otherwise.
+    def __AnyWallInCells(self, first_column_index, last_column_index, first_row_index, last_row_index):
+        # The range is clamped to the map since no walls exist outside of it.
+        first_column_index = max(0, first_column_index)
+        last_column_index = min(self.MapWidth - 1, last_column_index)
+        first_row_index = max(0, first_row_index)
+        last_row_index = min(self.MapHeight - 1, last_row_index)
+        for row_index in range(first_row_index, last_row_index + 1):
+            row_start_cell_index = row_index * self.MapWidth
+            for column_index in range(first_column_index, last_column_index + 1):
+                if self.WallGrid[row_start_cell_index + column_index]:
+                    return True
+        return False
+
     ## Checks if a given game object is within bounds of the map.
     ## \param[in]   game_object - The GameObject to check.
     ## \return  True if the object is in bounds; false otherwise.
@@ -142,18 +373,21 @@ class LevelMap(object):
         return object_in_bounds
 
     ## Moves the specified GameObject to a new grid position.
+    ## Any other object already occupying the new grid position is replaced.
     ## \param[in]   game_object - The GameObject to move.
     ## \author  Michael Watkinson
     ## \date    09/01/2018
     def MoveObjectInMap(self, game_object):
-        # REMOVE THE OBJECT FROM THE MAP.
-        self.RemoveObject(game_object)
-
         # GET THE NEW GRID POSITION.
-        new_grid_position = self.GetGridPosition(game_object.TopLeftCornerPosition)
+        x_coordinate, y_coordinate = game_object.TopLeftCornerPosition
+        new_grid_column_index = int(x_coordinate / GameObject.WidthPixels)
+        new_grid_row_index = int(y_coordinate / GameObject.HeightPixels)
         
         # UPDATE THE POSITION.
-        self.Map[new_grid_position] = game_object
+        replaced_object = self.Map.Move(game_object, new_grid_column_index, new_grid_row_index)
+        if replaced_object is not None:
+            self.__RemoveFromIndexes(replaced_object)
+        self.__AddToIndexes(game_object)
 
     ## Removes an object from the map.
     ## \param[in]   game_object - The object to remove.
@@ -161,4 +395,54 @@ class LevelMap(object):
     ## \date    09/02/2018
     def RemoveObject(self, game_object):
         # REMOVE THE GAME OBJECT FROM THE MAP.
-        self.Map = {key:value for key, value in self.Map.items() if (not value == game_object)}
+        self.Map.Remove(game_object)
+        self.__RemoveFromIndexes(game_object)
+
+    ## Adds an object to the index for its type.
+    ## \param[in]   game_object - The object to index.
+    def __AddToIndexes(self, game_object):
+        # Objects that are moved within the map are indexed again, so only objects that
+        # weren't already indexed change what's on the map.
+        if isinstance(game_object, Player):
+            object_added = (game_object is not self.__Player)
+            self.__Player = game_object
+        elif isinstance(game_object, Teleporter):
+            object_added = (game_object is not self.__Teleporter)
+            self.__Teleporter = game_object
+        elif isinstance(game_object, Enemy):
+            object_added = (game_object not in self.__Enemies)
+            self.__Enemies.add(game_object)
+        elif isinstance(game_object, Wall):
+            object_added = (game_object not in self.__Walls)
+            self.__Walls.add(game_object)
+            self.__SetWallGridCell(game_object, 1)
+        else:
+            object_added = False
+        if object_added:
+            self.MembershipVersion += 1
+
+    ## Removes an object from the index for its type.
+    ## \param[in]   game_object - The object to remove from the indexes.
+    def __RemoveFromIndexes(self, game_object):
+        if game_object is self.__Player:
+            self.__Player = None
+        elif game_object is self.__Teleporter:
+            self.__Teleporter = None
+        elif game_object in self.__Walls:
+            self.__Walls.remove(game_object)
+            self.__SetWallGridCell(game_object, 0)
+        elif game_object in self.__Enemies:
+            self.__Enemies.remove(game_object)
+        else:
+            return
+        self.MembershipVersion += 1
+
+    ## Sets the cell in the wall collision grid containing a wall, recording the change if the cell changed.
+    ## \param[in]   wall - The wall.
+    ## \param[in]   value - 1 if the cell contains the wall; 0 otherwise.
+    def __SetWallGridCell(self, wall, value):
+        cell_index = self.Map.GetCellIndex(self.GetGridPosition(wall.TopLeftCornerPosition))
+        if (cell_index is None) or (self.WallGrid[cell_index] == value):
+            return
+        self.WallGrid[cell_index] = value
+        self.__WallChangeLog.Record(cell_index)
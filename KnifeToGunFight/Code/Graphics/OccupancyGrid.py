@@ -0,0 +1,165 @@
+from Utilities.ChangeLog import ChangeLog
+
+## A dense grid of cells, each of which can be occupied by at most one game object.
+## The grid is stored as a flat, row-major list so that looking up a cell is a single
+## index operation.  A reverse index from each object to its cell allows objects to be
+## moved or removed in constant time.  It supports the same read operations as a dictionary
+## keyed by (column, row) two-tuples so it can be used anywhere the original map dictionary was.
+class OccupancyGrid(object):
+    ## The maximum number of cell changes remembered by the change log.
+    CHANGE_LOG_LENGTH = 1024
+
+    ## Creates an empty grid.
+    ## \param[in]   width - The number of columns in the grid.
+    ## \param[in]   height - The number of rows in the grid.
+    def __init__(self, width, height):
+        ## The number of columns in the grid.
+        self.Width = width
+        ## The number of rows in the grid.
+        self.Height = height
+        ## The game object occupying each cell, in row-major order.  Unoccupied cells are None.
+        self.Cells = [None] * (width * height)
+        ## The index of the cell occupied by each object in the grid.
+        self.__CellIndexPerObject = {}
+        ## The most recent cells to become occupied or unoccupied.
+        self.__ChangeLog = ChangeLog(OccupancyGrid.CHANGE_LOG_LENGTH)
+
+    ## Gets a counter that is incremented every time a cell becomes occupied or unoccupied, so that
+    ## anything computed from the occupied cells can tell when it's out of date.
+    @property
+    def Version(self):
+        return self.__ChangeLog.Version
+
+    ## Determines the index into the flat list of cells for a grid position.
+    ## \param[in]   grid_position - A two-tuple of the column and row indices.
+    ## \return  The index of the cell, or None if the position is outside of the grid.
+    def GetCellIndex(self, grid_position):
+        column_index, row_index = grid_position
+        in_x_bounds = (0 <= column_index < self.Width)
+        in_y_bounds = (0 <= row_index < self.Height)
+        if not (in_x_bounds and in_y_bounds):
+            return None
+        return (row_index * self.Width) + column_index
+
+    ## Determines the grid position of an index into the flat list of cells.
+    ## \param[in]   cell_index - The index of the cell.
+    ## \return  A two-tuple of the column and row indices.
+    def GetGridPosition(self, cell_index):
+        row_index, column_index = divmod(cell_index, self.Width)
+        return (column_index, row_index)
+
+    ## Gets the grid position of an object.
+    ## \param[in]   game_object - The object to find.
+    ## \return  A two-tuple of the column and row indices, or None if the object is not in the grid.
+    def GetGridPositionOf(self, game_object):
+        cell_index = self.__CellIndexPerObject.get(game_object)
+        if cell_index is None:
+            return None
+        return self.GetGridPosition(cell_index)
+
+    ## Moves an object to a cell, replacing any other object already occupying that cell.
+    ## The object is added to the grid if it isn't already in it.  Moves to cells outside of the grid
+    ## are ignored, leaving the object where it was (or out of the grid if it wasn't already in it).
+    ## \param[in]   game_object - The object to move.
+    ## \param[in]   column_index - The column of the destination cell.
+    ## \param[in]   row_index - The row of the destination cell.
+    ## \return  The object that was replaced, if any; None otherwise.
+    def Move(self, game_object, column_index, row_index):
+        # CHECK THAT THE DESTINATION IS IN THE GRID.
+        # Objects can be pushed past the edge of a map that isn't enclosed by walls,
+        # which shouldn't stop the game, so the move is just ignored.
+        in_x_bounds = (0 <= column_index < self.Width)
+        in_y_bounds = (0 <= row_index < self.Height)
+        if not (in_x_bounds and in_y_bounds):
+            return None
+
+        # CHECK IF THE OBJECT IS ALREADY IN THE DESTINATION CELL.
+        # This is the common case since objects move a single pixel at a time.
+        new_cell_index = (row_index * self.Width) + column_index
+        old_cell_index = self.__CellIndexPerObject.get(game_object)
+        if old_cell_index == new_cell_index:
+            return None
+
+        # VACATE THE OLD CELL.
+        if old_cell_index is not None:
+            self.Cells[old_cell_index] = None
+
+        # REPLACE ANY OBJECT IN THE NEW CELL.
+        replaced_object = self.Cells[new_cell_index]
+        if replaced_object is not None:
+            del self.__CellIndexPerObject[replaced_object]
+        self.Cells[new_cell_index] = game_object
+        self.__CellIndexPerObject[game_object] = new_cell_index
+
+        # RECORD THE CHANGED CELLS.
+        if old_cell_index is None:
+            self.__ChangeLog.Record(new_cell_index)
+        else:
+            self.__ChangeLog.Record(old_cell_index, new_cell_index)
+        return replaced_object
+
+    ## Removes an object from the grid.
+    ## \param[in]   game_object - The object to remove.
+    ## \return  True if the object was in the grid; false otherwise.
+    def Remove(self, game_object):
+        cell_index = self.__CellIndexPerObject.pop(game_object, None)
+        if cell_index is None:
+            return False
+        self.Cells[cell_index] = None
+        self.__ChangeLog.Record(cell_index)
+        return True
+
+    ## Gets the cells that have become occupied or unoccupied since a version of the grid.
+    ## \param[in]   version - A previous value of Version.
+    ## \return  A set of the indices of the changed cells, or None if the changes since the
+    ##      version are too old to still be remembered.
+    def GetCellsChangedSince(self, version):
+        return self.__ChangeLog.GetCellsChangedSince(version)
+
+    ## Gets the object at a grid position.
+    ## \param[in]   grid_position - A two-tuple of the column and row indices.
+    ## \param[in]   default - The value to return if the cell is unoccupied.
+    ## \return  The object occupying the cell, or the default value.
+    def get(self, grid_position, default = None):
+        cell_index = self.GetCellIndex(grid_position)
+        if cell_index is None:
+            return default
+        game_object = self.Cells[cell_index]
+        return game_object if (game_object is not None) else default
+
+    def __getitem__(self, grid_position):
+        game_object = self.get(grid_position)
+        if game_object is None:
+            raise KeyError(grid_position)
+        return game_object
+
+    def __contains__(self, grid_position):
+        return self.get(grid_position) is not None
+
+    def __setitem__(self, grid_position, game_object):
+        column_index, row_index = grid_position
+        self.Move(game_object, column_index, row_index)
+
+    def __delitem__(self, grid_position):
+        game_object = self[grid_position]
+        self.Remove(game_object)
+
+    def __len__(self):
+        return len(self.__CellIndexPerObject)
+
+    def __iter__(self):
+        return self.keys()
+
+    ## Gets the grid positions of all occupied cells, in the order objects were added.
+    def keys(self):
+        for cell_index in self.__CellIndexPerObject.values():
+            yield self.GetGridPosition(cell_index)
+
+    ## Gets all objects in the grid, in the order they were added.
+    def values(self):
+        return self.__CellIndexPerObject.keys()
+
+    ## Gets (grid position, object) two-tuples for all occupied cells, in the order objects were added.
+    def items(self):
+        for game_object, cell_index in self.__CellIndexPerObject.items():
+            yield (self.GetGridPosition(cell_index), game_object)
@@ -0,0 +1,50 @@
+import pygame
+
+## A set of pre-rotated copies of an image, one for each of a fixed number of evenly spaced angles
+## (referred to as buckets).  Rotating an image is expensive, so an atlas is built once and then any
+## rotation of the image can be retrieved by looking up the bucket closest to the desired angle.
+class RotationAtlas(object):
+    ## The default number of angles an image is pre-rotated to.
+    DEFAULT_BUCKET_COUNT = 64
+
+    ## Builds the atlas by rotating the image to every bucket's angle.
+    ## \param[in]   image - The pygame.Surface to rotate.
+    ## \param[in]   bucket_count - The number of evenly spaced angles to pre-rotate the image to.
+    ## \param[in]   crop_to_original_size - True to crop each rotated image to the size of the original
+    ##      image, centered on the rotated image.  Otherwise, each rotated image is expanded to fit
+    ##      the entire original image.
+    def __init__(self, image, bucket_count = DEFAULT_BUCKET_COUNT, crop_to_original_size = False):
+        ## The number of evenly spaced angles the image is pre-rotated to.
+        self.BucketCount = bucket_count
+        ## The rotated images, indexed by bucket.  Bucket 0 is the original orientation
+        ## and each following bucket is rotated further counterclockwise.
+        self.Images = []
+
+        # ROTATE THE IMAGE FOR EACH BUCKET.
+        # Each rotation is made from the original image because continuing to rotate
+        # the same image over and over will result in degradation of image quality.
+        MAX_DEGREES_IN_CIRCLE = 360
+        for bucket_index in range(bucket_count):
+            degrees_of_rotation = (bucket_index * MAX_DEGREES_IN_CIRCLE) / bucket_count
+            rotated_image = pygame.transform.rotate(image, degrees_of_rotation)
+            if crop_to_original_size:
+                # The original size and shape are preserved by cutting out the center of the rotated image.
+                cropped_rectangle = image.get_rect()
+                cropped_rectangle.center = rotated_image.get_rect().center
+                rotated_image = rotated_image.subsurface(cropped_rectangle).copy()
+            self.Images.append(rotated_image)
+
+    ## Gets the bucket whose angle is closest to an angle.
+    ## \param[in]   degrees_of_rotation - The counterclockwise angle in degrees.  It doesn't need
+    ##      to be in the range of [0, 360].
+    ## \return  The index of the closest bucket.
+    def GetBucketIndex(self, degrees_of_rotation):
+        MAX_DEGREES_IN_CIRCLE = 360
+        return round((degrees_of_rotation * self.BucketCount) / MAX_DEGREES_IN_CIRCLE) % self.BucketCount
+
+    ## Gets the rotated image closest to an angle.
+    ## \param[in]   degrees_of_rotation - The counterclockwise angle in degrees.  It doesn't need
+    ##      to be in the range of [0, 360].
+    ## \return  The rotated pygame.Surface.
+    def GetImage(self, degrees_of_rotation):
+        return self.Images[self.GetBucketIndex(degrees_of_rotation)]
@@ -1,4 +1,4 @@
-import pygame
+from Graphics.AssetManager import AssetManager
 
 ## Represents an image that can be drawn on the screen.
 class Sprite():
@@ -9,7 +9,7 @@ class Sprite():
     ## \author  Michael Watkinson
     ## \date    09/01/2018
     def __init__(self, image_path, initial_x_position, initial_y_position):
-        self.Image = pygame.image.load(image_path).convert()
+        self.Image = AssetManager.GetImage(image_path)
         self.XPosition = initial_x_position 
         self.YPosition = initial_y_position
 
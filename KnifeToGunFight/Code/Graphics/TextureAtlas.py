@@ -0,0 +1,191 @@
+import json
+import os
+
+import pygame
+
+## Many images packed into a single surface, so that they can be loaded from one file and blitted from one surface.
+## Images are packed into rows (referred to as shelves) from tallest to shortest.  Each shelf is as tall as its first
+## image, and images are added to it left to right until the next one doesn't fit within the atlas's width.
+## An atlas is saved as a PNG of the packed images plus a JSON index of where each image is within it.
+## The index also records the size and modification time of each original image file, so that an atlas can
+## be rebuilt if any of the images it was packed from have changed.
+class TextureAtlas(object):
+    ## The version of the index format.  Indexes with any other version are rebuilt.
+    INDEX_FORMAT_VERSION = 1
+    ## The default maximum width of an atlas, in pixels.  It is widened if any single image is wider.
+    DEFAULT_MAX_WIDTH_IN_PIXELS = 256
+
+    ## Constructor.
+    ## \param[in]   image - The pygame.Surface containing all of the packed images.
+    ## \param[in]   entries_by_filepath - A dictionary with the normalized filepath of each packed image as the key
+    ##      and a dictionary of its "rectangle" within the atlas, its "colorkey", and the "modified_time_in_nanoseconds"
+    ##      and "size_in_bytes" of its original file as the value.
+    ## \param[in]   decoded_file_count - The number of image files that were decoded to create the atlas.
+    def __init__(self, image, entries_by_filepath, decoded_file_count):
+        ## The pygame.Surface containing all of the packed images.
+        self.Image = image
+        ## The number of image files that were decoded to create the atlas.  This is 1 if the atlas
+        ## was loaded from a saved file, or the number of packed images if it was packed from them.
+        self.DecodedFileCount = decoded_file_count
+        ## Where each image is in the atlas, and what file it was packed from.
+        self.__EntriesByFilepath = entries_by_filepath
+
+    ## Loads a saved atlas if it's up to date with the images it should contain,
+    ## or otherwise packs the images into a new atlas and tries to save it.
+    ## \param[in]   image_filepaths - The filepaths of the images the atlas should contain.
+    ## \param[in]   atlas_filepath - The filepath of the saved PNG of the atlas.
+    ## \param[in]   index_filepath - The filepath of the saved JSON index of the atlas.
+    ## \return  The TextureAtlas.
+    @staticmethod
+    def LoadOrPack(image_filepaths, atlas_filepath, index_filepath):
+        # LOAD THE SAVED ATLAS IF IT'S UP TO DATE.
+        if not TextureAtlas.IsStale(image_filepaths, atlas_filepath, index_filepath):
+            return TextureAtlas.Load(atlas_filepath, index_filepath)
+
+        # PACK A NEW ATLAS.
+        atlas = TextureAtlas.Pack(image_filepaths)
+
+        # SAVE THE ATLAS SO THAT IT DOESN'T NEED TO BE PACKED AGAIN.
+        # The game can still use the atlas if it can't be saved, such as if the directory is read-only.
+        try:
+            atlas.Save(atlas_filepath, index_filepath)
+        except (OSError, pygame.error):
+            pass
+        return atlas
+
+    ## Checks if a saved atlas needs to be packed again.
+    ## \param[in]   image_filepaths - The filepaths of the images the atlas should contain.
+    ## \param[in]   atlas_filepath - The filepath of the saved PNG of the atlas.
+    ## \param[in]   index_filepath - The filepath of the saved JSON index of the atlas.
+    ## \return  True if the atlas or its index is missing or unreadable, it contains a different set of images,
+    ##      or any of its images' files have changed since it was packed; false otherwise.
+    @staticmethod
+    def IsStale(image_filepaths, atlas_filepath, index_filepath):
+        # READ THE INDEX.
+        try:
+            with open(index_filepath, 'r') as index_file:
+                index = json.load(index_file)
+        except (OSError, ValueError):
+            return True
+        if (not isinstance(index, dict)) or (index.get('format_version') != TextureAtlas.INDEX_FORMAT_VERSION):
+            return True
+        if not os.path.isfile(atlas_filepath):
+            return True
+
+        # CHECK THAT THE ATLAS CONTAINS EXACTLY THE REQUESTED IMAGES.
+        entries_by_filepath = index.get('images', {})
+        normalized_image_filepaths = set(os.path.normpath(image_filepath) for image_filepath in image_filepaths)
+        if normalized_image_filepaths != set(entries_by_filepath):
+            return True
+
+        # CHECK THAT NONE OF THE IMAGES HAVE CHANGED.
+        for image_filepath, entry in entries_by_filepath.items():
+            try:
+                image_file_status = os.stat(image_filepath)
+            except OSError:
+                return True
+            image_file_changed = (
+                (image_file_status.st_mtime_ns != entry.get('modified_time_in_nanoseconds')) or
+                (image_file_status.st_size != entry.get('size_in_bytes')))
+            if image_file_changed:
+                return True
+
+        return False
+
+    ## Packs images into a new atlas.
+    ## \param[in]   image_filepaths - The filepaths of the images to pack.
+    ## \param[in]   max_width_in_pixels - The maximum width of the atlas, in pixels.
+    ## \return  The TextureAtlas.
+    @staticmethod
+    def Pack(image_filepaths, max_width_in_pixels = DEFAULT_MAX_WIDTH_IN_PIXELS):
+        # LOAD EACH IMAGE.
+        images_by_filepath = {}
+        for image_filepath in image_filepaths:
+            normalized_filepath = os.path.normpath(image_filepath)
+            images_by_filepath[normalized_filepath] = pygame.image.load(normalized_filepath).convert()
+
+        # PLACE EACH IMAGE ON A SHELF.
+        # Placing the tallest images first keeps the space wasted above shorter images to a minimum.
+        atlas_width_in_pixels = max([max_width_in_pixels] + [image.get_width() for image in images_by_filepath.values()])
+        shelf_top_in_pixels = 0
+        shelf_height_in_pixels = 0
+        next_left_in_pixels = 0
+        entries_by_filepath = {}
+        filepaths_from_tallest = sorted(
+            images_by_filepath,
+            key = lambda image_filepath: (-images_by_filepath[image_filepath].get_height(), image_filepath))
+        for image_filepath in filepaths_from_tallest:
+            # Start a new shelf if the image doesn't fit on the current one.
+            image = images_by_filepath[image_filepath]
+            image_width_in_pixels, image_height_in_pixels = image.get_size()
+            image_fits_on_shelf = ((next_left_in_pixels + image_width_in_pixels) <= atlas_width_in_pixels)
+            if not image_fits_on_shelf:
+                shelf_top_in_pixels += shelf_height_in_pixels
+                shelf_height_in_pixels = 0
+                next_left_in_pixels = 0
+
+            # Place the image.
+            image_file_status = os.stat(image_filepath)
+            colorkey = image.get_colorkey()
+            entries_by_filepath[image_filepath] = {
+                'rectangle': [next_left_in_pixels, shelf_top_in_pixels, image_width_in_pixels, image_height_in_pixels],
+                'colorkey': list(colorkey[:3]) if (colorkey is not None) else None,
+                'modified_time_in_nanoseconds': image_file_status.st_mtime_ns,
+                'size_in_bytes': image_file_status.st_size}
+            next_left_in_pixels += image_width_in_pixels
+            shelf_height_in_pixels = max(shelf_height_in_pixels, image_height_in_pixels)
+
+        # DRAW THE IMAGES ONTO THE ATLAS.
+        # Colorkeys are removed while drawing so that the transparent pixels are copied
+        # too, since each image's colorkey is applied to it when it's taken from the atlas.
+        atlas_height_in_pixels = max(1, shelf_top_in_pixels + shelf_height_in_pixels)
+        atlas_image = pygame.Surface((atlas_width_in_pixels, atlas_height_in_pixels)).convert()
+        atlas_image.fill((0, 0, 0))
+        for image_filepath, image in images_by_filepath.items():
+            image.set_colorkey(None)
+            atlas_image.blit(image, entries_by_filepath[image_filepath]['rectangle'][:2])
+        return TextureAtlas(atlas_image, entries_by_filepath, len(images_by_filepath))
+
+    ## Loads a saved atlas.
+    ## \param[in]   atlas_filepath - The filepath of the saved PNG of the atlas.
+    ## \param[in]   index_filepath - The filepath of the saved JSON index of the atlas.
+    ## \return  The TextureAtlas.
+    @staticmethod
+    def Load(atlas_filepath, index_filepath):
+        with open(index_filepath, 'r') as index_file:
+            index = json.load(index_file)
+        atlas_image = pygame.image.load(atlas_filepath).convert()
+        DECODED_FILE_COUNT = 1
+        return TextureAtlas(atlas_image, index['images'], DECODED_FILE_COUNT)
+
+    ## Saves the atlas.
+    ## \param[in]   atlas_filepath - The filepath to save a PNG of the atlas to.
+    ## \param[in]   index_filepath - The filepath to save a JSON index of the atlas to.
+    def Save(self, atlas_filepath, index_filepath):
+        # SAVE THE PACKED IMAGES.
+        pygame.image.save(self.Image, atlas_filepath)
+
+        # SAVE THE INDEX.
+        # It's saved last, so that an atlas that failed to save is never mistaken for an up to date one.
+        index = {
+            'format_version': TextureAtlas.INDEX_FORMAT_VERSION,
+            'images': self.__EntriesByFilepath}
+        with open(index_filepath, 'w') as index_file:
+            json.dump(index, index_file, indent = 4, sort_keys = True)
+
+    ## Checks if the atlas contains an image.
+    ## \param[in]   image_filepath - The filepath of the image.
+    ## \return  True if the image was packed into the atlas; false otherwise.
+    def Contains(self, image_filepath):
+        return os.path.normpath(image_filepath) in self.__EntriesByFilepath
+
+    ## Gets an image from the atlas.
+    ## \param[in]   image_filepath - The filepath of the image.
+    ## \return  A new subsurface of the atlas containing the image, with the image's colorkey.
+    ##      It shares its pixels with the atlas, so it must not be modified.
+    def GetImage(self, image_filepath):
+        entry = self.__EntriesByFilepath[os.path.normpath(image_filepath)]
+        image = self.Image.subsurface(pygame.Rect(entry['rectangle']))
+        if entry['colorkey'] is not None:
+            image.set_colorkey(entry['colorkey'])
+        return image
@@ -1,10 +1,20 @@
 import math
+from operator import itemgetter
+
+# Looked up once, since creating vectors is one of the most frequent operations in the game.
+_NewTuple = tuple.__new__
 
 ## A 2D mathematical vector.
 ## The type of the components depends on what's given to the vector.
+## Vectors are immutable (x, y) tuples, so they are compact, hash the same way as the equivalent
+## tuple, and can be used directly as dictionary keys or anywhere an (x, y) tuple is expected.
+## Operations on vectors always create new vectors rather than modifying existing ones.
 ## \author  Jacob Pike
 ## \date    09/01/2018
-class Vector2(object):    
+class Vector2(tuple):
+    # Vectors only store their components in the tuple, not in a per-instance dictionary.
+    __slots__ = ()
+
     ## Normalizes a vector to be a unit vector of length 1.
     ## @param[in]   vector - The Vector2 to normalize.
     ## @return  A normalized Vector2 of the provided vector.
@@ -12,8 +22,9 @@ class Vector2(object):
     ## \date    09/02/2018
     @staticmethod
     def Normalize(vector):
-        normalized_x = vector.X / vector.Length
-        normalized_y = vector.Y / vector.Length
+        length = vector.Length
+        normalized_x = vector.X / length
+        normalized_y = vector.Y / length
         normalized_vector = Vector2(normalized_x, normalized_y)
         return normalized_vector
 
@@ -63,44 +74,72 @@ class Vector2(object):
         subtracted_y = vector1.Y - vector2.Y
         return Vector2(subtracted_x, subtracted_y)
 
+    ## The x (horizontal) component.
+    X = property(itemgetter(0))
+
+    ## The y (vertical) component.
+    Y = property(itemgetter(1))
+
     ## The length of the vector.
     @property
     def Length(self):
-        squared_length = (self.X * self.X) + (self.Y * self.Y)
-        length = math.sqrt(squared_length)
-        return length
+        return math.hypot(self[0], self[1])
 
-    ## Initializes the vector's components.
+    ## Creates a vector from its components.
     ## @param[in]   x - The x component.
     ## @param[in]   y - The y component.
     ## \author  Jacob Pike
     ## \date    09/01/2018
-    def __init__(self, x, y):
-        ## The x (horizontal) component.
-        self.X = x
-        ## The y (horizontal) component.
-        self.Y = y
+    def __new__(cls, x, y):
+        return _NewTuple(cls, (x, y))
+
+    ## Gets the arguments needed to recreate the vector when it's copied or pickled.
+    ## \return  The (x, y) components.
+    def __getnewargs__(self):
+        return (self[0], self[1])
 
     ## Returns the vector as an (x, y) tuple.
+    ## The vector already is one, so it's returned as-is.
     ## \return  The vector as an (x, y) tuple.
     ## \author  Jacob Pike
     ## \date    09/01/2018
     def AsXYTuple(self):
-        return (self.X, self.Y)
+        return self
 
-    ## Compares the vector to another vector.
-    ## \return  True if the two vectors have the same components, or false otherwise.
-    ## \author  Tom Rogan
-    ## \date    09/01/2018
-    def __eq__(self, other):
-        if isinstance(other, Vector2):
-            return (self.X == other.X) and (self.Y == other.Y)
-        return False
-
-    ## Returns a hash value for the vector. Must be overridden
-    ## because __eq__ is overridden.
-    ## \return  The hash of the vector.
-    ## \author  Tom Rogan
-    ## \date    09/01/2018
-    def __hash__(self):
-        return self.X ^ self.Y
\ No newline at end of file
+    ## Adds another vector.
+    ## Unlike with plain tuples, this adds the components rather than concatenating them.
+    ## \param[in]   other - The vector to add.
+    ## \return  The sum as a new Vector2.
+    def __add__(self, other):
+        return Vector2(self[0] + other[0], self[1] + other[1])
+
+    ## Subtracts another vector.
+    ## \param[in]   other - The vector to subtract.
+    ## \return  The difference as a new Vector2.
+    def __sub__(self, other):
+        return Vector2(self[0] - other[0], self[1] - other[1])
+
+    ## Scales the vector.
+    ## Unlike with plain tuples, this scales the components rather than repeating them.
+    ## \param[in]   scale_factor - The amount to scale the vector.
+    ## \return  The scaled vector as a new Vector2.
+    def __mul__(self, scale_factor):
+        return Vector2(self[0] * scale_factor, self[1] * scale_factor)
+
+    __rmul__ = __mul__
+
+    ## Divides the vector by a scalar.
+    ## \param[in]   divisor - The amount to divide the vector by.
+    ## \return  The divided vector as a new Vector2.
+    def __truediv__(self, divisor):
+        return Vector2(self[0] / divisor, self[1] / divisor)
+
+    ## Negates the vector.
+    ## \return  The negated vector as a new Vector2.
+    def __neg__(self):
+        return Vector2(-self[0], -self[1])
+
+    ## Gets a readable representation of the vector.
+    ## \return  The vector as a string.
+    def __repr__(self):
+        return 'Vector2({!r}, {!r})'.format(self[0], self[1])
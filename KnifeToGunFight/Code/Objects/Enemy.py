@@ -18,7 +18,8 @@ class Enemy(GameObject):
     ## Shooting is capped to avoid overloading the player with too many lasers.
     ## \param[in]   time_since_last_update_in_seconds - The time since the last enemy update, in seconds.
     ## \param[in]   player - The player to shoot at.
-    ## \return  A Laser, if shot; None otherwise.
+    ## \param[in]   game_map - The LevelMap to add any shot laser to.
+    ## \return  True if a laser was shot; false otherwise.
     ## \author  Jacob Pike
     ## \date    09/02/2018
     def TryShooting(self, time_since_last_update_in_seconds, player : GameObject, game_map):
@@ -27,38 +28,44 @@ class Enemy(GameObject):
         self.TimeElapsedSinceLastShotInSeconds += time_since_last_update_in_seconds
         long_enough_since_last_shot = (self.TimeElapsedSinceLastShotInSeconds >= MIN_TIME_BETWEEN_SHOTS_IN_SECONDS)
         if not long_enough_since_last_shot:
-            return
+            return False
+
+        # CHECK IF THE PLAYER CAN BE HIT.
+        # A laser fired without a clear line of sight would just hit a wall.
+        if not game_map.HasLineOfSight(self, player):
+            return False
 
         # RANDOMLY CHOOSE TO SHOOT THE PLAYER OR NOT.
         shoot_player = random.choice([True, False])
         if shoot_player:
-            laser = self.Shoot(player)
-            return laser
+            self.Shoot(player, game_map)
+            return True
         else:
-            return None
+            return False
 
     ## Shoot at the player.
     ## \param[in]   player - The player to shoot at.
-    ## \return  The shot laser.
+    ## \param[in]   game_map - The LevelMap to add the shot laser to.
     ## \author  CJ Harper
     ## \date    09/01/2018
-    def Shoot(self, player):
+    def Shoot(self, player, game_map):
         # CALCULATE THE TRAJECTORY TO THE PLAYER.
         enemy_position = Vector2(self.Coordinates.centerx, self.Coordinates.centery)
         player_position = Vector2(player.Coordinates.centerx, player.Coordinates.centery)
-        trajectory_to_player = Vector2.Subtract(player_position, enemy_position)
+        trajectory_to_player = player_position - enemy_position
 
         # The trajectory should be normalized to have it just represent the direction.
         # The laser can independently control the speed at which it moves.
         trajectory_to_player = Vector2.Normalize(trajectory_to_player)
 
-        # GENERATE A LASER AND FIRE IT TOWARDS THE PLAYER.
-        laser = Laser(self.Coordinates.centerx, self.Coordinates.centery, Laser.Color.Red, trajectory_to_player)
-
-        # Move the laser closer to the player so that it doesn't hit the wall when it spawns.
-        laser.Update(0.2)
+        # FIRE A LASER TOWARDS THE PLAYER.
+        # The laser is spawned closer to the player so that it doesn't hit the wall when it spawns.
+        SPAWN_DISTANCE_IN_SECONDS_OF_TRAVEL = 0.2
+        spawn_distance_in_pixels = Laser.MOVE_SPEED_IN_PIXELS_PER_SECOND * SPAWN_DISTANCE_IN_SECONDS_OF_TRAVEL
+        laser_x_position = self.Coordinates.centerx + int(spawn_distance_in_pixels * trajectory_to_player.X)
+        laser_y_position = self.Coordinates.centery + int(spawn_distance_in_pixels * trajectory_to_player.Y)
+        game_map.Lasers.Spawn(laser_x_position, laser_y_position, Laser.Color.Red, trajectory_to_player)
         
         # INDICATE THAT A SHOT WAS JUST FIRED.
         self.TimeElapsedSinceLastShotInSeconds = 0
-        return laser
 
@@ -1,8 +1,9 @@
 from enum import Enum
 import math
-import pygame
 
 from .GameObject import GameObject
+from Graphics.AssetManager import AssetManager
+from Graphics.RotationAtlas import RotationAtlas
 from Math.Vector2 import Vector2
 
 ## Represents a laser shot by an enemy unit.
@@ -20,9 +21,19 @@ class Laser(GameObject):
     {
         Color.Red: '../Images/RedLaser.gif', 
         Color.Blue: '../Images/BlueLaser.gif', 
-        Color.Green: '../Images/Green.gif'
+        Color.Green: '../Images/GreenLaser.gif'
     }
 
+    ## The number of angles the image for each laser color is pre-rotated to.
+    ## Use ConfigureImageCache() to change this.
+    ImageRotationBucketCount = RotationAtlas.DEFAULT_BUCKET_COUNT
+    ## The pre-rotated images for each laser color, shared by all lasers.
+    ## The images for a color are loaded the first time a laser of that color is fired.
+    __RotatedImagesPerColor = {}
+
+    ## The speed at which lasers travel.
+    MOVE_SPEED_IN_PIXELS_PER_SECOND = 200
+
     ## Constructor.
     ## \param[in]   initial_x_position - The initial x position of the laser.
     ## \param[in]   initial_y_position - The initial y position of the laser.
@@ -35,8 +46,30 @@ class Laser(GameObject):
     ## \date    09/01/2018
     def __init__(self, initial_x_position, initial_y_position, color, trajectory):
         GameObject.__init__(self, initial_x_position, initial_y_position)
-        ## The trajectory of the laser.
-        self.Trajectory = trajectory
+        self.Reset(initial_x_position, initial_y_position, color, trajectory)
+
+    ## Changes the number of angles laser images are pre-rotated to.
+    ## Any images that have already been rotated are discarded.
+    ## \param[in]   bucket_count - The number of evenly spaced angles to pre-rotate each laser image to.
+    @staticmethod
+    def ConfigureImageCache(bucket_count):
+        Laser.ImageRotationBucketCount = bucket_count
+        Laser.__RotatedImagesPerColor.clear()
+
+    ## Gets the image for a laser, rotated to face along its trajectory.
+    ## The image is looked up from pre-rotated images, so the image file
+    ## is only loaded and rotated the first time a color is used.
+    ## \param[in]   color - The color of the laser.
+    ## \param[in]   trajectory - The Vector2 direction the laser is traveling.
+    ## \return  The rotated image.  It is shared, so it must not be modified.
+    @staticmethod
+    def GetImage(color, trajectory):
+        # LOAD THE PRE-ROTATED IMAGES FOR THE COLOR IF NEEDED.
+        rotated_images = Laser.__RotatedImagesPerColor.get(color)
+        if rotated_images is None:
+            image = AssetManager.GetImage(Laser.LASER_IMAGE_PER_COLOR[color])
+            rotated_images = RotationAtlas(image, Laser.ImageRotationBucketCount)
+            Laser.__RotatedImagesPerColor[color] = rotated_images
 
         ## The image needs to be rotated based on the trajectory.
         radians_to_rotate = -math.atan2(trajectory.Y, trajectory.X)
@@ -45,24 +78,42 @@ class Laser(GameObject):
         # 90 degrees is subtracted from the rotation since the image spawns facing upward (i.e. rotated 90 degrees from the x-axis)
         # and the arctan function calculates rotation as if the image spawned facing the x-axis.
         degrees_of_rotation -= 90
+        return rotated_images.GetImage(degrees_of_rotation)
 
-        # The default image is rotated every time because continuing to rotate the same image
-        # over and over will result in degradation of image quality.
-        self.Image = pygame.transform.rotate(pygame.image.load(self.LASER_IMAGE_PER_COLOR[color]).convert(), degrees_of_rotation)
+    ## Resets the laser to a newly fired state so that it can be reused.
+    ## \param[in]   initial_x_position - The initial x position of the laser.
+    ## \param[in]   initial_y_position - The initial y position of the laser.
+    ## \param[in]   color - The color of the laser.
+    ## \param[in]   trajectory - The Vector2 indicating the direction the laser is traveling.
+    def Reset(self, initial_x_position, initial_y_position, color, trajectory):
+        self.Coordinates.topleft = (initial_x_position, initial_y_position)
+        ## The exact position of the laser's top-left corner in pixels.
+        ## Lasers move fractions of a pixel each update, which Coordinates can't store.
+        self.TopLeftPosition = Vector2(initial_x_position, initial_y_position)
+        ## The color of the laser.
+        self.Color = color
+        ## The trajectory of the laser.
+        self.Trajectory = trajectory
+        ## The image of the laser, facing along its trajectory.
+        self.Image = Laser.GetImage(color, trajectory)
 
         ## Indicates whether this laser has been reflected.
         self.HasBeenReflected = False
 
+        ## The index of this laser within the LaserPool containing it.
+        self.PoolIndex = None
+        ## The time at which the laser will hit a wall or leave the map, in seconds since its LaserPool was created.
+        self.ImpactTimeInSeconds = None
+
     ## Updates the state of the laser.
     ## \param[in]   time_since_last_update_in_seconds - The time since the laser was last
     ##      updated, in seconds.
     ## \author  CJ Harper
     ## \date    09/01/2018
     def Update(self, time_since_last_update_in_seconds):
-        MOVE_SPEED_IN_PIXELS_PER_SECOND = 200
-        movement_distance_in_pixels = MOVE_SPEED_IN_PIXELS_PER_SECOND * time_since_last_update_in_seconds
-        movement_amount_in_pixels = Vector2.Scale(movement_distance_in_pixels, self.Trajectory)
-        self.Coordinates = self.Coordinates.move(movement_amount_in_pixels.X, movement_amount_in_pixels.Y)
+        movement_distance_in_pixels = self.MOVE_SPEED_IN_PIXELS_PER_SECOND * time_since_last_update_in_seconds
+        self.TopLeftPosition = self.TopLeftPosition + (self.Trajectory * movement_distance_in_pixels)
+        self.Coordinates.topleft = (math.floor(self.TopLeftPosition.X), math.floor(self.TopLeftPosition.Y))
 
     ## Reflects the projectile.
     ## \author  CJ Harper
@@ -74,8 +125,7 @@ class Laser(GameObject):
             return
 
         # REVERSE THE TRAJECTORY OF THE LASER.
-        # Multiplying a vector by -1 will make it point in the opposite direction.
-        REVERSE_DIRECTION = -1
-        self.Trajectory.X = (self.Trajectory.X * REVERSE_DIRECTION)
-        self.Trajectory.Y = (self.Trajectory.Y * REVERSE_DIRECTION)
+        # Negating a vector will make it point in the opposite direction.
+        # Vectors are immutable, so the laser is given a new trajectory.
+        self.Trajectory = -self.Trajectory
         self.HasBeenReflected = True
@@ -1,18 +1,31 @@
 import math
 
-import pygame
-
 from .Enemy import Enemy
+from Graphics.AssetManager import AssetManager
+from Graphics.RotationAtlas import RotationAtlas
 
 ## Represents a robot that can chase and shoot at the player.
 class LittleRobot(Enemy):
+    ## The number of angles the robot image is pre-rotated to.
+    IMAGE_ROTATION_BUCKET_COUNT = 64
+    ## The pre-rotated robot images, shared by all instances.
+    ## They're loaded when the first instance is created.
+    __RotatedImages = None
+
     def __init__(self, initial_x_position, initial_y_position):
         Enemy.__init__(self, initial_x_position, initial_y_position, speed = 1)
-        self.__DefaultImage = pygame.image.load('../Images/LittleRobot.gif').convert()
+        # LOAD THE PRE-ROTATED IMAGES IF NEEDED.
+        # The original size and shape are preserved to preserve collision detection.
+        if LittleRobot.__RotatedImages is None:
+            default_image = AssetManager.GetImage('../Images/LittleRobot.gif')
+            LittleRobot.__RotatedImages = RotationAtlas(default_image, LittleRobot.IMAGE_ROTATION_BUCKET_COUNT, crop_to_original_size = True)
+
+        ## The index of the pre-rotated image currently being shown.
+        self.__ImageBucketIndex = 0
 
         ## The default image will be shown upon load because the robot has not performed
         ## any action yet. 
-        self.Image = self.__DefaultImage
+        self.Image = LittleRobot.__RotatedImages.Images[self.__ImageBucketIndex]
         
     ## Targets the player by rotating the turret to face the player.
     ## \param[in]   player - The player GameObject to target.
@@ -34,11 +47,10 @@ class LittleRobot(Enemy):
         # and the arctan function calculates rotation as if the image spawned facing the x-axis.
         degrees_of_rotation_relative_to_image_facing_up = degrees_of_rotation + 90
 
-        # ROTATE AND POSITION THE PLAYER.
-        # The original size and shape are preserved to preserve collision detection.
-        original_rect = self.Coordinates
-        rotated_image = pygame.transform.rotate(self.__DefaultImage, degrees_of_rotation_relative_to_image_facing_up)
-        rotated_rect = original_rect.copy()
-        rotated_rect.center = rotated_image.get_rect().center
-        self.Image = rotated_image.subsurface(rotated_rect).copy()
+        # ROTATE THE ROBOT.
+        # The image only needs to change if the rotation is closest to a different pre-rotated image.
+        bucket_index = LittleRobot.__RotatedImages.GetBucketIndex(degrees_of_rotation_relative_to_image_facing_up)
+        if bucket_index != self.__ImageBucketIndex:
+            self.__ImageBucketIndex = bucket_index
+            self.Image = LittleRobot.__RotatedImages.Images[bucket_index]
         
\ No newline at end of file
@@ -4,6 +4,8 @@ import pygame
 
 from Math.CartesianCoordinateSystem import CartesianCoordinateSystem
 from Math.Vector2 import Vector2
+from Graphics.AssetManager import AssetManager
+from Graphics.RotationAtlas import RotationAtlas
 from Objects.GameObject import GameObject
 from Objects.Sword import Sword
 from Utilities.CollisionDetection import MoveDirection
@@ -12,6 +14,12 @@ from Utilities.CollisionDetection import MoveDirection
 ## \author  Michael Watkinson
 ## \date    09/01/2018
 class Player(GameObject):
+    ## The number of angles the player image is pre-rotated to.
+    IMAGE_ROTATION_BUCKET_COUNT = 128
+    ## The pre-rotated player images, shared by all instances.
+    ## They're loaded when the first instance is created.
+    __RotatedImages = None
+
     ## The screen position of the player's hand, which may change
     ## depending on which direction the player is facing.
     @property
@@ -45,11 +53,18 @@ class Player(GameObject):
     ## \date    09/01/2018
     def __init__(self, initial_x_position : int, initial_y_position : int):
         GameObject.__init__(self, initial_x_position, initial_y_position, speed = 1)
-        self.__DefaultImage = pygame.image.load('../Images/Player.gif').convert()
+        # LOAD THE PRE-ROTATED IMAGES IF NEEDED.
+        # The original size and shape are preserved to preserve collision detection.
+        if Player.__RotatedImages is None:
+            default_image = AssetManager.GetImage('../Images/Player.gif')
+            Player.__RotatedImages = RotationAtlas(default_image, Player.IMAGE_ROTATION_BUCKET_COUNT, crop_to_original_size = True)
+
+        ## The index of the pre-rotated image currently being shown.
+        self.__ImageBucketIndex = 0
 
         ## The current image to show for the player. The default image is used until an action occurs
         ## which would change this from the default.
-        self.Image = self.__DefaultImage
+        self.Image = Player.__RotatedImages.Images[self.__ImageBucketIndex]
 
         ## The direction the player is currently facing.
         ## (starts facing up by default).
@@ -95,13 +110,12 @@ class Player(GameObject):
         # and the arctan function calculates rotation as if the image spawned facing the x-axis.
         degrees_of_rotation_relative_to_image_facing_up = degrees_of_rotation - 90
 
-        # ROTATE AND POSITION THE PLAYER.
-        # The original size and shape are preserved to preserve collision detection.
-        original_rect = self.Coordinates
-        rotated_image = pygame.transform.rotate(self.__DefaultImage, degrees_of_rotation_relative_to_image_facing_up)
-        rotated_rect = original_rect.copy()
-        rotated_rect.center = rotated_image.get_rect().center
-        self.Image = rotated_image.subsurface(rotated_rect).copy()
+        # ROTATE THE PLAYER.
+        # The image only needs to change if the rotation is closest to a different pre-rotated image.
+        bucket_index = Player.__RotatedImages.GetBucketIndex(degrees_of_rotation_relative_to_image_facing_up)
+        if bucket_index != self.__ImageBucketIndex:
+            self.__ImageBucketIndex = bucket_index
+            self.Image = Player.__RotatedImages.Images[bucket_index]
 
         # UPDATE THE PLAYER'S FACING DIRECTION.
         # This needs to be updated to try and keep the sword in front of the player.
@@ -1,5 +1,6 @@
 import pygame
 
+from Graphics.AssetManager import AssetManager
 from Graphics.Color import Color
 from Math.Vector2 import Vector2
 
@@ -30,6 +31,14 @@ class Sword(object):
     ## The color used for transparency for the sword.
     TRANSPARENT_COLOR = Color.Magenta
 
+    ## The angle in degrees between each pre-rendered frame of a swing.
+    ## Use ConfigureFrameCache() to change this.
+    DegreesPerSwingFrame = 2.0
+    ## The pre-rendered frames of the sword rotated around a full circle, shared by all swords.
+    ## Each frame is a two-tuple of the rotated image and the offset of the image's top-left
+    ## corner from the handle's screen position.  They're rendered when the first sword is created.
+    __SwingFrames = None
+
     ## Gets the sword's handle position in screen coordinates.
     @property
     def HandleScreenPosition(self):
@@ -38,13 +47,12 @@ class Sword(object):
     ## Sets the sword's handle position in screen coordinates.
     @HandleScreenPosition.setter
     def HandleScreenPosition(self, value):
-        self.__HandleScreenPosition = value
         # When calling code sets the handle position, it's not aware of the
         # larger image rectangle used internally by this class.  To keep
         # the sword appearing on-screen at the position expected by the
         # calling code, the length of the sword needs to be subtracted.
-        self.__HandleScreenPosition.X -= Sword.SWORD_LENGTH_IN_PIXELS
-        self.__HandleScreenPosition.Y -= Sword.SWORD_LENGTH_IN_PIXELS
+        sword_length_offset = Vector2(Sword.SWORD_LENGTH_IN_PIXELS, Sword.SWORD_LENGTH_IN_PIXELS)
+        self.__HandleScreenPosition = value - sword_length_offset
 
     ## Initializes a default sword positioned at (0, 0).
     ## \author  Jacob Pike
@@ -66,9 +74,19 @@ class Sword(object):
         # size and position of the sword within its image.
         SWORD_IMAGE_X_OFFSET_IN_PIXELS = 32
         SWORD_IMAGE_Y_OFFSET_IN_PIXELS = 16
-        sword_image = pygame.image.load('../Images/Sword.gif').convert()
+        sword_image = AssetManager.GetImage('../Images/Sword.gif')
         self.Sprite.image.blit(sword_image, (SWORD_IMAGE_X_OFFSET_IN_PIXELS, SWORD_IMAGE_Y_OFFSET_IN_PIXELS))
 
+        # PRE-RENDER THE SWING FRAMES IF NEEDED.
+        # Swings always rotate the same image around its handle, so every frame
+        # can be rendered once and reused rather than rotating the image each frame.
+        if Sword.__SwingFrames is None:
+            MAX_DEGREES_IN_CIRCLE = 360
+            frame_count = max(1, round(MAX_DEGREES_IN_CIRCLE / Sword.DegreesPerSwingFrame))
+            Sword.__SwingFrames = [
+                Sword.__RenderSwingFrame(self.Sprite.image, (frame_index * MAX_DEGREES_IN_CIRCLE) / frame_count)
+                for frame_index in range(frame_count)]
+
         # INITIALIZE REMAINING MEMBER VARIABLES.
         ## The screen position of the sword's handle.
         ## Expected to be set to near the player's position anytime
@@ -101,6 +119,15 @@ class Sword(object):
         ## The color of the sword.
         self.Color = Color.Gray
 
+    ## Changes the angle between each pre-rendered frame of a swing.
+    ## Any frames that have already been rendered are discarded and will be
+    ## rendered again when the next sword is created.
+    ## \param[in]   degrees_per_frame - The angle in degrees between each frame.
+    @staticmethod
+    def ConfigureFrameCache(degrees_per_frame):
+        Sword.DegreesPerSwingFrame = degrees_per_frame
+        Sword.__SwingFrames = None
+
     ## Updates the sword if it's being swung.
     ## \param[in]   time_since_last_update_in_seconds - The time since the sword was last
     ##      updated, in seconds.
@@ -124,12 +151,13 @@ class Sword(object):
 
     ## Renders the sword to screen.
     ## \param[in]   screen - The pygame.Surface to render to.
+    ## \return  The pygame.Rect of the screen that the sword was drawn on, or None if it wasn't drawn.
     ## \author  Jacob Pike
     ## \date    09/01/2018
     def Render(self, screen):
         # ONLY RENDER THE SWORD IF IT'S BEING SWUNG.
         if not self.IsSwinging:
-            return
+            return None
 
         # DRAW THE A DEBUG LINE FOR THE SWORD IF ENABLED.
         DEBUG_DRAWING_ENABLED = False
@@ -141,32 +169,30 @@ class Sword(object):
                 self.TipLocalImagePosition.AsXYTuple(), 
                 self.WidthInPixels)
 
-        # ROTATE THE SWORD BASED ON HOW IT'S BEING SWUNG.
-        rotated_sword_image = pygame.transform.rotate(self.Sprite.image, self.CurrentRotationAngleInDegrees)
+        # GET THE SWORD ROTATED BASED ON HOW IT'S BEING SWUNG.
+        if DEBUG_DRAWING_ENABLED:
+            # The debug line is drawn onto the sword's image, so the image
+            # must be rotated directly rather than using a pre-rendered frame.
+            rotated_sword_image, (image_x_offset_in_pixels, image_y_offset_in_pixels) = Sword.__RenderSwingFrame(
+                self.Sprite.image, 
+                self.CurrentRotationAngleInDegrees)
 
-        # ADJUST THE SWORD'S POSITION BASED ON ROTATION.
-        # When an image is rotated, the actual size of the bounding rectangle increases to encompass
-        # an axis-aligned box that encompasses all of the image.  To avoid having the sword appear
-        # to change positions, the handle's position must be adjusted to account for the changing
-        # size of the bounding rectangle.
-        rotated_image_rect = rotated_sword_image.get_rect()
-        original_image_rect = self.Sprite.image.get_rect()
-        image_width_increase_in_pixels = rotated_image_rect.width - original_image_rect.width
-        image_height_increase_in_pixels = rotated_image_rect.height - original_image_rect.height
-        # A copy of the screen position is made to avoid altering the original position.
-        handle_screen_position = Vector2(self.HandleScreenPosition.X, self.HandleScreenPosition.Y)
-        # Due to this position being the center of rotation, it only needs to be adjusted by
-        # half of the change in dimensions of the image's bounding box.
-        handle_screen_position.X -= image_width_increase_in_pixels / 2
-        handle_screen_position.Y -= image_height_increase_in_pixels / 2
+            # ADJUST THE SWORD'S POSITION BASED ON ROTATION.
+            # A copy of the screen position is made to avoid altering the original position.
+            handle_screen_position = Vector2(
+                self.HandleScreenPosition.X + image_x_offset_in_pixels, 
+                self.HandleScreenPosition.Y + image_y_offset_in_pixels)
+        else:
+            rotated_sword_image, handle_screen_position = self.GetSwingImage()
 
         # DRAW THE SWORD ON THE SCREEN.
-        screen.blit(rotated_sword_image, handle_screen_position.AsXYTuple())
+        sword_screen_rectangle = screen.blit(rotated_sword_image, handle_screen_position.AsXYTuple())
 
         # DRAW DEBUG RECTANGLES IF DEBUGGING IS ENABLED.
         if DEBUG_DRAWING_ENABLED:
             # DRAW A DEBUG RECTANGLE FOR THE UNADJUSTED POSITION.
             DEBUG_RECTANGLE_OUTLINE_WIDTH_IN_PIXELS = 1
+            rotated_image_rect = rotated_sword_image.get_rect()
             unadjusted_debug_image_rect = rotated_image_rect.move(self.HandleScreenPosition.X, self.HandleScreenPosition.Y)
             pygame.draw.rect(screen, Color.FullGreen.value, unadjusted_debug_image_rect, DEBUG_RECTANGLE_OUTLINE_WIDTH_IN_PIXELS)
 
@@ -176,6 +202,30 @@ class Sword(object):
 
             # DRAW A DEBUG RECTANGLE FOR THE BOUNDING BOX FOR COLLISIONS.
             pygame.draw.rect(screen, Color.Red.value, self.BoundingScreenRectangle, DEBUG_RECTANGLE_OUTLINE_WIDTH_IN_PIXELS)
+            sword_screen_rectangle = sword_screen_rectangle.unionall([unadjusted_debug_image_rect, self.BoundingScreenRectangle])
+
+        return sword_screen_rectangle
+
+    ## Gets the pre-rendered image of the sword at its current angle, without drawing it.
+    ## \return  A two-tuple of the rotated sword image and the Vector2 screen position of its top-left corner,
+    ##      or None if the sword isn't being swung.
+    def GetSwingImage(self):
+        # ONLY SHOW THE SWORD IF IT'S BEING SWUNG.
+        if not self.IsSwinging:
+            return None
+
+        # GET THE FRAME CLOSEST TO THE CURRENT ANGLE.
+        MAX_DEGREES_IN_CIRCLE = 360
+        frame_count = len(Sword.__SwingFrames)
+        frame_index = round((self.CurrentRotationAngleInDegrees * frame_count) / MAX_DEGREES_IN_CIRCLE) % frame_count
+        rotated_sword_image, (image_x_offset_in_pixels, image_y_offset_in_pixels) = Sword.__SwingFrames[frame_index]
+
+        # ADJUST THE SWORD'S POSITION BASED ON ROTATION.
+        # A copy of the screen position is made to avoid altering the original position.
+        handle_screen_position = Vector2(
+            self.HandleScreenPosition.X + image_x_offset_in_pixels, 
+            self.HandleScreenPosition.Y + image_y_offset_in_pixels)
+        return (rotated_sword_image, handle_screen_position)
 
     ## Starts swinging the sword left (if not already swinging).
     ## \param[in]   sword_handle_screen_position - The screen position of the sword's handle.
@@ -309,6 +359,29 @@ class Sword(object):
             Sword.SWORD_LENGTH_IN_PIXELS,
             Sword.SWORD_LENGTH_IN_PIXELS)
 
+    ## Rotates the sword's image for a frame of a swing.
+    ## \param[in]   sword_image - The unrotated image of the sword, with the handle at its center.
+    ## \param[in]   rotation_angle_in_degrees - The counterclockwise angle to rotate the sword.
+    ## \return  A two-tuple of the rotated image and a two-tuple of the x and y offsets of the image's
+    ##      top-left corner from the handle's screen position.
+    @staticmethod
+    def __RenderSwingFrame(sword_image, rotation_angle_in_degrees):
+        rotated_sword_image = pygame.transform.rotate(sword_image, rotation_angle_in_degrees)
+
+        # CALCULATE THE OFFSET FOR THE ROTATED IMAGE.
+        # When an image is rotated, the actual size of the bounding rectangle increases to encompass
+        # an axis-aligned box that encompasses all of the image.  To avoid having the sword appear
+        # to change positions, the handle's position must be adjusted to account for the changing
+        # size of the bounding rectangle.
+        rotated_image_rect = rotated_sword_image.get_rect()
+        original_image_rect = sword_image.get_rect()
+        image_width_increase_in_pixels = rotated_image_rect.width - original_image_rect.width
+        image_height_increase_in_pixels = rotated_image_rect.height - original_image_rect.height
+        # Due to the handle being the center of rotation, it only needs to be adjusted by
+        # half of the change in dimensions of the image's bounding box.
+        image_offset_in_pixels = (-image_width_increase_in_pixels / 2, -image_height_increase_in_pixels / 2)
+        return (rotated_sword_image, image_offset_in_pixels)
+
     ## Has the sword face right horizontally when rendered within its local image.
     ## \author  Jacob Pike
     ## \date    09/01/2018
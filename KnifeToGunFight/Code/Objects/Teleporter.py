@@ -1,5 +1,4 @@
-import pygame
-
+from Graphics.AssetManager import AssetManager
 from Objects.GameObject import GameObject
 
 ## Represents a teleporter that will take you to the next level. 
@@ -17,12 +16,12 @@ class Teleporter(GameObject):
 
         self.IMAGES = \
         [
-            pygame.image.load('../Images/Teleporter1.gif').convert(),
-            pygame.image.load('../Images/Teleporter2.gif').convert(),
-            pygame.image.load('../Images/Teleporter3.gif').convert(),
-            pygame.image.load('../Images/Teleporter4.gif').convert(),
-            pygame.image.load('../Images/Teleporter5.gif').convert(),
-            pygame.image.load('../Images/Teleporter6.gif').convert()
+            AssetManager.GetImage('../Images/Teleporter1.gif'),
+            AssetManager.GetImage('../Images/Teleporter2.gif'),
+            AssetManager.GetImage('../Images/Teleporter3.gif'),
+            AssetManager.GetImage('../Images/Teleporter4.gif'),
+            AssetManager.GetImage('../Images/Teleporter5.gif'),
+            AssetManager.GetImage('../Images/Teleporter6.gif')
         ]
 
         ## Set the initial image of the teleporter.
@@ -1,4 +1,4 @@
-import pygame
+from Graphics.AssetManager import AssetManager
 from Objects.GameObject import GameObject
 
 ## Represents a wall or a boundary in the game that the player cannot cross.
@@ -12,5 +12,5 @@ class Wall(GameObject):
     ## \date    09/01/2018
     def __init__(self, x_position, y_position):
         GameObject.__init__(self, x_position, y_position)
-        self.Image = pygame.image.load('../Images/Wall.gif').convert()
+        self.Image = AssetManager.GetImage('../Images/Wall.gif')
     
\ No newline at end of file
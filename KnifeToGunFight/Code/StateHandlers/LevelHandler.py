@@ -14,8 +14,13 @@ from Objects.Player import Player
 from Objects.Teleporter import Teleporter
 from Objects.Turret import Turret
 from Objects.Laser import Laser
+from Utilities.BackgroundFlowField import BackgroundFlowField
 from Utilities.CollisionDetection import MoveDirection
-from Utilities.Pathing import Pathing
+from Utilities.FlowField import FlowField
+from Utilities.HierarchicalPathfinder import HierarchicalPathfinder
+from Utilities.IncrementalPlanner import IncrementalPlanner
+from Utilities.PathRequestScheduler import PathRequestScheduler
+from Utilities.Pathing import EnemyPathingMode, Pathing
 
 ## The handler class for controlling a level of the game.
 ## \author  Michael Watkinson
@@ -25,9 +30,17 @@ class LevelHandler(StateHandler):
     ## \param[in]  game_window - The GameWindow object to display the level on.
     ## \param[in]   level_filepath - The filepath of the level to load.  Defaults to None.
     ##      If None is provided, the first level will be played.
+    ## \param[in]   enemy_pathing_mode - The EnemyPathingMode for how enemies find their way to the player.
+    ## \param[in]   pathing_budget_in_milliseconds - The maximum time to spend finding paths for individual
+    ##      enemies each frame.  If None, paths are found as soon as enemies need them.
     ## \author  Michael Watkinson
     ## \date    09/01/2018
-    def __init__(self, game_window, level_filepath = None):
+    def __init__(
+        self,
+        game_window,
+        level_filepath = None,
+        enemy_pathing_mode = EnemyPathingMode.FlowField,
+        pathing_budget_in_milliseconds = PathRequestScheduler.DEFAULT_BUDGET_IN_MILLISECONDS):
         # INITIALIZE THE HANDLER.
         # Only initialize the background music for the first level.
         # It will be kept running throughout the game.
@@ -44,6 +57,33 @@ class LevelHandler(StateHandler):
         self.LevelFilepath = level_filepath
         self.Map = LevelMap(self.LevelFilepath)
         self.Pathing = Pathing(self.Map)
+        ## How enemies find their way to the player.
+        self.EnemyPathingMode = enemy_pathing_mode
+        ## The flow field leading to the player, shared by all enemies when using EnemyPathingMode.FlowField
+        ## or EnemyPathingMode.BackgroundFlowField.
+        self.FlowField = FlowField(self.Map)
+        if EnemyPathingMode.BackgroundFlowField == self.EnemyPathingMode:
+            self.FlowField = BackgroundFlowField(self.Map)
+        ## The IncrementalPlanner for each enemy when using EnemyPathingMode.IncrementalSearch.
+        ## Planners are created the first time an enemy needs to find its way to the player.
+        self.IncrementalPlanners = {}
+        ## The hierarchical pathfinder shared by all enemies when using EnemyPathingMode.Hierarchical.
+        ## Its abstract graph is built when the level is loaded.
+        self.HierarchicalPathfinder = None
+        if EnemyPathingMode.Hierarchical == self.EnemyPathingMode:
+            self.HierarchicalPathfinder = HierarchicalPathfinder(self.Map)
+        ## The maximum time to spend finding paths for individual enemies each frame, or None to find
+        ## paths as soon as enemies need them.
+        self.PathingBudgetInMilliseconds = pathing_budget_in_milliseconds
+        ## Spreads the searches for individual enemies' paths across frames so that a level with many enemies
+        ## doesn't slow down the game.  It isn't used with flow fields, since a single flow field is shared
+        ## by all enemies.
+        self.PathRequestScheduler = None
+        scheduler_needed = (
+            (self.PathingBudgetInMilliseconds is not None) and
+            (not self.UsesFlowField()))
+        if scheduler_needed:
+            self.PathRequestScheduler = PathRequestScheduler(self.GetPathTowardPlayer, self.PathingBudgetInMilliseconds)
 
     ## Runs the level and and handles displaying all graphics, playing sounds, and player interaction.
     ## \return  The next StateHandler class to be run in the main game loop.
@@ -78,7 +118,8 @@ class LevelHandler(StateHandler):
             # Check if the player is still alive.
             # If not, return to Level 1.
             if not player_alive:
-                return LevelHandler(self.GameWindow, self.LevelFilepath)
+                self.StopBackgroundPathing()
+                return LevelHandler(self.GameWindow, self.LevelFilepath, self.EnemyPathingMode, self.PathingBudgetInMilliseconds)
             
             # Check if we should move to the next level.
             move_to_next_level = (collided_with_teleporter and teleporter_activated)
@@ -89,28 +130,15 @@ class LevelHandler(StateHandler):
                 next_level_filepath = os.path.join(os.path.dirname(self.LevelFilepath), 'Level{}.txt'.format(next_level_index))
                 
                 # Prepare the handler for the next level.
-                return LevelHandler(self.GameWindow, next_level_filepath)
+                self.StopBackgroundPathing()
+                return LevelHandler(self.GameWindow, next_level_filepath, self.EnemyPathingMode, self.PathingBudgetInMilliseconds)
             
             # ALLOW ENEMIES TO REACT TO THE PLAYER.
             self.UpdateEnemies(time_since_last_update_in_seconds)
 
             # UPDATE THE LASERS.
-            for laser in self.Map.Lasers:
-                laser.Update(time_since_last_update_in_seconds)
-                
-                # Remove lasers that are hitting a wall.
-                walls = self.Map.GetWalls()
-                for wall in walls:
-                    laser_hit_wall = wall.Coordinates.colliderect(laser.Coordinates)
-                    if laser_hit_wall:
-                        # REMOVE THE LASER FROM THE MAP.
-                        try:
-                            self.Map.Lasers.remove(laser)
-                        except:
-                            pass
-                
-            # Any lasers that are no longer in bounds should be removed.
-            self.Map.Lasers = [laser for laser in self.Map.Lasers if self.Map.ObjectInBounds(laser)]
+            # Any lasers that have hit a wall or are no longer in bounds are removed.
+            self.Map.Lasers.Update(time_since_last_update_in_seconds)
 
             # UPDATE THE PLAYER.
             player = self.Map.GetPlayer()
@@ -123,15 +151,8 @@ class LevelHandler(StateHandler):
 
                 # HANDLE SWORD COLLISIONS IF THE SWORD IS OUT.
                 if player.Sword.IsSwinging:
-                    # CHECK FOR COLLISIONS OF THE SWORD WITH LASERS.
-                    for laser in self.Map.Lasers:
-                        # DETERMINE IF THE SWORD HIT THE PROJECTILE.
-                        sword_bounding_rectangle = player.Sword.BoundingScreenRectangle
-                        projectile_rectangle = laser.Coordinates
-                        sword_collides_with_projectile = sword_bounding_rectangle.colliderect(projectile_rectangle)
-                        if sword_collides_with_projectile:
-                            # REFLECT THE PROJECTILE.
-                            laser.Reflect()
+                    # REFLECT ANY PROJECTILES THE SWORD HIT.
+                    self.Map.Lasers.ReflectLasersCollidingWith(player.Sword.BoundingScreenRectangle)
 
             # UPDATE THE SCREEN.
             self.GameWindow.Update(self.Map)
@@ -184,16 +205,13 @@ class LevelHandler(StateHandler):
             collided_object = player.MoveRight(self.Map, allowed_collision_classes)
 
         # CHECK IF THE PLAYER HIT ANY LASERS.
-        for laser in self.Map.Lasers:
-            player_hit_laser = player.Coordinates.colliderect(laser.Coordinates)
-            if player_hit_laser:
-                # REMOVE THE LASER FROM THE MAP.
-                self.Map.Lasers.remove(laser)
-
-                # RESET TO LEVEL ONE ON PLAYER DEATH.
-                collided_with_teleporter = False
-                player_alive = False
-                return (collided_with_teleporter, player_alive)
+        # Any lasers that hit the player are removed from the map.
+        player_hit_laser = self.Map.Lasers.RemoveLasersCollidingWith(player.Coordinates)
+        if player_hit_laser:
+            # RESET TO LEVEL ONE ON PLAYER DEATH.
+            collided_with_teleporter = False
+            player_alive = False
+            return (collided_with_teleporter, player_alive)
             
         # HANDLE USING TELEPORTER.
         collided_with_teleporter = isinstance(collided_object, Teleporter)
@@ -210,26 +228,30 @@ class LevelHandler(StateHandler):
         player_position = self.Map.GetGridPosition(player.Coordinates.center)
         player_position_vector = Vector2(player_position[0], player_position[1])
         enemies = self.Map.GetEnemies()
+
+        # UPDATE THE FLOW FIELD LEADING TO THE PLAYER IF NEEDED.
+        # It's only rebuilt if the player has moved to a different grid position or the map has changed.
+        if self.UsesFlowField():
+            self.FlowField.Update(player_position_vector)
+
         for enemy in enemies:
             # CHECK IF THE ENEMY WAS HIT BY A REFLECTED LASER.
-            for laser in self.Map.Lasers:
-                if laser.HasBeenReflected:
-                    # Check collision.
-                    enemy_was_hit_by_laser = enemy.Coordinates.colliderect(laser.Coordinates)
-                    if enemy_was_hit_by_laser:
-                        # Remove this enemy from the map.
-                        self.Map.RemoveObject(enemy)
-                        
-                        # No further updates are necessary for this enemy.
-                        continue
+            enemy_was_hit_by_laser = self.Map.Lasers.AnyLaserCollidingWith(enemy.Coordinates, reflected_only = True)
+            if enemy_was_hit_by_laser:
+                # Remove this enemy from the map.
+                self.Map.RemoveObject(enemy)
+                self.IncrementalPlanners.pop(enemy, None)
+                if self.PathRequestScheduler is not None:
+                    self.PathRequestScheduler.Forget(enemy)
+                
+                # No further updates are necessary for this enemy.
+                continue
 
             # TARGET THE PLAYER.
             enemy.TargetPlayer(player)
                         
             # RANDOMLY SHOOT AT THE PLAYER.
-            laser = enemy.TryShooting(time_since_last_update_in_seconds, player, self.Map)
-            if laser:
-                self.Map.Lasers.append(laser)
+            enemy.TryShooting(time_since_last_update_in_seconds, player, self.Map)
 
             # MOVE IF NON-STATIONARY.
             enemy_is_stationary = isinstance(enemy, Turret)
@@ -253,15 +275,30 @@ class LevelHandler(StateHandler):
                 continue
             else:
                 # MOVE TOWARD THE PLAYER.
-                # Get the shortest path to the player from the enemy.
-                path_to_player = self.Pathing.GetPath(enemy_position_vector, player_position_vector)
-                if path_to_player is None:
+                # Get the next grid position that the enemy should move to in
+                # order to reach the player.  No path is needed if the enemy can
+                # see the player.  If searches are scheduled, the enemy keeps
+                # following its last path until a new one is found.
+                next_grid_position_in_path_to_player = self.GetStepTowardVisiblePosition(
+                    enemy_position_vector,
+                    player_position_vector)
+                if next_grid_position_in_path_to_player is None:
+                    if self.PathRequestScheduler is not None:
+                        next_grid_position_in_path_to_player = self.PathRequestScheduler.RequestPath(
+                            enemy,
+                            enemy_position_vector,
+                            player_position_vector,
+                            self.Map.StaticVersion,
+                            distance_to_player)
+                    else:
+                        next_grid_position_in_path_to_player = self.GetNextGridPositionTowardPlayer(
+                            enemy,
+                            enemy_position_vector,
+                            player_position_vector)
+                if next_grid_position_in_path_to_player is None:
                     # This enemy cannot currently reach the player.
                     continue
 
-                # Get the next grid position that the enemy should move to in
-                # order to reach the player.
-                next_grid_position_in_path_to_player = next(islice(path_to_player, 1, None), None)
                 direction_to_move = LevelHandler.GetDirectionTowardPosition(
                     enemy_position_vector,
                     next_grid_position_in_path_to_player)
@@ -278,6 +315,96 @@ class LevelHandler(StateHandler):
             elif direction_to_move == MoveDirection.Right:
                 enemy.MoveRight(self.Map)
 
+        # FIND PATHS FOR ENEMIES WITHIN THE FRAME'S PATHING BUDGET.
+        if self.PathRequestScheduler is not None:
+            self.PathRequestScheduler.ServiceRequests()
+
+    ## Gets the first step along a straight line between two grid positions that can see each other.
+    ## \param[in]   origin_position - The position to step from as a Vector2 of column and row index.
+    ## \param[in]   target_position - The position to step toward as a Vector2 of column and row index.
+    ## \return  The neighboring grid position along the line as a Vector2 of column and row index, or None if
+    ##      the positions can't see each other, are the same, or the neighboring position is occupied.
+    def GetStepTowardVisiblePosition(self, origin_position, target_position):
+        # CHECK IF THE TARGET CAN BE SEEN.
+        target_visible = self.Map.LineOfSight.IsVisible(origin_position, target_position)
+        if not target_visible or (origin_position == target_position):
+            return None
+
+        # STEP ALONG THE AXIS THE LINE CROSSES FIRST.
+        # A line of sight touches no walls, so the first cell it crosses into is never a wall.
+        # When the line is diagonal it crosses into both neighbors at once, so either is clear.
+        column_delta = target_position.X - origin_position.X
+        row_delta = target_position.Y - origin_position.Y
+        if abs(column_delta) > abs(row_delta):
+            column_step = 1 if (column_delta > 0) else -1
+            next_grid_position = Vector2(origin_position.X + column_step, origin_position.Y)
+        else:
+            row_step = 1 if (row_delta > 0) else -1
+            next_grid_position = Vector2(origin_position.X, origin_position.Y + row_step)
+
+        # CHECK THAT NOTHING ELSE IS IN THE WAY.
+        # Other objects, such as enemies, can still block the step even though they don't block sight.
+        if next_grid_position in self.Map.Map:
+            return None
+        return next_grid_position
+
+    ## Gets the shortest path, or at least its first step, from an enemy to the player.
+    ## \param[in]   enemy - The enemy that is moving.
+    ## \param[in]   enemy_position - The enemy's position as a Vector2 of column and row index.
+    ## \param[in]   player_position - The player's position as a Vector2 of column and row index.
+    ## \return  A list of Vector2 grid positions starting at the enemy's position, or None
+    ##      if the enemy cannot currently reach the player.
+    def GetPathTowardPlayer(self, enemy, enemy_position, player_position):
+        # SEARCH FOR THE WHOLE PATH IF POSSIBLE.
+        if EnemyPathingMode.Search == self.EnemyPathingMode:
+            return self.Pathing.GetPath(enemy_position, player_position)
+
+        # OTHERWISE ONLY GET THE FIRST STEP.
+        next_grid_position = self.GetNextGridPositionTowardPlayer(enemy, enemy_position, player_position)
+        if next_grid_position is None:
+            return None
+        return [enemy_position, next_grid_position]
+
+    ## Gets the next grid position an enemy should move to along the shortest path to the player.
+    ## \param[in]   enemy - The enemy that is moving.
+    ## \param[in]   enemy_position - The enemy's position as a Vector2 of column and row index.
+    ## \param[in]   player_position - The player's position as a Vector2 of column and row index.
+    ## \return  The next grid position as a Vector2 of column and row index, or None
+    ##      if the enemy cannot currently reach the player.
+    def GetNextGridPositionTowardPlayer(self, enemy, enemy_position, player_position):
+        # READ THE NEXT POSITION FROM THE FLOW FIELD IF ENABLED.
+        if self.UsesFlowField():
+            return self.FlowField.GetNextGridPosition(enemy_position)
+
+        # REPAIR THE ENEMY'S PREVIOUS PLAN IF ENABLED.
+        if EnemyPathingMode.IncrementalSearch == self.EnemyPathingMode:
+            planner = self.IncrementalPlanners.get(enemy)
+            if planner is None:
+                planner = IncrementalPlanner(self.Map)
+                self.IncrementalPlanners[enemy] = planner
+            return planner.GetNextGridPosition(enemy_position, player_position)
+
+        # SEARCH THE ABSTRACT GRAPH IF ENABLED.
+        if EnemyPathingMode.Hierarchical == self.EnemyPathingMode:
+            return self.HierarchicalPathfinder.GetNextGridPosition(enemy_position, player_position)
+
+        # SEARCH FOR THE SHORTEST PATH TO THE PLAYER.
+        path_to_player = self.Pathing.GetPath(enemy_position, player_position)
+        if path_to_player is None:
+            return None
+        return next(islice(path_to_player, 1, None), None)
+
+    ## Determines whether enemies share a flow field to find their way to the player.
+    ## \return  True if a flow field is used; false otherwise.
+    def UsesFlowField(self):
+        flow_field_modes = (EnemyPathingMode.FlowField, EnemyPathingMode.BackgroundFlowField)
+        return (self.EnemyPathingMode in flow_field_modes)
+
+    ## Stops any pathfinding being done on worker threads for this level.
+    def StopBackgroundPathing(self):
+        if isinstance(self.FlowField, BackgroundFlowField):
+            self.FlowField.Stop()
+
     ## Gets the direction (up, down, left, or right) from one position to another.
     ## \param[in]  origin_position - The first position as a Vector2 of column and row index.
     ## \param[in]  target_position - The target position as a Vector2 of column and row index.
@@ -2,6 +2,8 @@ import math
 
 import pygame
 
+from Graphics.AssetManager import AssetManager
+
 ## The base state handler class.
 ## \author  Michael Watkinson
 ## \date    09/01/2018
@@ -17,7 +19,8 @@ class StateHandler(object):
         if images_provided:
             for image_name, image_filepath in images.items():
                 # Load the image asset.
-                image = pygame.image.load(image_filepath)
+                # Images are shared with every other handler that uses them, so each is only decoded once.
+                image = AssetManager.GetImage(image_filepath)
                 setattr(self, image_name, image)
         
         # STORE THE AUDIO INSTANCE VARIABLES FOR THE HANDLER.
@@ -0,0 +1,51 @@
+import os
+import sys
+import tempfile
+
+import pygame
+
+# Modules are imported relative to the main code directory.
+CODE_DIRECTORY_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, CODE_DIRECTORY_PATH)
+
+from Graphics.LevelMap import LevelMap
+from Objects.GameObject import GameObject
+
+## Helpers for tests that need a LevelMap.
+## Game objects convert their images when created, so a display must be set up first with SetUpDisplay().
+
+## The directory that was current before SetUpDisplay() was called.
+original_directory_path = None
+
+## Sets up pygame without a visible window.
+def SetUpDisplay():
+    # Paths to images are relative to the main code directory.
+    global original_directory_path
+    original_directory_path = os.getcwd()
+    os.chdir(CODE_DIRECTORY_PATH)
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+
+## Shuts down the display set up by SetUpDisplay().
+def TearDownDisplay():
+    pygame.display.quit()
+    os.chdir(original_directory_path)
+
+## Loads a level from the text of a map file.
+## \param[in]   map_text - The text of the map, with a row of ASCII objects per line.
+## \return  The LevelMap.
+def LoadLevel(map_text):
+    with tempfile.TemporaryDirectory() as map_directory_path:
+        map_filepath = os.path.join(map_directory_path, 'Level1.txt')
+        with open(map_filepath, 'w') as map_file:
+            map_file.write(map_text)
+        return LevelMap(map_filepath)
+
+## Moves an object to a grid position on a map.
+## \param[in]   level_map - The LevelMap to move the object on.
+## \param[in]   game_object - The object to move.
+## \param[in]   grid_position - The grid position to move to as a Vector2 of column and row index.
+def MoveToGridPosition(level_map, game_object, grid_position):
+    game_object.Coordinates.topleft = (grid_position.X * GameObject.WidthPixels, grid_position.Y * GameObject.HeightPixels)
+    level_map.MoveObjectInMap(game_object)
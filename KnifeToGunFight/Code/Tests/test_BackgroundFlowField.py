@@ -0,0 +1,66 @@
+import time
+import unittest
+
+from TestLevels import LoadLevel, MoveToGridPosition, SetUpDisplay, TearDownDisplay
+from Math.Vector2 import Vector2
+from Objects.LittleRobot import LittleRobot
+from Utilities.BackgroundFlowField import BackgroundFlowField
+
+## A map where a wall makes the enemy go around it to reach the player.
+MAP_TEXT = '\n'.join([
+    'XXXXXXX',
+    'XS X PX',
+    'X     X',
+    'XXXXXXX'])
+
+## The longest to wait for the worker to publish a field, in seconds.
+WORKER_TIMEOUT_IN_SECONDS = 5.0
+
+def setUpModule():
+    SetUpDisplay()
+
+def tearDownModule():
+    TearDownDisplay()
+
+## Tests for building flow fields on a worker thread with a BackgroundFlowField.
+class BackgroundFlowFieldTests(unittest.TestCase):
+    def setUp(self):
+        self.Map = LoadLevel(MAP_TEXT)
+        self.FlowField = BackgroundFlowField(self.Map)
+        self.PlayerGridPosition = Vector2(5, 1)
+
+    def tearDown(self):
+        self.FlowField.Stop()
+
+    ## Updates the field until the worker publishes a field or gives up waiting.
+    ## \return  True if a field was picked up; false otherwise.
+    def WaitForField(self):
+        deadline_in_seconds = time.perf_counter() + WORKER_TIMEOUT_IN_SECONDS
+        while time.perf_counter() < deadline_in_seconds:
+            field_published = self.FlowField.Update(self.PlayerGridPosition)
+            if field_published:
+                return True
+            time.sleep(0.001)
+        return False
+
+    ## Checks that a field built while actors move around is still used.
+    def test_ActorMovesDoNotDiscardField(self):
+        self.FlowField.Update(self.PlayerGridPosition)
+        other_enemy = LittleRobot(0, 0)
+        MoveToGridPosition(self.Map, other_enemy, Vector2(2, 2))
+        MoveToGridPosition(self.Map, other_enemy, Vector2(3, 2))
+
+        self.assertTrue(self.WaitForField())
+        self.assertEqual(0, self.FlowField.DiscardedFieldCount)
+        self.assertEqual(6, self.FlowField.GetDistance(Vector2(1, 1)))
+
+    ## Checks that a field is rebuilt when the walls change, and any field built from the old walls is discarded.
+    def test_WallChangeRebuildsField(self):
+        self.FlowField.Update(self.PlayerGridPosition)
+        self.Map.RemoveObject(self.Map.Map[(3, 1)])
+
+        self.assertTrue(self.WaitForField())
+        self.assertEqual(4, self.FlowField.GetDistance(Vector2(1, 1)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+
+from TestLevels import LoadLevel, MoveToGridPosition, SetUpDisplay, TearDownDisplay
+from Math.Vector2 import Vector2
+from Objects.LittleRobot import LittleRobot
+from Utilities.HierarchicalPathfinder import HierarchicalPathfinder
+
+## A map where a wall makes the enemy go around it to reach the player.
+MAP_TEXT = '\n'.join([
+    'XXXXXXXXX',
+    'XS  X  PX',
+    'X       X',
+    'XXXXXXXXX'])
+
+## Clusters small enough that the map is split into several of them.
+CLUSTER_SIZE = 3
+
+def setUpModule():
+    SetUpDisplay()
+
+def tearDownModule():
+    TearDownDisplay()
+
+## Tests for finding paths with a HierarchicalPathfinder.
+class HierarchicalPathfinderTests(unittest.TestCase):
+    def setUp(self):
+        self.Map = LoadLevel(MAP_TEXT)
+        self.Pathfinder = HierarchicalPathfinder(self.Map, CLUSTER_SIZE)
+        self.EnemyGridPosition = Vector2(1, 1)
+        self.PlayerGridPosition = Vector2(7, 1)
+
+    ## Checks that other actors moving around, even more often than the map remembers, don't rebuild any clusters.
+    def test_ActorMovesDoNotRebuildClusters(self):
+        self.Pathfinder.GetNextGridPosition(self.EnemyGridPosition, self.PlayerGridPosition)
+        cluster_build_count = self.Pathfinder.ClusterBuildCount
+
+        other_enemy = LittleRobot(0, 0)
+        for move_index in range(self.Map.Map.CHANGE_LOG_LENGTH):
+            MoveToGridPosition(self.Map, other_enemy, Vector2(2 + (move_index % 4), 2))
+        self.assertIsNone(self.Map.Map.GetCellsChangedSince(0))
+
+        next_grid_position = self.Pathfinder.GetNextGridPosition(self.EnemyGridPosition, self.PlayerGridPosition)
+        self.assertIsNotNone(next_grid_position)
+        self.assertEqual(cluster_build_count, self.Pathfinder.ClusterBuildCount)
+
+    ## Checks that removing a wall rebuilds only the clusters around it.
+    def test_WallRemovalRebuildsNearbyClusters(self):
+        self.Pathfinder.GetNextGridPosition(self.EnemyGridPosition, self.PlayerGridPosition)
+        cluster_build_count = self.Pathfinder.ClusterBuildCount
+        self.Map.RemoveObject(self.Map.Map[(4, 1)])
+
+        next_grid_position = self.Pathfinder.GetNextGridPosition(self.EnemyGridPosition, self.PlayerGridPosition)
+        self.assertIsNotNone(next_grid_position)
+        rebuilt_cluster_count = self.Pathfinder.ClusterBuildCount - cluster_build_count
+        self.assertGreater(rebuilt_cluster_count, 0)
+        self.assertLess(rebuilt_cluster_count, self.Pathfinder.ClusterColumnCount * self.Pathfinder.ClusterRowCount)
+
+    ## Checks that paths are found on a map narrower than a cluster, where the clusters are stacked in a single column.
+    def test_MapNarrowerThanCluster(self):
+        narrow_map = LoadLevel('\n'.join([
+            'X.X',
+            '.SX',
+            '.X.',
+            '.P.']))
+        pathfinder = HierarchicalPathfinder(narrow_map, CLUSTER_SIZE)
+        self.assertEqual(1, pathfinder.ClusterColumnCount)
+
+        path_segment = pathfinder.GetFirstPathSegment((1, 1), (1, 3))
+        self.assertIsNotNone(path_segment)
+        self.assertEqual((1, 1), path_segment[0])
+        for grid_position, next_grid_position in zip(path_segment, path_segment[1:]):
+            step_distance = abs(next_grid_position[0] - grid_position[0]) + abs(next_grid_position[1] - grid_position[1])
+            self.assertEqual(1, step_distance)
+        self.assertEqual(Vector2(0, 1), pathfinder.GetNextGridPosition(Vector2(1, 1), Vector2(1, 3)))
+
+if __name__ == '__main__':
+    unittest.main()
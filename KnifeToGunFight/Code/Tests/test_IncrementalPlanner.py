@@ -0,0 +1,55 @@
+import unittest
+
+from TestLevels import LoadLevel, MoveToGridPosition, SetUpDisplay, TearDownDisplay
+from Math.Vector2 import Vector2
+from Objects.LittleRobot import LittleRobot
+from Utilities.IncrementalPlanner import IncrementalPlanner
+
+## A map where a wall makes the enemy go around it to reach the player.
+MAP_TEXT = '\n'.join([
+    'XXXXXXX',
+    'XS X PX',
+    'X     X',
+    'XXXXXXX'])
+
+def setUpModule():
+    SetUpDisplay()
+
+def tearDownModule():
+    TearDownDisplay()
+
+## Tests for planning paths with an IncrementalPlanner.
+class IncrementalPlannerTests(unittest.TestCase):
+    def setUp(self):
+        self.Map = LoadLevel(MAP_TEXT)
+        self.Planner = IncrementalPlanner(self.Map)
+        self.EnemyGridPosition = Vector2(1, 1)
+        self.PlayerGridPosition = Vector2(5, 1)
+
+    ## Checks that other actors moving around, even more often than the map remembers, don't force a full replan.
+    def test_ActorMovesDoNotForceFullPlan(self):
+        self.Planner.GetNextGridPosition(self.EnemyGridPosition, self.PlayerGridPosition)
+        self.assertEqual(6, self.Planner.GetPlannedDistance())
+
+        other_enemy = LittleRobot(0, 0)
+        for move_index in range(self.Map.Map.CHANGE_LOG_LENGTH):
+            MoveToGridPosition(self.Map, other_enemy, Vector2(2 + (move_index % 2), 2))
+        self.assertIsNone(self.Map.Map.GetCellsChangedSince(0))
+
+        self.Planner.GetNextGridPosition(self.EnemyGridPosition, self.PlayerGridPosition)
+        self.assertEqual(6, self.Planner.GetPlannedDistance())
+        self.assertEqual(1, self.Planner.FullPlanCount)
+
+    ## Checks that removing a wall repairs the plan without starting over.
+    def test_WallRemovalRepairsPlan(self):
+        self.Planner.GetNextGridPosition(self.EnemyGridPosition, self.PlayerGridPosition)
+        wall = self.Map.Map[(3, 1)]
+        self.Map.RemoveObject(wall)
+
+        next_grid_position = self.Planner.GetNextGridPosition(self.EnemyGridPosition, self.PlayerGridPosition)
+        self.assertEqual(Vector2(2, 1), next_grid_position)
+        self.assertEqual(4, self.Planner.GetPlannedDistance())
+        self.assertEqual(1, self.Planner.FullPlanCount)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+
+from TestLevels import LoadLevel, SetUpDisplay, TearDownDisplay
+from Utilities.LineOfSight import LineOfSight
+
+## A map with a wall between the enemy and the player.
+MAP_TEXT = '\n'.join([
+    'XXXXXXX',
+    'XS X PX',
+    'X     X',
+    'XXXXXXX'])
+
+def setUpModule():
+    SetUpDisplay()
+
+def tearDownModule():
+    TearDownDisplay()
+
+## Tests for checking which grid positions can see each other.
+class LineOfSightTests(unittest.TestCase):
+    ## Checks that visibility is only found for the positions that are checked, and then cached.
+    def test_VisibilityIsFoundWhenChecked(self):
+        level_map = LoadLevel(MAP_TEXT)
+        self.assertEqual(0, level_map.LineOfSight.RayCount)
+
+        self.assertFalse(level_map.LineOfSight.IsVisible((1, 1), (5, 1)))
+        self.assertFalse(level_map.LineOfSight.IsVisible((5, 1), (1, 1)))
+        self.assertTrue(level_map.LineOfSight.IsVisible((1, 2), (5, 2)))
+        self.assertEqual(2, level_map.LineOfSight.RayCount)
+
+    ## Checks that removing a wall lets the positions on either side of it see each other.
+    def test_WallRemovalUpdatesVisibility(self):
+        level_map = LoadLevel(MAP_TEXT)
+        self.assertFalse(level_map.LineOfSight.IsVisible((1, 1), (5, 1)))
+
+        level_map.RemoveObject(level_map.Map[(3, 1)])
+        self.assertTrue(level_map.LineOfSight.IsVisible((1, 1), (5, 1)))
+
+    ## Checks that the cache never grows past its capacity.
+    def test_CacheIsBounded(self):
+        wall_grid = bytearray(8 * 8)
+        line_of_sight = LineOfSight(wall_grid, 8, 8, cache_capacity = 4)
+        for column_index in range(8):
+            self.assertTrue(line_of_sight.IsVisible((0, 0), (column_index, 7)))
+        self.assertEqual(8, line_of_sight.RayCount)
+
+        self.assertTrue(line_of_sight.IsVisible((0, 0), (0, 7)))
+        self.assertEqual(9, line_of_sight.RayCount)
+
+if __name__ == '__main__':
+    unittest.main()
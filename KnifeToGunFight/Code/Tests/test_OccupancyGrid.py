@@ -0,0 +1,50 @@
+import os
+import sys
+import unittest
+
+# Modules are imported relative to the main code directory.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+from Graphics.OccupancyGrid import OccupancyGrid
+
+## Tests for moving objects around an OccupancyGrid.
+class OccupancyGridTests(unittest.TestCase):
+    ## Checks that an object moved within the grid occupies its new cell and vacates its old one.
+    def test_MoveWithinGrid(self):
+        grid = OccupancyGrid(3, 3)
+        game_object = object()
+        grid.Move(game_object, 0, 0)
+        grid.Move(game_object, 1, 2)
+
+        self.assertIsNone(grid.get((0, 0)))
+        self.assertIs(game_object, grid.get((1, 2)))
+        self.assertEqual((1, 2), grid.GetGridPositionOf(game_object))
+        self.assertEqual({0, 7}, grid.GetCellsChangedSince(1))
+
+    ## Checks that moving an object off the edge of the grid leaves it where it was.
+    def test_MoveOffEdgeIsIgnored(self):
+        grid = OccupancyGrid(3, 3)
+        game_object = object()
+        grid.Move(game_object, 2, 1)
+        version = grid.Version
+
+        for column_index, row_index in ((3, 1), (-1, 1), (2, 3), (2, -1)):
+            replaced_object = grid.Move(game_object, column_index, row_index)
+            self.assertIsNone(replaced_object)
+            self.assertEqual((2, 1), grid.GetGridPositionOf(game_object))
+
+        self.assertEqual(version, grid.Version)
+        self.assertEqual(1, len(grid))
+
+    ## Checks that an object added off the edge of the grid isn't added.
+    def test_AddOffEdgeIsIgnored(self):
+        grid = OccupancyGrid(3, 3)
+        game_object = object()
+        grid[(5, 5)] = game_object
+
+        self.assertIsNone(grid.GetGridPositionOf(game_object))
+        self.assertEqual(0, len(grid))
+        self.assertEqual(0, grid.Version)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+
+# The test helpers add the main code directory to the import path.
+import TestLevels
+from Math.Vector2 import Vector2
+from Utilities.PathRequestScheduler import PathRequestScheduler
+
+## Tests for spreading path searches across frames with a PathRequestScheduler.
+class PathRequestSchedulerTests(unittest.TestCase):
+    def setUp(self):
+        self.Requesters = []
+        self.Scheduler = PathRequestScheduler(self.FindPath, budget_in_milliseconds = 1.0)
+
+    ## Finds a straight path to the destination, recording who it was found for.
+    ## \param[in]   requester - The object the path is for.
+    ## \param[in]   start_grid_position - The start as a Vector2 of column and row index.
+    ## \param[in]   destination_grid_position - The destination as a Vector2 of column and row index.
+    ## \return  The start and the destination.
+    def FindPath(self, requester, start_grid_position, destination_grid_position):
+        self.Requesters.append(requester)
+        return [start_grid_position, destination_grid_position]
+
+    ## Checks that a search expected to take longer than the budget waits for enough budget to be carried over.
+    def test_SearchLongerThanBudgetIsCarriedOver(self):
+        self.Scheduler.EstimatedCostInMilliseconds = 2.5
+        requester = object()
+        serviced_request_counts = []
+        for frame_index in range(3):
+            self.Scheduler.RequestPath(requester, Vector2(0, 0), Vector2(1, 0), 0, 1)
+            self.Scheduler.ServiceRequests()
+            serviced_request_counts.append(self.Scheduler.ServicedRequestCount)
+
+        self.assertEqual([0, 0, 1], serviced_request_counts)
+        self.assertEqual(2, self.Scheduler.OverBudgetFrameCount)
+        self.assertEqual(Vector2(1, 0), self.Scheduler.RequestPath(requester, Vector2(0, 0), Vector2(1, 0), 0, 1))
+
+    ## Checks that unused budget isn't saved up while nothing is waiting.
+    def test_IdleFramesDoNotSaveBudget(self):
+        for frame_index in range(10):
+            self.Scheduler.ServiceRequests()
+        self.assertLessEqual(self.Scheduler.CarriedOverBudgetInMilliseconds, 0.0)
+
+        self.Scheduler.EstimatedCostInMilliseconds = 2.5
+        self.Scheduler.RequestPath(object(), Vector2(0, 0), Vector2(1, 0), 0, 1)
+        self.Scheduler.ServiceRequests()
+        self.assertEqual(0, self.Scheduler.ServicedRequestCount)
+
+    ## Checks that a path is only searched for again when the map version it was found on changes.
+    def test_PathIsKeptUntilMapVersionChanges(self):
+        requester = object()
+        self.Scheduler.RequestPath(requester, Vector2(0, 0), Vector2(2, 0), 0, 2)
+        self.Scheduler.ServiceRequests()
+        self.Scheduler.RequestPath(requester, Vector2(0, 0), Vector2(2, 0), 0, 2)
+        self.assertEqual(0, len(self.Scheduler))
+
+        self.Scheduler.RequestPath(requester, Vector2(0, 0), Vector2(2, 0), 1, 2)
+        self.assertEqual(1, len(self.Scheduler))
+
+if __name__ == '__main__':
+    unittest.main()
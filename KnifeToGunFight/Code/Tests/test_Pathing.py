@@ -0,0 +1,70 @@
+import unittest
+
+from TestLevels import LoadLevel, MoveToGridPosition, SetUpDisplay, TearDownDisplay
+from Math.Vector2 import Vector2
+from Objects.LittleRobot import LittleRobot
+from Utilities.Pathing import Pathing
+
+## A map with a short corridor from the enemy to the player, and a longer way around below it.
+MAP_TEXT = '\n'.join([
+    'XXXXXXX',
+    'XS   PX',
+    'X XXX X',
+    'X     X',
+    'XXXXXXX'])
+
+def setUpModule():
+    SetUpDisplay()
+
+def tearDownModule():
+    TearDownDisplay()
+
+## Tests for finding paths with Pathing.
+class PathingTests(unittest.TestCase):
+    def setUp(self):
+        self.Map = LoadLevel(MAP_TEXT)
+        self.Pathing = Pathing(self.Map)
+        self.Enemy = self.Map.GetEnemies()[0]
+        self.PlayerGridPosition = Vector2(5, 1)
+
+    ## Checks that an enemy walking along its path keeps getting the rest of the path from the cache.
+    def test_WalkingAlongPathHitsCache(self):
+        path = self.Pathing.GetPath(Vector2(1, 1), self.PlayerGridPosition)
+        self.assertEqual([Vector2(column_index, 1) for column_index in range(1, 6)], path)
+        self.assertEqual(1, self.Pathing.CacheMissCount)
+
+        for step_index, grid_position in enumerate(path[1:-1], start = 1):
+            map_version = self.Map.Version
+            MoveToGridPosition(self.Map, self.Enemy, grid_position)
+            self.assertNotEqual(map_version, self.Map.Version)
+
+            remaining_path = self.Pathing.GetPath(grid_position, self.PlayerGridPosition)
+            self.assertEqual(path[step_index:], remaining_path)
+            self.assertEqual(step_index, self.Pathing.CacheHitCount)
+        self.assertEqual(1, self.Pathing.CacheMissCount)
+
+    ## Checks that a cached path that another actor has stepped onto is searched for again.
+    def test_BlockedCachedPathIsSearchedAgain(self):
+        self.Pathing.GetPath(Vector2(1, 1), self.PlayerGridPosition)
+        blocking_enemy = LittleRobot(0, 0)
+        MoveToGridPosition(self.Map, blocking_enemy, Vector2(3, 1))
+
+        path = self.Pathing.GetPath(Vector2(1, 1), self.PlayerGridPosition)
+        self.assertNotIn(Vector2(3, 1), path)
+        self.assertEqual(Vector2(5, 1), path[-1])
+        self.assertEqual(0, self.Pathing.CacheHitCount)
+        self.assertEqual(2, self.Pathing.CacheMissCount)
+
+    ## Checks that the cache doesn't keep growing as the destination moves around.
+    def test_CacheIsBoundedAsDestinationMoves(self):
+        CACHE_CAPACITY = 8
+        self.Pathing = Pathing(self.Map, cache_capacity = CACHE_CAPACITY)
+        destinations = [Vector2(column_index, 3) for column_index in range(1, 6)] + [Vector2(5, 2), Vector2(5, 1)]
+        for lap_index in range(3):
+            for destination_grid_position in destinations:
+                path = self.Pathing.GetPath(Vector2(1, 1), destination_grid_position)
+                self.assertEqual(destination_grid_position, path[-1])
+                self.assertLessEqual(self.Pathing.CachedPathCount, CACHE_CAPACITY)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import threading
+
+from Utilities.FlowField import FlowField
+
+## An immutable copy of which cells of a LevelMap are blocked by walls, which can be safely read from another
+## thread while the game continues to change the map.  Other objects don't block cells, since they move around
+## constantly and would make every snapshot out of date almost as soon as it was taken.
+class WalkableGridSnapshot(object):
+    ## Copies the blocked cells of a map.
+    ## \param[in]   level_map - The LevelMap to copy.
+    def __init__(self, level_map):
+        ## The LevelMap.StaticVersion the snapshot was taken from.
+        self.StaticVersion = level_map.StaticVersion
+        ## The number of columns in the grid.
+        self.Width = level_map.MapWidth
+        ## Whether each cell is blocked (1) or walkable (0), in row-major order.
+        self.BlockedCells = bytes(level_map.WallGrid)
+
+## A FlowField that is built on a worker thread, so that building it never holds up the game.
+## Each time the goal moves or the walls change, a snapshot of the walls is handed to the worker.  When the
+## worker finishes a field, it publishes it by swapping it into the front buffer, while it builds the next
+## field in its own back buffer.  Update() picks up the front buffer without waiting on the worker, so
+## between updates the field may lead to where the goal used to be.  Fields built from a snapshot of older
+## walls are discarded rather than used, since they may lead through cells that are now blocked.  Unlike
+## FlowField, MapVersion holds the LevelMap.StaticVersion the field was built from.
+class BackgroundFlowField(FlowField):
+    ## Constructor.  Starts the worker thread.
+    ## \param[in]   level_map - The LevelMap to find paths through.
+    def __init__(self, level_map):
+        FlowField.__init__(self, level_map)
+        # Until the first field is published, every grid position is unreachable.
+        self.Distances = [FlowField.UNREACHABLE_DISTANCE] * len(level_map.Map.Cells)
+        ## The number of fields that were discarded because the walls changed while they were being built.
+        self.DiscardedFieldCount = 0
+
+        # INITIALIZE THE BUFFERS.
+        ## The latest field published by the worker, as a (static version, goal, distances) three-tuple.
+        ## It's replaced rather than modified, so reading it never needs a lock.
+        self.__FrontBuffer = None
+        ## The last front buffer that was picked up by Update().
+        self.__ReadFrontBuffer = None
+        ## The (goal, static version) two-tuple of the last field handed to the worker.
+        self.__LastRequest = None
+
+        # START THE WORKER.
+        ## Guards the pending snapshot and signals the worker when there is work to do.
+        self.__WorkAvailable = threading.Condition()
+        ## The (snapshot, goal) two-tuple the worker should build a field from next, or None if there is none.
+        ## Requests that haven't been started yet are replaced by newer ones, since only the latest matters.
+        self.__PendingRequest = None
+        ## Set when the worker should exit.
+        self.__Stopped = False
+        self.__Worker = threading.Thread(target = self.__RunWorker, name = 'BackgroundFlowField', daemon = True)
+        self.__Worker.start()
+
+    ## Picks up the latest field published by the worker, and hands the worker a new snapshot
+    ## if the goal has moved or the walls have changed since the last one.  It never blocks.
+    ## \param[in]   goal_grid_position - The goal as a Vector2 of column and row index.
+    ## \return  True if a newly published field was picked up; false otherwise.
+    def Update(self, goal_grid_position):
+        # PICK UP THE LATEST PUBLISHED FIELD.
+        field_updated = False
+        front_buffer = self.__FrontBuffer
+        if (front_buffer is not None) and (front_buffer is not self.__ReadFrontBuffer):
+            self.__ReadFrontBuffer = front_buffer
+            static_version, goal, distances = front_buffer
+            field_stale = (static_version != self.Map.StaticVersion)
+            if field_stale:
+                self.DiscardedFieldCount += 1
+            else:
+                self.MapVersion = static_version
+                self.GoalGridPosition = goal
+                self.Distances = distances
+                self.BuildCount += 1
+                field_updated = True
+
+        # CHECK IF A NEW FIELD IS NEEDED.
+        goal = (goal_grid_position.X, goal_grid_position.Y)
+        request = (goal, self.Map.StaticVersion)
+        field_up_to_date = (request == (self.GoalGridPosition, self.MapVersion))
+        already_requested = (request == self.__LastRequest)
+        if field_up_to_date or already_requested:
+            return field_updated
+
+        # HAND A SNAPSHOT OF THE WALLS TO THE WORKER.
+        self.__LastRequest = request
+        snapshot = WalkableGridSnapshot(self.Map)
+        with self.__WorkAvailable:
+            self.__PendingRequest = (snapshot, goal)
+            self.__WorkAvailable.notify()
+        return field_updated
+
+    ## Stops the worker thread.  Any field it's building is discarded.
+    def Stop(self):
+        with self.__WorkAvailable:
+            self.__Stopped = True
+            self.__WorkAvailable.notify()
+
+    ## Builds fields from snapshots handed to the worker until stopped.
+    def __RunWorker(self):
+        while True:
+            # WAIT FOR A SNAPSHOT.
+            with self.__WorkAvailable:
+                while (self.__PendingRequest is None) and (not self.__Stopped):
+                    self.__WorkAvailable.wait()
+                if self.__Stopped:
+                    return
+                snapshot, goal = self.__PendingRequest
+                self.__PendingRequest = None
+
+            # BUILD THE FIELD IN THE BACK BUFFER.
+            column_index, row_index = goal
+            row_count = len(snapshot.BlockedCells) // snapshot.Width
+            goal_cell_index = None
+            goal_in_grid = (0 <= column_index < snapshot.Width) and (0 <= row_index < row_count)
+            if goal_in_grid:
+                goal_cell_index = (row_index * snapshot.Width) + column_index
+            back_buffer = FlowField.CalculateDistances(snapshot.BlockedCells, snapshot.Width, goal_cell_index)
+
+            # PUBLISH THE FIELD.
+            # Replacing the reference is atomic, so Update() sees either the old field or the new one.
+            self.__FrontBuffer = (snapshot.StaticVersion, goal, back_buffer)
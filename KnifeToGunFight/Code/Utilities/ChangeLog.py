@@ -0,0 +1,47 @@
+from collections import deque
+
+## A record of the most recent changes to the cells of a grid.  It allows anything computed from the
+## grid to be updated with only the cells that have changed, as long as it's updated before the changes
+## are forgotten.
+class ChangeLog(object):
+    ## Constructor.
+    ## \param[in]   max_length - The maximum number of cell changes to remember.
+    def __init__(self, max_length):
+        ## Incremented every time a change is recorded, so that anything computed
+        ## from the grid can tell when it's out of date.
+        self.Version = 0
+        ## The remembered changes, as (version, cell index) two-tuples for each changed cell.
+        self.__Changes = deque(maxlen = max_length)
+
+    ## Records a change to one or more cells as a single new version.
+    ## \param[in]   cell_indices - The indices of the changed cells.
+    def Record(self, *cell_indices):
+        self.Version += 1
+        for cell_index in cell_indices:
+            self.__Changes.append((self.Version, cell_index))
+
+    ## Gets the cells that have changed since a version.
+    ## \param[in]   version - A previous value of Version.
+    ## \return  A set of the indices of the changed cells, or None if the changes since the
+    ##      version are too old to still be remembered.
+    def GetCellsChangedSince(self, version):
+        # CHECK IF ALL OF THE CHANGES ARE STILL REMEMBERED.
+        # Changes are only forgotten once the log is full.  The changes for the oldest version
+        # remembered may then have been partially forgotten, so only changes after that
+        # version are known to be complete.
+        if version == self.Version:
+            return set()
+        changes_may_have_been_forgotten = (len(self.__Changes) == self.__Changes.maxlen)
+        if changes_may_have_been_forgotten:
+            oldest_complete_version = self.__Changes[0][0]
+            if version < oldest_complete_version:
+                return None
+
+        # GET THE CHANGES.
+        # The log is searched from newest to oldest since only the most recent changes are usually needed.
+        changed_cell_indices = set()
+        for changed_version, cell_index in reversed(self.__Changes):
+            if changed_version <= version:
+                break
+            changed_cell_indices.add(cell_index)
+        return changed_cell_indices
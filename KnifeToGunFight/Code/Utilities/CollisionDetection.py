@@ -17,10 +17,11 @@ class MoveDirection(Enum):
 ## \date    09/01/2018
 def CheckForCollision(game_object, map):
     # CHECK FOR COLLISION.
+    # Only objects near the moving object can collide with it.
     # The object is allowed to collide with itself.
-    objects_to_check = [object for object in map.Map.values() if
-        not object == game_object]
-    for object in objects_to_check:
+    for object in map.GetCollisionCandidates(game_object.Coordinates):
+        if object is game_object:
+            continue
         collision_occurred = game_object.Coordinates.colliderect(object.Coordinates)
         if collision_occurred:
             return object
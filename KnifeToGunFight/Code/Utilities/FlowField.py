@@ -0,0 +1,137 @@
+from collections import deque
+
+from Math.Vector2 import Vector2
+
+## A map of the number of steps from every grid position to a single goal position
+## (sometimes called a "Dijkstra map").  It's built with a single breadth-first search
+## outward from the goal, after which any number of objects heading toward the goal
+## can look up their next step without searching for their own path.
+class FlowField(object):
+    ## The distance stored for grid positions that can't reach the goal.
+    UNREACHABLE_DISTANCE = -1
+
+    ## Constructor.
+    ## \param[in]   level_map - The LevelMap to find paths through.
+    def __init__(self, level_map):
+        ## The LevelMap to find paths through.
+        self.Map = level_map
+        ## The (column, row) two-tuple of the grid position the field leads to.
+        self.GoalGridPosition = None
+        ## The version of the map the field was last built from.
+        self.MapVersion = None
+        ## The number of steps from each grid position to the goal, in row-major order.
+        ## Grid positions that can't reach the goal are set to UNREACHABLE_DISTANCE.
+        self.Distances = []
+        ## The number of times the field has been built.
+        self.BuildCount = 0
+
+    ## Rebuilds the field if the goal has moved or the map has changed since it was last built.
+    ## \param[in]   goal_grid_position - The goal as a Vector2 of column and row index.
+    ## \return  True if the field was rebuilt; false if it was already up to date.
+    def Update(self, goal_grid_position):
+        # CHECK IF THE FIELD IS ALREADY UP TO DATE.
+        goal_grid_position = (goal_grid_position.X, goal_grid_position.Y)
+        goal_unchanged = (goal_grid_position == self.GoalGridPosition)
+        map_unchanged = (self.Map.Version == self.MapVersion)
+        if goal_unchanged and map_unchanged:
+            return False
+
+        # REBUILD THE FIELD.
+        self.GoalGridPosition = goal_grid_position
+        self.MapVersion = self.Map.Version
+        self.Distances = self.__CalculateDistances(goal_grid_position)
+        self.BuildCount += 1
+        return True
+
+    ## Gets the number of steps from a grid position to the goal.
+    ## \param[in]   grid_position - A grid position as a Vector2 of column and row index.
+    ## \return  The number of steps, or None if the goal can't be reached from the position.
+    def GetDistance(self, grid_position):
+        cell_index = self.Map.Map.GetCellIndex((grid_position.X, grid_position.Y))
+        if cell_index is None:
+            return None
+        distance = self.Distances[cell_index]
+        if distance == FlowField.UNREACHABLE_DISTANCE:
+            return None
+        return distance
+
+    ## Gets the next grid position along the shortest path from a grid position to the goal.
+    ## \param[in]   grid_position - A grid position as a Vector2 of column and row index.
+    ## \return  The neighboring grid position closest to the goal as a Vector2 of column and row index,
+    ##      or None if the goal can't be reached or the position is already at the goal.
+    def GetNextGridPosition(self, grid_position):
+        # CHECK IF THE POSITION IS ALREADY AT THE GOAL.
+        if (grid_position.X, grid_position.Y) == self.GoalGridPosition:
+            return None
+
+        # FIND THE NEIGHBOR CLOSEST TO THE GOAL.
+        # The position itself may be occupied (such as by the object that is moving), so
+        # its own distance can't be relied on.  Its neighbors are checked in the same
+        # order as Pathing so that ties are broken the same way.
+        neighbors = (
+            Vector2(grid_position.X, grid_position.Y - 1),
+            Vector2(grid_position.X, grid_position.Y + 1),
+            Vector2(grid_position.X - 1, grid_position.Y),
+            Vector2(grid_position.X + 1, grid_position.Y))
+        closest_neighbor = None
+        closest_distance = None
+        for neighbor in neighbors:
+            distance = self.GetDistance(neighbor)
+            if distance is None:
+                continue
+            if (closest_distance is None) or (distance < closest_distance):
+                closest_neighbor = neighbor
+                closest_distance = distance
+        return closest_neighbor
+
+    ## Calculates the number of steps from every grid position to a goal.
+    ## Only unoccupied grid positions can be passed through.
+    ## \param[in]   goal_grid_position - The goal as a (column, row) two-tuple.
+    ## \return  The distance to the goal for every grid position, in row-major order.
+    def __CalculateDistances(self, goal_grid_position):
+        goal_cell_index = self.Map.Map.GetCellIndex(goal_grid_position)
+        return FlowField.CalculateDistances(self.Map.Map.Cells, self.Map.MapWidth, goal_cell_index)
+
+    ## Calculates the number of steps from every cell of a grid to a goal cell.
+    ## It only reads the cells passed to it, so it can be used with a snapshot of the map.
+    ## \param[in]   blocked_cells - A sequence in row-major order of whether each cell is blocked.
+    ##      Any value that is true, such as the game object occupying the cell, blocks the cell.
+    ## \param[in]   width - The number of columns in the grid.
+    ## \param[in]   goal_cell_index - The index of the goal cell, or None if the goal is outside of the grid.
+    ## \return  The distance to the goal for every cell, in row-major order.
+    @staticmethod
+    def CalculateDistances(blocked_cells, width, goal_cell_index):
+        # INITIALIZE ALL POSITIONS AS UNREACHABLE.
+        cell_count = len(blocked_cells)
+        distances = [FlowField.UNREACHABLE_DISTANCE] * cell_count
+        if goal_cell_index is None:
+            return distances
+
+        # SEARCH OUTWARD FROM THE GOAL.
+        # The goal itself is usually occupied (such as by the player), so it's
+        # always included even though other occupied cells aren't.
+        distances[goal_cell_index] = 0
+        cells_to_visit = deque([goal_cell_index])
+        while cells_to_visit:
+            cell_index = cells_to_visit.popleft()
+            neighbor_distance = distances[cell_index] + 1
+
+            # VISIT EACH NEIGHBOR THAT IS WITHIN THE MAP.
+            column_index = cell_index % width
+            neighbor_cell_indices = []
+            if cell_index >= width:
+                neighbor_cell_indices.append(cell_index - width)
+            if cell_index + width < cell_count:
+                neighbor_cell_indices.append(cell_index + width)
+            if column_index > 0:
+                neighbor_cell_indices.append(cell_index - 1)
+            if column_index < width - 1:
+                neighbor_cell_indices.append(cell_index + 1)
+            for neighbor_cell_index in neighbor_cell_indices:
+                already_visited = (distances[neighbor_cell_index] != FlowField.UNREACHABLE_DISTANCE)
+                if already_visited or blocked_cells[neighbor_cell_index]:
+                    continue
+                distances[neighbor_cell_index] = neighbor_distance
+                cells_to_visit.append(neighbor_cell_index)
+
+        return distances
@@ -0,0 +1,401 @@
+from heapq import heappush, heappop
+
+## The common parts of searches for shortest paths across the grid of a LevelMap.
+## Moving between any two neighboring grid positions has the same cost, and only
+## unoccupied grid positions (and the destination) can be passed through.
+## Grid positions are handled as integer indices into the row-major cells of the map,
+## and all per-position search state is kept in lists that are allocated once and
+## reused between searches.  Rather than clearing the lists before every search, each
+## entry is stamped with the search it was written by, so entries left over from
+## previous searches can be recognized and ignored.
+class GridSearch(object):
+    ## The came-from cell index of the start of a path.
+    NO_CELL_INDEX = -1
+
+    ## Constructor.
+    ## \param[in]   level_map - The LevelMap to find paths through.
+    def __init__(self, level_map):
+        ## The LevelMap to find paths through.
+        self.Map = level_map
+        ## The number of grid positions expanded by the most recent search.
+        self.ExpandedNodeCount = 0
+        ## The number of grid positions expanded by all searches.
+        self.TotalExpandedNodeCount = 0
+        ## The number of searches that have been performed.
+        self.SearchCount = 0
+
+        # INITIALIZE THE REUSABLE SEARCH STATE.
+        # These are sized for the map when the first search is performed.
+        ## The cell indices of the neighbors of each cell, in the order up, down, left and right.
+        self.NeighborCellIndices = []
+        ## The column index of each cell.
+        self.ColumnIndices = []
+        ## The row index of each cell.
+        self.RowIndices = []
+        ## The cost of the best known path from the start to each cell.
+        self.GScores = []
+        ## The cell index preceding each cell along the best known path from the start.
+        self.CameFrom = []
+        ## The search that last wrote the g-score and came-from entries of each cell.
+        self.SearchGenerations = []
+        ## The search currently being performed.
+        self.SearchGeneration = 0
+
+    ## Finds the shortest path between two grid positions.
+    ## \param[in]   start_grid_position - The start as a (column, row) two-tuple.
+    ## \param[in]   destination_grid_position - The destination as a (column, row) two-tuple.
+    ## \return  A list of (column, row) two-tuples tracing the shortest path, with the first element
+    ##      being start_grid_position, or None if no path could be found.
+    def FindPath(self, start_grid_position, destination_grid_position):
+        # CHECK IF THE PATH IS TRIVIAL.
+        if start_grid_position == destination_grid_position:
+            return [start_grid_position]
+
+        # CHECK THAT BOTH POSITIONS ARE IN THE MAP.
+        start_cell_index = self.Map.Map.GetCellIndex(start_grid_position)
+        destination_cell_index = self.Map.Map.GetCellIndex(destination_grid_position)
+        if (start_cell_index is None) or (destination_cell_index is None):
+            return None
+
+        # SEARCH FOR THE PATH.
+        self.__BeginSearch()
+        cell_indices = self.Search(start_cell_index, destination_cell_index)
+        self.TotalExpandedNodeCount += self.ExpandedNodeCount
+        if cell_indices is None:
+            return None
+        return [(self.ColumnIndices[cell_index], self.RowIndices[cell_index]) for cell_index in cell_indices]
+
+    ## Searches for the shortest path between two cells.  Must be implemented by subclasses,
+    ## which should set ExpandedNodeCount.
+    ## \param[in]   start_cell_index - The index of the start cell.
+    ## \param[in]   destination_cell_index - The index of the destination cell.
+    ## \return  A list of the cell indices along the shortest path, starting with the
+    ##      start cell, or None if no path could be found.
+    def Search(self, start_cell_index, destination_cell_index):
+        raise NotImplementedError
+
+    ## Determines the list of cell indices along a path that has been found by following
+    ## the came-from cell of each cell back to the start.
+    ## \param[in]   destination_cell_index - The index of the last cell of the path.
+    ## \return  The list of cell indices, starting with the start cell.
+    def ReconstructPath(self, destination_cell_index):
+        cell_indices = []
+        cell_index = destination_cell_index
+        while cell_index != GridSearch.NO_CELL_INDEX:
+            cell_indices.append(cell_index)
+            cell_index = self.CameFrom[cell_index]
+        cell_indices.reverse()
+        return cell_indices
+
+    ## Gets the Manhattan distance between two cells, which is the exact
+    ## distance between them if nothing is in the way.
+    ## \param[in]   cell_index - The index of one cell.
+    ## \param[in]   other_cell_index - The index of the other cell.
+    ## \return  The number of steps between the cells.
+    def GetManhattanDistance(self, cell_index, other_cell_index):
+        column_delta = abs(self.ColumnIndices[cell_index] - self.ColumnIndices[other_cell_index])
+        row_delta = abs(self.RowIndices[cell_index] - self.RowIndices[other_cell_index])
+        return column_delta + row_delta
+
+    ## Prepares the reusable search state for a new search.
+    def __BeginSearch(self):
+        # SIZE THE SEARCH STATE FOR THE MAP IF NEEDED.
+        width = self.Map.MapWidth
+        height = self.Map.MapHeight
+        cell_count = width * height
+        if len(self.NeighborCellIndices) != cell_count:
+            self.NeighborCellIndices = []
+            self.ColumnIndices = []
+            self.RowIndices = []
+            for cell_index in range(cell_count):
+                row_index, column_index = divmod(cell_index, width)
+                neighbor_cell_indices = []
+                if row_index > 0:
+                    neighbor_cell_indices.append(cell_index - width)
+                if row_index < height - 1:
+                    neighbor_cell_indices.append(cell_index + width)
+                if column_index > 0:
+                    neighbor_cell_indices.append(cell_index - 1)
+                if column_index < width - 1:
+                    neighbor_cell_indices.append(cell_index + 1)
+                self.NeighborCellIndices.append(tuple(neighbor_cell_indices))
+                self.ColumnIndices.append(column_index)
+                self.RowIndices.append(row_index)
+            self.GScores = [0] * cell_count
+            self.CameFrom = [GridSearch.NO_CELL_INDEX] * cell_count
+            # Entries are stamped with the search that wrote them, so starting the first
+            # generation above zero makes every entry initially look out of date.
+            self.SearchGenerations = [0] * cell_count
+
+        # START A NEW GENERATION.
+        # This invalidates all of the entries written by previous searches.
+        self.SearchGeneration += 1
+        self.SearchCount += 1
+        self.ExpandedNodeCount = 0
+
+## A* search specialized for the grid of a LevelMap.
+## The Manhattan distance is used as the heuristic since it's exact on an empty grid,
+## and the open set is a heap of plain (f-score, h-score, cell index) tuples.
+class GridAStar(GridSearch):
+    ## Searches for the shortest path between two cells.
+    ## \param[in]   start_cell_index - The index of the start cell.
+    ## \param[in]   destination_cell_index - The index of the destination cell.
+    ## \return  A list of the cell indices along the shortest path, starting with the
+    ##      start cell, or None if no path could be found.
+    def Search(self, start_cell_index, destination_cell_index):
+        # The search state is accessed through local variables since it's used in the innermost loop.
+        cells = self.Map.Map.Cells
+        neighbor_cell_indices_per_cell = self.NeighborCellIndices
+        column_indices = self.ColumnIndices
+        row_indices = self.RowIndices
+        g_scores = self.GScores
+        came_from = self.CameFrom
+        search_generations = self.SearchGenerations
+        search_generation = self.SearchGeneration
+        destination_column_index = column_indices[destination_cell_index]
+        destination_row_index = row_indices[destination_cell_index]
+
+        # START FROM THE START CELL.
+        g_scores[start_cell_index] = 0
+        came_from[start_cell_index] = GridSearch.NO_CELL_INDEX
+        search_generations[start_cell_index] = search_generation
+        start_h_score = self.GetManhattanDistance(start_cell_index, destination_cell_index)
+        open_cells = [(start_h_score, start_h_score, start_cell_index)]
+
+        # EXPAND CELLS UNTIL THE DESTINATION IS REACHED.
+        expanded_node_count = 0
+        while open_cells:
+            f_score, h_score, cell_index = heappop(open_cells)
+
+            # SKIP THE CELL IF A SHORTER PATH TO IT HAS ALREADY BEEN FOUND.
+            # Cells aren't removed from the heap when a shorter path is found, so
+            # there can be out-of-date entries for the same cell in the heap.
+            g_score = f_score - h_score
+            if g_score > g_scores[cell_index]:
+                continue
+
+            # CHECK IF THE DESTINATION HAS BEEN REACHED.
+            if cell_index == destination_cell_index:
+                self.ExpandedNodeCount = expanded_node_count
+                return self.ReconstructPath(destination_cell_index)
+
+            # VISIT EACH NEIGHBOR THAT CAN BE MOVED TO.
+            expanded_node_count += 1
+            neighbor_g_score = g_score + 1
+            for neighbor_cell_index in neighbor_cell_indices_per_cell[cell_index]:
+                # The destination is usually occupied (such as by the player), so it
+                # can always be moved to even though other occupied cells can't.
+                occupied = (cells[neighbor_cell_index] is not None)
+                if occupied and (neighbor_cell_index != destination_cell_index):
+                    continue
+
+                # SKIP THE NEIGHBOR IF THIS ISN'T A SHORTER PATH TO IT.
+                already_reached = (search_generations[neighbor_cell_index] == search_generation)
+                if already_reached and (neighbor_g_score >= g_scores[neighbor_cell_index]):
+                    continue
+
+                # ADD THE NEIGHBOR TO THE OPEN SET.
+                search_generations[neighbor_cell_index] = search_generation
+                g_scores[neighbor_cell_index] = neighbor_g_score
+                came_from[neighbor_cell_index] = cell_index
+                neighbor_h_score = (
+                    abs(column_indices[neighbor_cell_index] - destination_column_index) +
+                    abs(row_indices[neighbor_cell_index] - destination_row_index))
+                heappush(open_cells, (neighbor_g_score + neighbor_h_score, neighbor_h_score, neighbor_cell_index))
+
+        self.ExpandedNodeCount = expanded_node_count
+        return None
+
+## Jump Point Search specialized for the 4-connected grid of a LevelMap.
+## On a uniform-cost grid there are usually many equally short paths between two positions,
+## and plain A* ends up expanding most of them.  This search only considers paths that
+## move vertically as early as possible (vertical moves are only made after a horizontal
+## move when an obstacle prevented making them earlier), so it can "jump" along straight
+## lines without expanding the cells in between, and only expands the cells where such
+## a path could turn (the jump points).  It finds paths of the same length as A*.
+class JumpPointSearch(GridSearch):
+    ## Constructor.
+    ## \param[in]   level_map - The LevelMap to find paths through.
+    def __init__(self, level_map):
+        GridSearch.__init__(self, level_map)
+        ## The cells of the map during the current search.
+        self.__Cells = []
+        ## The index of the destination cell of the current search.
+        self.__DestinationCellIndex = GridSearch.NO_CELL_INDEX
+
+    ## Searches for the shortest path between two cells.
+    ## \param[in]   start_cell_index - The index of the start cell.
+    ## \param[in]   destination_cell_index - The index of the destination cell.
+    ## \return  A list of the cell indices along the shortest path, starting with the
+    ##      start cell, or None if no path could be found.
+    def Search(self, start_cell_index, destination_cell_index):
+        # STORE THE STATE NEEDED WHILE JUMPING.
+        self.__Cells = self.Map.Map.Cells
+        self.__DestinationCellIndex = destination_cell_index
+        g_scores = self.GScores
+        came_from = self.CameFrom
+        search_generations = self.SearchGenerations
+        search_generation = self.SearchGeneration
+
+        # START FROM THE START CELL.
+        g_scores[start_cell_index] = 0
+        came_from[start_cell_index] = GridSearch.NO_CELL_INDEX
+        search_generations[start_cell_index] = search_generation
+        start_h_score = self.GetManhattanDistance(start_cell_index, destination_cell_index)
+        open_cells = [(start_h_score, start_h_score, start_cell_index)]
+
+        # EXPAND JUMP POINTS UNTIL THE DESTINATION IS REACHED.
+        expanded_node_count = 0
+        while open_cells:
+            f_score, h_score, cell_index = heappop(open_cells)
+
+            # SKIP THE CELL IF A SHORTER PATH TO IT HAS ALREADY BEEN FOUND.
+            g_score = f_score - h_score
+            if g_score > g_scores[cell_index]:
+                continue
+
+            # CHECK IF THE DESTINATION HAS BEEN REACHED.
+            if cell_index == destination_cell_index:
+                self.ExpandedNodeCount = expanded_node_count
+                return self.__ExpandJumpPoints(self.ReconstructPath(destination_cell_index))
+
+            # VISIT EACH JUMP POINT THAT CAN BE JUMPED TO.
+            expanded_node_count += 1
+            for jump_point_cell_index in self.__GetSuccessors(cell_index):
+                jump_point_g_score = g_score + self.GetManhattanDistance(cell_index, jump_point_cell_index)
+                already_reached = (search_generations[jump_point_cell_index] == search_generation)
+                if already_reached and (jump_point_g_score >= g_scores[jump_point_cell_index]):
+                    continue
+
+                search_generations[jump_point_cell_index] = search_generation
+                g_scores[jump_point_cell_index] = jump_point_g_score
+                came_from[jump_point_cell_index] = cell_index
+                jump_point_h_score = self.GetManhattanDistance(jump_point_cell_index, destination_cell_index)
+                heappush(open_cells, (jump_point_g_score + jump_point_h_score, jump_point_h_score, jump_point_cell_index))
+
+        self.ExpandedNodeCount = expanded_node_count
+        return None
+
+    ## Gets the jump points that can be reached from a jump point.
+    ## \param[in]   cell_index - The index of the jump point's cell.
+    ## \return  The cell indices of the reachable jump points.
+    def __GetSuccessors(self, cell_index):
+        # DETERMINE THE DIRECTIONS TO JUMP IN.
+        # Paths only ever continue in the direction they were moving or turn, since turning
+        # around can't be part of a shortest path.  The start can be left in any direction.
+        column_index = self.ColumnIndices[cell_index]
+        row_index = self.RowIndices[cell_index]
+        previous_cell_index = self.CameFrom[cell_index]
+        if previous_cell_index == GridSearch.NO_CELL_INDEX:
+            horizontal_directions = (-1, 1)
+            vertical_directions = (-1, 1)
+        elif self.RowIndices[previous_cell_index] == row_index:
+            # After moving horizontally, paths can continue horizontally or turn vertically.
+            # Horizontal jumps only stop where a vertical turn is needed.
+            horizontal_directions = (1 if (column_index > self.ColumnIndices[previous_cell_index]) else -1,)
+            vertical_directions = (-1, 1)
+        else:
+            # After moving vertically, paths can continue vertically or turn horizontally.
+            horizontal_directions = (-1, 1)
+            vertical_directions = (1 if (row_index > self.RowIndices[previous_cell_index]) else -1,)
+
+        # JUMP IN EACH DIRECTION.
+        successors = []
+        for row_delta in vertical_directions:
+            jump_point = self.__JumpVertically(column_index, row_index, row_delta)
+            if jump_point is not None:
+                successors.append(jump_point)
+        for column_delta in horizontal_directions:
+            jump_point = self.__JumpHorizontally(column_index, row_index, column_delta)
+            if jump_point is not None:
+                successors.append(jump_point)
+        return successors
+
+    ## Moves horizontally from a cell until reaching a jump point.
+    ## Horizontal moves stop at the destination or at cells where a vertical move is possible that
+    ## wasn't possible from the previous cell (which means the path may need to turn there).
+    ## \param[in]   column_index - The column of the cell to jump from.
+    ## \param[in]   row_index - The row of the cell to jump from.
+    ## \param[in]   column_delta - -1 to jump left or 1 to jump right.
+    ## \return  The cell index of the jump point, or None if an obstacle was reached first.
+    def __JumpHorizontally(self, column_index, row_index, column_delta):
+        # This is the innermost loop of the search, so state is accessed through local variables.
+        cells = self.__Cells
+        destination_cell_index = self.__DestinationCellIndex
+        width = self.Map.MapWidth
+        row_above_exists = (row_index > 0)
+        row_below_exists = (row_index < self.Map.MapHeight - 1)
+        cell_index = (row_index * width) + column_index
+        while True:
+            # MOVE TO THE NEXT CELL.
+            column_index += column_delta
+            cell_index += column_delta
+            if not (0 <= column_index < width):
+                return None
+            if cell_index == destination_cell_index:
+                return cell_index
+            if cells[cell_index] is not None:
+                return None
+
+            # STOP IF A VERTICAL TURN WAS BLOCKED FROM THE PREVIOUS CELL.
+            # The destination counts as unblocked even though it's usually occupied.
+            for row_exists, cell_index_to_turn_to in ((row_above_exists, cell_index - width), (row_below_exists, cell_index + width)):
+                if not row_exists:
+                    continue
+                previous_cell_index_to_turn_to = cell_index_to_turn_to - column_delta
+                can_turn_here = (cells[cell_index_to_turn_to] is None) or (cell_index_to_turn_to == destination_cell_index)
+                could_turn_previously = (
+                    (cells[previous_cell_index_to_turn_to] is None) or
+                    (previous_cell_index_to_turn_to == destination_cell_index))
+                if can_turn_here and not could_turn_previously:
+                    return cell_index
+
+    ## Moves vertically from a cell until reaching a jump point.
+    ## Since paths can turn horizontally after any vertical move, vertical moves stop at the
+    ## destination or at cells where a horizontal jump from the cell would reach a jump point.
+    ## \param[in]   column_index - The column of the cell to jump from.
+    ## \param[in]   row_index - The row of the cell to jump from.
+    ## \param[in]   row_delta - -1 to jump up or 1 to jump down.
+    ## \return  The cell index of the jump point, or None if an obstacle was reached first.
+    def __JumpVertically(self, column_index, row_index, row_delta):
+        while True:
+            # MOVE TO THE NEXT CELL.
+            row_index += row_delta
+            if not self.__IsPassable(column_index, row_index):
+                return None
+            cell_index = (row_index * self.Map.MapWidth) + column_index
+            if cell_index == self.__DestinationCellIndex:
+                return cell_index
+
+            # STOP IF A JUMP POINT CAN BE REACHED BY TURNING HORIZONTALLY.
+            for column_delta in (-1, 1):
+                if self.__JumpHorizontally(column_index, row_index, column_delta) is not None:
+                    return cell_index
+
+    ## Determines whether a cell can be moved into.
+    ## \param[in]   column_index - The column of the cell.
+    ## \param[in]   row_index - The row of the cell.
+    ## \return  True if the cell is within the map and is unoccupied or is the destination; false otherwise.
+    def __IsPassable(self, column_index, row_index):
+        in_x_bounds = (0 <= column_index < self.Map.MapWidth)
+        in_y_bounds = (0 <= row_index < self.Map.MapHeight)
+        if not (in_x_bounds and in_y_bounds):
+            return False
+        cell_index = (row_index * self.Map.MapWidth) + column_index
+        return (self.__Cells[cell_index] is None) or (cell_index == self.__DestinationCellIndex)
+
+    ## Fills in the cells between each pair of jump points along a path.
+    ## \param[in]   jump_point_cell_indices - The cell indices of the jump points along the path.
+    ## \return  The cell indices of every cell along the path.
+    def __ExpandJumpPoints(self, jump_point_cell_indices):
+        width = self.Map.MapWidth
+        cell_indices = [jump_point_cell_indices[0]]
+        for jump_point_cell_index in jump_point_cell_indices[1:]:
+            # Jump points are always in the same row or column as the previous jump point.
+            previous_cell_index = cell_indices[-1]
+            same_row = (self.RowIndices[jump_point_cell_index] == self.RowIndices[previous_cell_index])
+            step = 1 if same_row else width
+            if jump_point_cell_index < previous_cell_index:
+                step = -step
+            cell_indices.extend(range(previous_cell_index + step, jump_point_cell_index + step, step))
+        return cell_indices
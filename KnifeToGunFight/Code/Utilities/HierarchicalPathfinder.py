@@ -0,0 +1,375 @@
+from collections import deque
+from heapq import heappush, heappop
+
+from Math.Vector2 import Vector2
+
+## Finds paths across large maps with hierarchical pathfinding (HPA*).
+## The map is divided into square clusters of cells.  Wherever cells on either side of the border
+## between two clusters are both free of walls, the border has an entrance, and a cell on each side of
+## the entrance becomes a node of an abstract graph.  The distances between the nodes within each
+## cluster are found once and cached, so a long path can be found by searching the small abstract
+## graph rather than every cell of the map.  Only the first segment of the path (up to the first node)
+## is refined into individual grid positions, since that's all that is needed to take the next step.
+##
+## Moving between neighboring grid positions costs 1, and any grid position without a wall (and the
+## destination) can be moved into.  Other objects are passed through, since they move around constantly
+## and would otherwise force clusters to be rebuilt on almost every frame.  Paths are close to, but not
+## always exactly, the shortest.  When walls are added or removed, only the clusters around them are rebuilt.
+class HierarchicalPathfinder(object):
+    ## The default width and height of each cluster, in cells.
+    DEFAULT_CLUSTER_SIZE = 8
+    ## Entrances at least this many cells wide have a node pair at each end rather than one in the middle.
+    WIDE_ENTRANCE_WIDTH_IN_CELLS = 6
+
+    ## Builds the abstract graph for a map.
+    ## \param[in]   level_map - The LevelMap to find paths through.
+    ## \param[in]   cluster_size - The width and height of each cluster, in cells.
+    def __init__(self, level_map, cluster_size = DEFAULT_CLUSTER_SIZE):
+        ## The LevelMap to find paths through.
+        self.Map = level_map
+        ## The width and height of each cluster, in cells.
+        self.ClusterSize = cluster_size
+        ## The number of columns of clusters.  Clusters on the right edge of the map may be narrower.
+        self.ClusterColumnCount = -(-level_map.MapWidth // cluster_size)
+        ## The number of rows of clusters.  Clusters on the bottom edge of the map may be shorter.
+        self.ClusterRowCount = -(-level_map.MapHeight // cluster_size)
+        ## The number of times a cluster's cached distances have been calculated.
+        self.ClusterBuildCount = 0
+        ## The number of abstract graph nodes expanded by the most recent search.
+        self.ExpandedNodeCount = 0
+
+        # INITIALIZE THE ABSTRACT GRAPH.
+        ## The node pairs of the entrances on the border between each pair of neighboring clusters.
+        ## Keyed by two-tuples of the cluster indices, with the top or left cluster first.  Each value
+        ## is a list of two-tuples of the cell indices on each side of the entrance, in the same order.
+        self.__NodePairsPerBorder = {}
+        ## The nodes in other clusters that are next to each node.
+        self.__NeighboringNodesPerNode = {}
+        ## The distances between the nodes within each cluster.  Keyed by cluster index, each value
+        ## is a dictionary of the list of (other node, distance) two-tuples reachable from each node.
+        self.__NodeDistancesPerCluster = {}
+        ## The LevelMap.StaticVersion the abstract graph is up to date with.
+        self.__StaticVersion = None
+        self.__Build()
+
+    ## Gets the next grid position along the path from a start to a destination.
+    ## \param[in]   start_grid_position - The start as a Vector2 of column and row index.
+    ## \param[in]   destination_grid_position - The destination as a Vector2 of column and row index.
+    ## \return  The next grid position as a Vector2 of column and row index, or None if the
+    ##      destination can't be reached or the start is already at the destination.
+    def GetNextGridPosition(self, start_grid_position, destination_grid_position):
+        path_segment = self.GetFirstPathSegment(start_grid_position.AsXYTuple(), destination_grid_position.AsXYTuple())
+        if (path_segment is None) or (len(path_segment) < 2):
+            return None
+        next_column_index, next_row_index = path_segment[1]
+        return Vector2(next_column_index, next_row_index)
+
+    ## Finds the path from a start to a destination, refining only its first segment.
+    ## \param[in]   start_grid_position - The start as a (column, row) two-tuple.
+    ## \param[in]   destination_grid_position - The destination as a (column, row) two-tuple.
+    ## \return  A list of (column, row) two-tuples tracing the path from the start up to the first
+    ##      node along the path (or the destination if it's reached first), or None if no path could be found.
+    def GetFirstPathSegment(self, start_grid_position, destination_grid_position):
+        # CHECK IF THE PATH IS TRIVIAL.
+        if start_grid_position == destination_grid_position:
+            return [start_grid_position]
+
+        # CHECK THAT BOTH POSITIONS ARE IN THE MAP.
+        start_cell_index = self.Map.Map.GetCellIndex(start_grid_position)
+        destination_cell_index = self.Map.Map.GetCellIndex(destination_grid_position)
+        if (start_cell_index is None) or (destination_cell_index is None):
+            return None
+
+        # BRING THE ABSTRACT GRAPH UP TO DATE.
+        self.__Update()
+
+        # CONNECT THE START AND DESTINATION TO THE ABSTRACT GRAPH.
+        # This is done by searching within their clusters to find their distances to the nodes there.
+        # Since the start can always be left and the destination can always be entered, even if they're
+        # blocked, these searches can also cross into neighboring clusters right next to them.
+        start_distances, start_came_from = self.__SearchClusters(start_cell_index, destination_cell_index)
+        start_edges = [
+            (cell_index, distance) for cell_index, distance in start_distances.items()
+            if self.__IsNode(cell_index) or (cell_index == destination_cell_index)]
+        # Moving between cells costs the same in either direction, so the distance from each node
+        # to the destination can be found by searching outward from the destination.
+        destination_distances, _ = self.__SearchClusters(destination_cell_index, destination_cell_index)
+        destination_distance_per_node = {
+            cell_index: distance for cell_index, distance in destination_distances.items()
+            if self.__IsNode(cell_index)}
+
+        # SEARCH THE ABSTRACT GRAPH.
+        abstract_path = self.__SearchAbstractGraph(start_cell_index, start_edges, destination_cell_index, destination_distance_per_node)
+        if abstract_path is None:
+            return None
+
+        # REFINE THE FIRST SEGMENT OF THE PATH.
+        # The first node is either in the start's cluster, and was reached by the search within the
+        # cluster, or in a neighboring cluster, in which case it's right next to the start.
+        first_node_cell_index = abstract_path[1]
+        cell_indices = [first_node_cell_index]
+        if first_node_cell_index in start_came_from:
+            while cell_indices[-1] != start_cell_index:
+                cell_indices.append(start_came_from[cell_indices[-1]])
+        else:
+            cell_indices.append(start_cell_index)
+        cell_indices.reverse()
+        return [self.Map.Map.GetGridPosition(cell_index) for cell_index in cell_indices]
+
+    ## Searches the abstract graph for a path from a start to a destination.
+    ## \param[in]   start_cell_index - The index of the start cell.
+    ## \param[in]   start_edges - (cell index, distance) two-tuples for the nodes (and possibly the destination)
+    ##      reachable from the start within its cluster.
+    ## \param[in]   destination_cell_index - The index of the destination cell.
+    ## \param[in]   destination_distance_per_node - The distance to the destination from each node in its cluster.
+    ## \return  A list of the cell indices of the nodes along the path, starting with the start
+    ##      and ending with the destination, or None if no path could be found.
+    def __SearchAbstractGraph(self, start_cell_index, start_edges, destination_cell_index, destination_distance_per_node):
+        # START FROM THE START.
+        g_scores = {start_cell_index: 0}
+        came_from = {start_cell_index: None}
+        start_h_score = self.__GetManhattanDistance(start_cell_index, destination_cell_index)
+        open_nodes = [(start_h_score, start_h_score, start_cell_index)]
+
+        # EXPAND NODES UNTIL THE DESTINATION IS REACHED.
+        self.ExpandedNodeCount = 0
+        while open_nodes:
+            f_score, h_score, cell_index = heappop(open_nodes)
+            g_score = f_score - h_score
+            if g_score > g_scores[cell_index]:
+                continue
+            if cell_index == destination_cell_index:
+                abstract_path = []
+                while cell_index is not None:
+                    abstract_path.append(cell_index)
+                    cell_index = came_from[cell_index]
+                abstract_path.reverse()
+                return abstract_path
+
+            # GET THE EDGES FROM THE NODE.
+            self.ExpandedNodeCount += 1
+            if cell_index == start_cell_index:
+                edges = list(start_edges)
+            else:
+                cluster_index = self.__GetClusterIndex(cell_index)
+                edges = list(self.__NodeDistancesPerCluster[cluster_index].get(cell_index, ()))
+            edges.extend((neighboring_node, 1) for neighboring_node in self.__NeighboringNodesPerNode.get(cell_index, ()))
+            if cell_index in destination_distance_per_node:
+                edges.append((destination_cell_index, destination_distance_per_node[cell_index]))
+
+            # VISIT EACH NODE ALONG AN EDGE.
+            for neighbor_cell_index, distance in edges:
+                neighbor_g_score = g_score + distance
+                if neighbor_g_score >= g_scores.get(neighbor_cell_index, neighbor_g_score + 1):
+                    continue
+                g_scores[neighbor_cell_index] = neighbor_g_score
+                came_from[neighbor_cell_index] = cell_index
+                neighbor_h_score = self.__GetManhattanDistance(neighbor_cell_index, destination_cell_index)
+                heappush(open_nodes, (neighbor_g_score + neighbor_h_score, neighbor_h_score, neighbor_cell_index))
+
+        return None
+
+    ## Rebuilds the parts of the abstract graph affected by changes to the walls since it was last updated.
+    def __Update(self):
+        # CHECK IF THE WALLS HAVE CHANGED.
+        if self.Map.StaticVersion == self.__StaticVersion:
+            return
+
+        # REBUILD EVERYTHING IF THE CHANGES AREN'T KNOWN.
+        changed_cell_indices = self.Map.GetWallCellsChangedSince(self.__StaticVersion)
+        if changed_cell_indices is None:
+            self.__Build()
+            return
+
+        # REBUILD THE CLUSTERS CONTAINING THE CHANGED CELLS.
+        changed_cluster_indices = set(self.__GetClusterIndex(cell_index) for cell_index in changed_cell_indices)
+        self.__RebuildClusters(changed_cluster_indices)
+        self.__StaticVersion = self.Map.StaticVersion
+
+    ## Builds the entire abstract graph.
+    def __Build(self):
+        self.__NodePairsPerBorder = {}
+        self.__NodeDistancesPerCluster = {}
+        cluster_count = self.ClusterColumnCount * self.ClusterRowCount
+        self.__RebuildClusters(set(range(cluster_count)))
+        self.__StaticVersion = self.Map.StaticVersion
+
+    ## Rebuilds the entrances and cached distances of clusters.
+    ## \param[in]   cluster_indices - The set of indices of the clusters to rebuild.
+    def __RebuildClusters(self, cluster_indices):
+        # REBUILD THE ENTRANCES ON EACH BORDER OF THE CLUSTERS.
+        # If the entrances on a border change, the cluster on the other side has to be rebuilt too.
+        clusters_to_rebuild = set(cluster_indices)
+        for cluster_index in cluster_indices:
+            for border in self.__GetBorders(cluster_index):
+                node_pairs = self.__FindNodePairs(*border)
+                if node_pairs != self.__NodePairsPerBorder.get(border):
+                    self.__NodePairsPerBorder[border] = node_pairs
+                    clusters_to_rebuild.update(border)
+
+        # CONNECT THE NODES ACROSS THE BORDERS.
+        # There are few enough nodes that it's simplest to reconnect all of them.
+        self.__NeighboringNodesPerNode = {}
+        for node_pairs in self.__NodePairsPerBorder.values():
+            for first_node, second_node in node_pairs:
+                self.__NeighboringNodesPerNode.setdefault(first_node, []).append(second_node)
+                self.__NeighboringNodesPerNode.setdefault(second_node, []).append(first_node)
+
+        # CACHE THE DISTANCES BETWEEN THE NODES WITHIN EACH CLUSTER.
+        for cluster_index in clusters_to_rebuild:
+            nodes = set()
+            for border in self.__GetBorders(cluster_index):
+                for node_pair in self.__NodePairsPerBorder.get(border, ()):
+                    nodes.add(node_pair[0] if (border[0] == cluster_index) else node_pair[1])
+            node_distances = {}
+            for node in nodes:
+                distances, _ = self.__SearchClusters(node, None, origin_can_leave_cluster = False)
+                node_distances[node] = [
+                    (other_node, distances[other_node]) for other_node in nodes
+                    if (other_node != node) and (other_node in distances)]
+            self.__NodeDistancesPerCluster[cluster_index] = node_distances
+            self.ClusterBuildCount += 1
+
+    ## Finds the node pairs for the entrances on the border between two neighboring clusters.
+    ## \param[in]   first_cluster_index - The index of the top or left cluster.
+    ## \param[in]   second_cluster_index - The index of the bottom or right cluster.
+    ## \return  A list of two-tuples of the cell indices on the first and second side of each entrance.
+    def __FindNodePairs(self, first_cluster_index, second_cluster_index):
+        # GET THE PAIRS OF CELLS ACROSS THE BORDER.
+        width = self.Map.MapWidth
+        first_left, first_top, first_right, first_bottom = self.__GetClusterBounds(first_cluster_index)
+        # Clusters in the same row are side by side.  Their indices alone can't tell, since vertically
+        # neighboring clusters also have consecutive indices when there's only one column of clusters.
+        first_cluster_row_index = first_cluster_index // self.ClusterColumnCount
+        second_cluster_row_index = second_cluster_index // self.ClusterColumnCount
+        clusters_side_by_side = (first_cluster_row_index == second_cluster_row_index)
+        if clusters_side_by_side:
+            cell_pairs = [
+                ((row_index * width) + first_right - 1, (row_index * width) + first_right)
+                for row_index in range(first_top, first_bottom)]
+        else:
+            cell_pairs = [
+                (((first_bottom - 1) * width) + column_index, (first_bottom * width) + column_index)
+                for column_index in range(first_left, first_right)]
+
+        # FIND EACH ENTRANCE.
+        # An entrance is a run of cell pairs that are both free of walls.
+        wall_grid = self.Map.WallGrid
+        node_pairs = []
+        entrance = []
+        for cell_pair in cell_pairs + [None]:
+            pair_walkable = (cell_pair is not None) and (not wall_grid[cell_pair[0]]) and (not wall_grid[cell_pair[1]])
+            if pair_walkable:
+                entrance.append(cell_pair)
+                continue
+            if not entrance:
+                continue
+
+            # ADD NODES FOR THE ENTRANCE.
+            if len(entrance) >= HierarchicalPathfinder.WIDE_ENTRANCE_WIDTH_IN_CELLS:
+                node_pairs.append(entrance[0])
+                node_pairs.append(entrance[-1])
+            else:
+                node_pairs.append(entrance[len(entrance) // 2])
+            entrance = []
+        return node_pairs
+
+    ## Finds the distance to every cell that can be reached from a cell without leaving its cluster.
+    ## \param[in]   origin_cell_index - The index of the cell to search from.
+    ## \param[in]   destination_cell_index - The index of a cell that can be moved into even if it contains a wall
+    ##      or is outside of the cluster, or None.
+    ## \param[in]   origin_can_leave_cluster - True to allow moving from the origin into neighboring clusters,
+    ##      after which the search continues within those clusters.
+    ## \return  A two-tuple of a dictionary of the distance to each reached cell and a dictionary of the
+    ##      cell each reached cell was reached from.
+    def __SearchClusters(self, origin_cell_index, destination_cell_index, origin_can_leave_cluster = True):
+        wall_grid = self.Map.WallGrid
+        distances = {origin_cell_index: 0}
+        came_from = {origin_cell_index: None}
+        cells_to_visit = deque([origin_cell_index])
+        while cells_to_visit:
+            cell_index = cells_to_visit.popleft()
+            cluster_index = self.__GetClusterIndex(cell_index)
+            can_leave_cluster = origin_can_leave_cluster and (cell_index == origin_cell_index)
+            for neighbor_cell_index in self.__GetNeighborCellIndices(cell_index):
+                if neighbor_cell_index in distances:
+                    continue
+                is_destination = (neighbor_cell_index == destination_cell_index)
+                in_cluster = (self.__GetClusterIndex(neighbor_cell_index) == cluster_index)
+                if not (in_cluster or can_leave_cluster or is_destination):
+                    continue
+                blocked = wall_grid[neighbor_cell_index]
+                if blocked and not is_destination:
+                    continue
+                distances[neighbor_cell_index] = distances[cell_index] + 1
+                came_from[neighbor_cell_index] = cell_index
+                # The destination can be moved into, but not through.
+                if not is_destination:
+                    cells_to_visit.append(neighbor_cell_index)
+        return (distances, came_from)
+
+    ## Determines whether a cell is a node of the abstract graph.
+    ## \param[in]   cell_index - The index of the cell.
+    ## \return  True if the cell is a node; false otherwise.
+    def __IsNode(self, cell_index):
+        return cell_index in self.__NodeDistancesPerCluster[self.__GetClusterIndex(cell_index)]
+
+    ## Gets the indices of the cells neighboring a cell.
+    ## \param[in]   cell_index - The index of the cell.
+    ## \return  The indices of the neighboring cells within the map, in the order up, down, left and right.
+    def __GetNeighborCellIndices(self, cell_index):
+        width = self.Map.MapWidth
+        row_index, column_index = divmod(cell_index, width)
+        neighbor_cell_indices = []
+        if row_index > 0:
+            neighbor_cell_indices.append(cell_index - width)
+        if row_index < self.Map.MapHeight - 1:
+            neighbor_cell_indices.append(cell_index + width)
+        if column_index > 0:
+            neighbor_cell_indices.append(cell_index - 1)
+        if column_index < width - 1:
+            neighbor_cell_indices.append(cell_index + 1)
+        return neighbor_cell_indices
+
+    ## Gets the borders of a cluster with its neighboring clusters.
+    ## \param[in]   cluster_index - The index of the cluster.
+    ## \return  A list of two-tuples of cluster indices for each border, with the top or left cluster first.
+    def __GetBorders(self, cluster_index):
+        cluster_row_index, cluster_column_index = divmod(cluster_index, self.ClusterColumnCount)
+        borders = []
+        if cluster_row_index > 0:
+            borders.append((cluster_index - self.ClusterColumnCount, cluster_index))
+        if cluster_row_index < self.ClusterRowCount - 1:
+            borders.append((cluster_index, cluster_index + self.ClusterColumnCount))
+        if cluster_column_index > 0:
+            borders.append((cluster_index - 1, cluster_index))
+        if cluster_column_index < self.ClusterColumnCount - 1:
+            borders.append((cluster_index, cluster_index + 1))
+        return borders
+
+    ## Gets the cells covered by a cluster.
+    ## \param[in]   cluster_index - The index of the cluster.
+    ## \return  A four-tuple of the left column, top row, and the column and row past the right and bottom.
+    def __GetClusterBounds(self, cluster_index):
+        cluster_row_index, cluster_column_index = divmod(cluster_index, self.ClusterColumnCount)
+        left = cluster_column_index * self.ClusterSize
+        top = cluster_row_index * self.ClusterSize
+        right = min(left + self.ClusterSize, self.Map.MapWidth)
+        bottom = min(top + self.ClusterSize, self.Map.MapHeight)
+        return (left, top, right, bottom)
+
+    ## Gets the cluster containing a cell.
+    ## \param[in]   cell_index - The index of the cell.
+    ## \return  The index of the cluster.
+    def __GetClusterIndex(self, cell_index):
+        row_index, column_index = divmod(cell_index, self.Map.MapWidth)
+        return ((row_index // self.ClusterSize) * self.ClusterColumnCount) + (column_index // self.ClusterSize)
+
+    ## Gets the Manhattan distance between two cells.
+    ## \param[in]   cell_index - The index of one cell.
+    ## \param[in]   other_cell_index - The index of the other cell.
+    ## \return  The number of steps between the cells if nothing is in the way.
+    def __GetManhattanDistance(self, cell_index, other_cell_index):
+        row_index, column_index = divmod(cell_index, self.Map.MapWidth)
+        other_row_index, other_column_index = divmod(other_cell_index, self.Map.MapWidth)
+        return abs(column_index - other_column_index) + abs(row_index - other_row_index)
@@ -0,0 +1,267 @@
+from heapq import heappush, heappop
+
+from Math.Vector2 import Vector2
+
+## Plans the shortest path from a moving start to a moving goal on the grid of a LevelMap
+## with D* Lite.  The search tree of the previous plan is kept and only repaired where it's
+## affected by changes, so replanning after the start or goal moves a single grid position,
+## or a few walls are added or removed, only costs work proportional to the change rather
+## than a whole new search.
+##
+## Moving between neighboring grid positions costs 1, and any grid position without a wall can be
+## moved into.  Other objects are planned through, since they move around constantly and would
+## otherwise force the plan to be repaired on almost every frame.  The search is rooted at the
+## goal, so the distance of every searched cell to the goal is known.  A moving goal is handled
+## as if the goal were a fixed extra node that only the current goal's cell is connected to, so
+## moving the goal is just a change to the cost of two edges.
+class IncrementalPlanner(object):
+    ## The distance used for cells that can't reach the goal.
+    INFINITE_DISTANCE = float('inf')
+    ## The cell index used when there is no cell.
+    NO_CELL_INDEX = -1
+
+    ## Constructor.
+    ## \param[in]   level_map - The LevelMap to plan paths through.
+    def __init__(self, level_map):
+        ## The LevelMap to plan paths through.
+        self.Map = level_map
+        ## The number of cells expanded by the most recent plan.
+        self.ExpandedNodeCount = 0
+        ## The number of cells expanded by all plans.
+        self.TotalExpandedNodeCount = 0
+        ## The number of times planning had to start over from scratch.
+        self.FullPlanCount = 0
+
+        # INITIALIZE THE SEARCH STATE.
+        # These are initialized by the first plan.
+        ## The LevelMap.StaticVersion the search state is up to date with, or None if there is no search state.
+        self.__StaticVersion = None
+        ## The cell index of the current start.
+        self.__StartCellIndex = IncrementalPlanner.NO_CELL_INDEX
+        ## The cell index of the current goal.
+        self.__GoalCellIndex = IncrementalPlanner.NO_CELL_INDEX
+        ## The total distance the start has moved since the search began.  This is added to the keys
+        ## of cells instead of updating the keys of every queued cell whenever the start moves.
+        self.__KeyModifier = 0
+        ## The distance from each cell to the goal, as of when the cell was last expanded.
+        self.__GScores = []
+        ## The distance from each cell to the goal, based on the distances of its neighbors.
+        self.__RhsScores = []
+        ## The current key of every cell in the priority queue.
+        self.__QueuedKeys = {}
+        ## The priority queue of cells whose distances are inconsistent, as (key, cell index) two-tuples.
+        ## Cells aren't removed from the heap when their keys change, so entries that don't match
+        ## the current key of a cell are out of date and skipped.
+        self.__Queue = []
+
+    ## Plans the shortest path from a start to a goal and gets the first step along it.
+    ## \param[in]   start_grid_position - The start as a Vector2 of column and row index.
+    ## \param[in]   goal_grid_position - The goal as a Vector2 of column and row index.
+    ## \return  The next grid position to move to as a Vector2 of column and row index, or None
+    ##      if the goal can't be reached or the start is already at the goal.
+    def GetNextGridPosition(self, start_grid_position, goal_grid_position):
+        # CHECK THAT BOTH POSITIONS ARE IN THE MAP.
+        start_cell_index = self.Map.Map.GetCellIndex(start_grid_position.AsXYTuple())
+        goal_cell_index = self.Map.Map.GetCellIndex(goal_grid_position.AsXYTuple())
+        if (start_cell_index is None) or (goal_cell_index is None):
+            return None
+        if start_cell_index == goal_cell_index:
+            return None
+
+        # UPDATE THE PLAN.
+        self.__Plan(start_cell_index, goal_cell_index)
+
+        # MOVE TO THE NEIGHBOR CLOSEST TO THE GOAL.
+        next_cell_index = IncrementalPlanner.NO_CELL_INDEX
+        next_distance = IncrementalPlanner.INFINITE_DISTANCE
+        for neighbor_cell_index in self.__GetNeighborCellIndices(start_cell_index):
+            distance = self.__GetCost(neighbor_cell_index) + self.__GScores[neighbor_cell_index]
+            if distance < next_distance:
+                next_cell_index = neighbor_cell_index
+                next_distance = distance
+        if next_cell_index == IncrementalPlanner.NO_CELL_INDEX:
+            return None
+        next_column_index, next_row_index = self.Map.Map.GetGridPosition(next_cell_index)
+        return Vector2(next_column_index, next_row_index)
+
+    ## Gets the length of the shortest path from the start of the most recent plan to its goal.
+    ## \return  The number of steps in the path, or None if the goal can't be reached.
+    def GetPlannedDistance(self):
+        if self.__StartCellIndex == IncrementalPlanner.NO_CELL_INDEX:
+            return None
+        distance = self.__GScores[self.__StartCellIndex]
+        if distance == IncrementalPlanner.INFINITE_DISTANCE:
+            return None
+        return distance
+
+    ## Updates the search state for a new start and goal and any changes to the map.
+    ## \param[in]   start_cell_index - The index of the start cell.
+    ## \param[in]   goal_cell_index - The index of the goal cell.
+    def __Plan(self, start_cell_index, goal_cell_index):
+        # START OVER IF THE CHANGES TO THE MAP AREN'T KNOWN.
+        changed_cell_indices = None
+        if self.__StaticVersion is not None:
+            changed_cell_indices = self.Map.GetWallCellsChangedSince(self.__StaticVersion)
+        if changed_cell_indices is None:
+            self.__Initialize(start_cell_index, goal_cell_index)
+        else:
+            # ACCOUNT FOR THE START MOVING.
+            # Rather than updating every key in the queue, the distance moved is added to all keys created from now on.
+            self.__KeyModifier += self.__GetManhattanDistance(self.__StartCellIndex, start_cell_index)
+            self.__StartCellIndex = start_cell_index
+
+            # ACCOUNT FOR THE GOAL MOVING.
+            # Both the old and new goal cells change distance and whether they can be moved into.
+            if goal_cell_index != self.__GoalCellIndex:
+                changed_cell_indices.add(self.__GoalCellIndex)
+                changed_cell_indices.add(goal_cell_index)
+                old_goal_cell_index = self.__GoalCellIndex
+                self.__GoalCellIndex = goal_cell_index
+                self.__UpdateCell(old_goal_cell_index)
+                self.__UpdateCell(goal_cell_index)
+
+            # ACCOUNT FOR WALLS BEING ADDED OR REMOVED.
+            # This changes the cost of moving into the cell from any of its neighbors.
+            for changed_cell_index in changed_cell_indices:
+                for neighbor_cell_index in self.__GetNeighborCellIndices(changed_cell_index):
+                    self.__UpdateCell(neighbor_cell_index)
+
+        # REPAIR THE SEARCH.
+        self.__StaticVersion = self.Map.StaticVersion
+        self.__ComputeShortestPath()
+
+    ## Starts a new search from scratch.
+    ## \param[in]   start_cell_index - The index of the start cell.
+    ## \param[in]   goal_cell_index - The index of the goal cell.
+    def __Initialize(self, start_cell_index, goal_cell_index):
+        self.FullPlanCount += 1
+        cell_count = len(self.Map.Map.Cells)
+        self.__StartCellIndex = start_cell_index
+        self.__GoalCellIndex = goal_cell_index
+        self.__KeyModifier = 0
+        self.__GScores = [IncrementalPlanner.INFINITE_DISTANCE] * cell_count
+        self.__RhsScores = [IncrementalPlanner.INFINITE_DISTANCE] * cell_count
+        self.__QueuedKeys = {}
+        self.__Queue = []
+
+        # START FROM THE GOAL.
+        self.__RhsScores[goal_cell_index] = 0
+        self.__Enqueue(goal_cell_index)
+
+    ## Expands inconsistent cells until the distance from the start to the goal is known.
+    def __ComputeShortestPath(self):
+        expanded_node_count = 0
+        start_cell_index = self.__StartCellIndex
+        while True:
+            # CHECK IF THE START'S DISTANCE IS KNOWN.
+            # This is the case once it's consistent and no queued cell could still lead to a shorter path.
+            top_key, cell_index = self.__PeekQueue()
+            start_key = self.__CalculateKey(start_cell_index)
+            start_consistent = (self.__GScores[start_cell_index] == self.__RhsScores[start_cell_index])
+            if (top_key >= start_key) and start_consistent:
+                break
+
+            # CHECK IF THE CELL'S KEY IS OUT OF DATE.
+            # This happens when the start has moved since the cell was queued.
+            del self.__QueuedKeys[cell_index]
+            heappop(self.__Queue)
+            current_key = self.__CalculateKey(cell_index)
+            if top_key < current_key:
+                self.__Enqueue(cell_index)
+                continue
+
+            # EXPAND THE CELL.
+            expanded_node_count += 1
+            if self.__GScores[cell_index] > self.__RhsScores[cell_index]:
+                # The cell has become closer to the goal.
+                self.__GScores[cell_index] = self.__RhsScores[cell_index]
+            else:
+                # The cell has become further from the goal, so it and its
+                # neighbors have to find their new distances.
+                self.__GScores[cell_index] = IncrementalPlanner.INFINITE_DISTANCE
+                self.__UpdateCell(cell_index)
+            for neighbor_cell_index in self.__GetNeighborCellIndices(cell_index):
+                self.__UpdateCell(neighbor_cell_index)
+
+        self.ExpandedNodeCount = expanded_node_count
+        self.TotalExpandedNodeCount += expanded_node_count
+
+    ## Recalculates a cell's distance to the goal from its neighbors and queues it if it's inconsistent.
+    ## \param[in]   cell_index - The index of the cell.
+    def __UpdateCell(self, cell_index):
+        # RECALCULATE THE CELL'S DISTANCE.
+        # The goal cell is connected to the goal itself, so it's always 0 from the goal.
+        if cell_index == self.__GoalCellIndex:
+            rhs_score = 0
+        else:
+            rhs_score = IncrementalPlanner.INFINITE_DISTANCE
+            for neighbor_cell_index in self.__GetNeighborCellIndices(cell_index):
+                distance = self.__GetCost(neighbor_cell_index) + self.__GScores[neighbor_cell_index]
+                rhs_score = min(rhs_score, distance)
+        self.__RhsScores[cell_index] = rhs_score
+
+        # QUEUE THE CELL IF IT'S INCONSISTENT.
+        self.__QueuedKeys.pop(cell_index, None)
+        if self.__GScores[cell_index] != rhs_score:
+            self.__Enqueue(cell_index)
+
+    ## Adds a cell to the priority queue with its current key.
+    ## \param[in]   cell_index - The index of the cell.
+    def __Enqueue(self, cell_index):
+        key = self.__CalculateKey(cell_index)
+        self.__QueuedKeys[cell_index] = key
+        heappush(self.__Queue, (key, cell_index))
+
+    ## Gets the queued cell with the lowest key, discarding any out-of-date entries in the queue.
+    ## \return  A two-tuple of the key and cell index, or an infinite key and no cell if the queue is empty.
+    def __PeekQueue(self):
+        while self.__Queue:
+            key, cell_index = self.__Queue[0]
+            if self.__QueuedKeys.get(cell_index) == key:
+                return (key, cell_index)
+            heappop(self.__Queue)
+        no_key = (IncrementalPlanner.INFINITE_DISTANCE, IncrementalPlanner.INFINITE_DISTANCE)
+        return (no_key, IncrementalPlanner.NO_CELL_INDEX)
+
+    ## Calculates the priority of a cell in the queue.
+    ## \param[in]   cell_index - The index of the cell.
+    ## \return  The key of the cell as a two-tuple, where lower keys have higher priority.
+    def __CalculateKey(self, cell_index):
+        distance = min(self.__GScores[cell_index], self.__RhsScores[cell_index])
+        estimated_total_distance = distance + self.__GetManhattanDistance(self.__StartCellIndex, cell_index) + self.__KeyModifier
+        return (estimated_total_distance, distance)
+
+    ## Gets the cost of moving into a cell from one of its neighbors.
+    ## \param[in]   cell_index - The index of the cell.
+    ## \return  1 if the cell doesn't contain a wall or is the goal; infinite otherwise.
+    def __GetCost(self, cell_index):
+        walkable = not self.Map.WallGrid[cell_index]
+        if walkable or (cell_index == self.__GoalCellIndex):
+            return 1
+        return IncrementalPlanner.INFINITE_DISTANCE
+
+    ## Gets the Manhattan distance between two cells.
+    ## \param[in]   cell_index - The index of one cell.
+    ## \param[in]   other_cell_index - The index of the other cell.
+    ## \return  The number of steps between the cells if nothing is in the way.
+    def __GetManhattanDistance(self, cell_index, other_cell_index):
+        row_index, column_index = divmod(cell_index, self.Map.MapWidth)
+        other_row_index, other_column_index = divmod(other_cell_index, self.Map.MapWidth)
+        return abs(column_index - other_column_index) + abs(row_index - other_row_index)
+
+    ## Gets the indices of the cells neighboring a cell.
+    ## \param[in]   cell_index - The index of the cell.
+    ## \return  The indices of the neighboring cells within the map, in the order up, down, left and right.
+    def __GetNeighborCellIndices(self, cell_index):
+        width = self.Map.MapWidth
+        row_index, column_index = divmod(cell_index, width)
+        neighbor_cell_indices = []
+        if row_index > 0:
+            neighbor_cell_indices.append(cell_index - width)
+        if row_index < self.Map.MapHeight - 1:
+            neighbor_cell_indices.append(cell_index + width)
+        if column_index > 0:
+            neighbor_cell_indices.append(cell_index - 1)
+        if column_index < width - 1:
+            neighbor_cell_indices.append(cell_index + 1)
+        return neighbor_cell_indices
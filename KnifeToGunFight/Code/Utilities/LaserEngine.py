@@ -0,0 +1,207 @@
+import math
+
+# NumPy is optional.  The engine is only used if it's installed.
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from Objects.GameObject import GameObject
+from Objects.Laser import Laser
+
+## Simulates all lasers on a map as a batch.
+## Rather than storing each laser as its own GameObject, the state of every laser is stored
+## in NumPy arrays (a "struct of arrays"), so that movement, culling and collision checks
+## can each be done for all lasers at once with vectorized operations.  It supports the
+## same operations as the LaserPool, so either can be used to store the lasers on a map.
+##
+## Like the LaserPool, the time each laser will hit a wall or leave the map is predicted with a
+## raycast when it's spawned or reflected.  Rather than a queue, the engine tracks the earliest of
+## these times, so that it only needs to look for lasers to remove once that time has come.
+class LaserEngine(object):
+    ## True if NumPy is installed and the engine can be used.
+    IsAvailable = (numpy is not None)
+    ## The default maximum number of lasers that can be active at once.
+    DEFAULT_CAPACITY = 256
+
+    ## Constructor.
+    ## \param[in]   level_map - The LevelMap the lasers are on.
+    ## \param[in]   capacity - The maximum number of lasers that can be active at once.
+    ##      Space for all of them is allocated up front.
+    def __init__(self, level_map, capacity = DEFAULT_CAPACITY):
+        ## The LevelMap the lasers are on.
+        self.Map = level_map
+        ## The maximum number of lasers that can be active at once.
+        self.Capacity = capacity
+        ## The number of lasers currently in the engine.
+        ## Only the first Count entries of each array are in use.
+        self.Count = 0
+        ## The top-left corner position of each laser in pixels, as (x, y) rows.
+        self.Positions = numpy.zeros((capacity, 2), dtype = numpy.float64)
+        ## The direction each laser is traveling in, as normalized (x, y) rows.
+        self.Trajectories = numpy.zeros((capacity, 2), dtype = numpy.float64)
+        ## Whether each laser has been reflected.
+        self.Reflected = numpy.zeros(capacity, dtype = bool)
+        ## The Laser.Color value of each laser.
+        self.Colors = numpy.zeros(capacity, dtype = numpy.int8)
+        ## The time at which each laser will hit a wall or leave the map, in seconds since the engine was created.
+        self.ImpactTimes = numpy.zeros(capacity, dtype = numpy.float64)
+        ## The total time the lasers have been updated for, in seconds.
+        self.ElapsedTimeInSeconds = 0.0
+        ## No laser will hit a wall or leave the map before this time, in seconds since the engine was created.
+        self.__NextImpactTimeInSeconds = math.inf
+        ## The image of each laser.
+        self.__Images = []
+
+        # TRACK HOW MUCH PRESSURE THE ENGINE IS UNDER.
+        ## The number of lasers that have been spawned.
+        self.SpawnedCount = 0
+        ## The number of spawns that were dropped because the engine was full.
+        self.DroppedCount = 0
+        ## The highest number of lasers that have been active at once.
+        self.PeakCount = 0
+
+    ## Gets the number of lasers in the engine.
+    def __len__(self):
+        return self.Count
+
+    ## Spawns a new laser.
+    ## \param[in]   initial_x_position - The initial x position of the laser.
+    ## \param[in]   initial_y_position - The initial y position of the laser.
+    ## \param[in]   color - The color of the laser.
+    ## \param[in]   trajectory - The Vector2 indicating the direction the laser is traveling.
+    ## \return  True if the laser was spawned, or false if the engine is full.
+    def Spawn(self, initial_x_position, initial_y_position, color, trajectory):
+        # CHECK IF THE ENGINE IS FULL.
+        engine_full = (self.Count >= self.Capacity)
+        if engine_full:
+            self.DroppedCount += 1
+            return False
+
+        # STORE THE LASER'S STATE.
+        index = self.Count
+        self.Positions[index] = (initial_x_position, initial_y_position)
+        self.Trajectories[index] = (trajectory.X, trajectory.Y)
+        self.Reflected[index] = False
+        self.Colors[index] = color.value
+        self.__Images.append(Laser.GetImage(color, trajectory))
+        self.__PredictImpact(index)
+        self.Count += 1
+        self.SpawnedCount += 1
+        self.PeakCount = max(self.PeakCount, self.Count)
+        return True
+
+    ## Moves all lasers along their trajectories, and removes any lasers that have hit a wall or left the map.
+    ## \param[in]   time_since_last_update_in_seconds - The time since the lasers were last
+    ##      updated, in seconds.
+    def Update(self, time_since_last_update_in_seconds):
+        # MOVE THE LASERS.
+        movement_distance_in_pixels = Laser.MOVE_SPEED_IN_PIXELS_PER_SECOND * time_since_last_update_in_seconds
+        self.Positions[:self.Count] += self.Trajectories[:self.Count] * movement_distance_in_pixels
+        self.ElapsedTimeInSeconds += time_since_last_update_in_seconds
+
+        # REMOVE LASERS WHOSE IMPACTS HAVE COME.
+        impacts_due = (self.ElapsedTimeInSeconds >= self.__NextImpactTimeInSeconds)
+        if impacts_due:
+            self.__RemoveLasers(self.ImpactTimes[:self.Count] <= self.ElapsedTimeInSeconds)
+            self.__UpdateNextImpactTime()
+
+    ## Reflects all lasers colliding with a rectangle that haven't already been reflected.
+    ## \param[in]   rectangle - The pygame.Rect to reflect lasers off of.
+    def ReflectLasersCollidingWith(self, rectangle):
+        # REVERSE THE LASERS.
+        # Multiplying a vector by -1 will make it point in the opposite direction.
+        REVERSE_DIRECTION = -1
+        reflected_lasers = self.__GetCollisions(rectangle) & ~self.Reflected[:self.Count]
+        self.Trajectories[:self.Count][reflected_lasers] *= REVERSE_DIRECTION
+        self.Reflected[:self.Count][reflected_lasers] = True
+
+        # PREDICT WHERE THE REFLECTED LASERS WILL HIT.
+        # Only a few lasers are reflected at once, so they're raycast one at a time.
+        reflected_indices = numpy.flatnonzero(reflected_lasers)
+        for index in reflected_indices.tolist():
+            self.__PredictImpact(index)
+        if reflected_indices.size > 0:
+            self.__UpdateNextImpactTime()
+
+    ## Checks if any laser is colliding with a rectangle.
+    ## \param[in]   rectangle - The pygame.Rect to check.
+    ## \param[in]   reflected_only - True to only check lasers that have been reflected.
+    ## \return  True if a laser is colliding with the rectangle; false otherwise.
+    def AnyLaserCollidingWith(self, rectangle, reflected_only = False):
+        collisions = self.__GetCollisions(rectangle)
+        if reflected_only:
+            collisions &= self.Reflected[:self.Count]
+        return bool(collisions.any())
+
+    ## Removes all lasers colliding with a rectangle.
+    ## \param[in]   rectangle - The pygame.Rect to check.
+    ## \return  True if any lasers were removed; false otherwise.
+    def RemoveLasersCollidingWith(self, rectangle):
+        collisions = self.__GetCollisions(rectangle)
+        any_collisions = bool(collisions.any())
+        if any_collisions:
+            self.__RemoveLasers(collisions)
+        return any_collisions
+
+    ## Draws all lasers to a surface.
+    ## \param[in]   screen - The pygame.Surface to render to.
+    ## \return  A list of the rectangles that were drawn to.
+    def Render(self, screen):
+        return screen.blits(self.GetImagesAndPositions())
+
+    ## Gets what to draw for each laser, without drawing it.
+    ## \return  A list with an (image, top-left position) two-tuple for each laser.
+    def GetImagesAndPositions(self):
+        # Lasers are drawn in relation to their top-left corner.
+        positions = numpy.floor(self.Positions[:self.Count]).astype(int).tolist()
+        return list(zip(self.__Images, positions))
+
+    ## Gets the edges of the bounding rectangle of every laser.
+    ## \return  A four-tuple of arrays of the left, top, right and bottom edges, in pixels.
+    def __GetEdges(self):
+        left = numpy.floor(self.Positions[:self.Count, 0])
+        top = numpy.floor(self.Positions[:self.Count, 1])
+        right = left + GameObject.WidthPixels
+        bottom = top + GameObject.HeightPixels
+        return (left, top, right, bottom)
+
+    ## Determines which lasers collide with a rectangle.
+    ## \param[in]   rectangle - The pygame.Rect to check.
+    ## \return  An array of booleans that are true for each laser colliding with the rectangle.
+    def __GetCollisions(self, rectangle):
+        # This uses the same overlap test as pygame.Rect.colliderect.
+        left, top, right, bottom = self.__GetEdges()
+        return (
+            (left < rectangle.right) &
+            (right > rectangle.left) &
+            (top < rectangle.bottom) &
+            (bottom > rectangle.top))
+
+    ## Removes lasers from the engine.
+    ## The remaining lasers are compacted in place at the front of the arrays.
+    ## \param[in]   lasers_to_remove - An array of booleans that are true for each laser to remove.
+    def __RemoveLasers(self, lasers_to_remove):
+        if not lasers_to_remove.any():
+            return
+
+        lasers_to_keep = ~lasers_to_remove
+        remaining_count = int(lasers_to_keep.sum())
+        for array in (self.Positions, self.Trajectories, self.Reflected, self.Colors, self.ImpactTimes):
+            array[:remaining_count] = array[:self.Count][lasers_to_keep]
+        self.__Images = [image for image, keep in zip(self.__Images, lasers_to_keep.tolist()) if keep]
+        self.Count = remaining_count
+
+    ## Predicts when a laser will hit a wall or leave the map.
+    ## \param[in]   index - The index of the laser.
+    def __PredictImpact(self, index):
+        top_left_position = self.Positions[index].tolist()
+        trajectory = self.Trajectories[index].tolist()
+        distance_until_impact_in_pixels = self.Map.GetDistanceUntilWallImpact(top_left_position, trajectory)
+        time_until_impact_in_seconds = distance_until_impact_in_pixels / Laser.MOVE_SPEED_IN_PIXELS_PER_SECOND
+        self.ImpactTimes[index] = self.ElapsedTimeInSeconds + time_until_impact_in_seconds
+        self.__NextImpactTimeInSeconds = min(self.__NextImpactTimeInSeconds, self.ImpactTimes[index])
+
+    ## Updates the earliest time any laser will hit a wall or leave the map.
+    def __UpdateNextImpactTime(self):
+        self.__NextImpactTimeInSeconds = self.ImpactTimes[:self.Count].min() if (self.Count > 0) else math.inf
@@ -0,0 +1,176 @@
+from heapq import heappush, heappop
+
+from Objects.Laser import Laser
+
+## A fixed-capacity pool of the lasers on a map.
+## Laser objects are recycled rather than being created for each shot.  The active lasers
+## are always kept at the front of the pool, so a laser can be removed in constant time by
+## swapping it with the last active laser.  Once the pool has warmed up, spawning and removing
+## lasers doesn't allocate any new objects.
+##
+## Lasers travel in straight lines, so when a laser is spawned or reflected, the time it will
+## hit a wall or leave the map is predicted with a raycast and queued.  Lasers are removed when
+## that time comes, without checking any of them against the walls each update.
+class LaserPool(object):
+    ## The default maximum number of lasers that can be active at once.
+    DEFAULT_CAPACITY = 256
+
+    ## Constructor.
+    ## \param[in]   level_map - The LevelMap the lasers are on.
+    ## \param[in]   capacity - The maximum number of lasers that can be active at once.
+    def __init__(self, level_map, capacity = DEFAULT_CAPACITY):
+        ## The LevelMap the lasers are on.
+        self.Map = level_map
+        ## The maximum number of lasers that can be active at once.
+        self.Capacity = capacity
+        ## The number of active lasers.
+        self.Count = 0
+        ## The active lasers, followed by any inactive lasers available to be recycled.
+        self.__Lasers = []
+        ## The total time the lasers have been updated for, in seconds.
+        self.ElapsedTimeInSeconds = 0.0
+        ## The predicted wall impacts, as a heap of (impact time, impact number, laser) three-tuples.
+        ## Entries aren't removed when a laser is removed or reflected, so any entry whose time doesn't
+        ## match the laser's current ImpactTimeInSeconds is out of date and skipped.
+        self.__Impacts = []
+        ## The number of impacts that have been queued, used to order impacts predicted for the same time.
+        self.__ImpactCount = 0
+
+        # TRACK HOW MUCH PRESSURE THE POOL IS UNDER.
+        ## The number of lasers that have been spawned.
+        self.SpawnedCount = 0
+        ## The number of spawned lasers that reused an inactive laser.
+        self.RecycledCount = 0
+        ## The number of spawns that were dropped because the pool was full.
+        self.DroppedCount = 0
+        ## The highest number of lasers that have been active at once.
+        self.PeakCount = 0
+
+    ## Gets the number of active lasers.
+    def __len__(self):
+        return self.Count
+
+    ## Iterates over the active lasers.
+    def __iter__(self):
+        for index in range(self.Count):
+            yield self.__Lasers[index]
+
+    ## Spawns a new laser.
+    ## \param[in]   initial_x_position - The initial x position of the laser.
+    ## \param[in]   initial_y_position - The initial y position of the laser.
+    ## \param[in]   color - The color of the laser.
+    ## \param[in]   trajectory - The Vector2 indicating the direction the laser is traveling.
+    ## \return  The spawned Laser, or None if the pool is full.
+    def Spawn(self, initial_x_position, initial_y_position, color, trajectory):
+        # CHECK IF THE POOL IS FULL.
+        pool_full = (self.Count >= self.Capacity)
+        if pool_full:
+            self.DroppedCount += 1
+            return None
+
+        # REUSE AN INACTIVE LASER IF ONE IS AVAILABLE.
+        inactive_laser_available = (self.Count < len(self.__Lasers))
+        if inactive_laser_available:
+            laser = self.__Lasers[self.Count]
+            laser.Reset(initial_x_position, initial_y_position, color, trajectory)
+            self.RecycledCount += 1
+        else:
+            laser = Laser(initial_x_position, initial_y_position, color, trajectory)
+            self.__Lasers.append(laser)
+
+        # ACTIVATE THE LASER.
+        laser.PoolIndex = self.Count
+        self.Count += 1
+        self.SpawnedCount += 1
+        self.PeakCount = max(self.PeakCount, self.Count)
+        self.__PredictImpact(laser)
+        return laser
+
+    ## Removes an active laser.
+    ## \param[in]   laser - The Laser to remove.
+    def Remove(self, laser):
+        # SWAP THE LASER WITH THE LAST ACTIVE LASER.
+        # This keeps all active lasers at the front of the pool.
+        removed_index = laser.PoolIndex
+        last_active_index = self.Count - 1
+        last_active_laser = self.__Lasers[last_active_index]
+        self.__Lasers[removed_index] = last_active_laser
+        last_active_laser.PoolIndex = removed_index
+        self.__Lasers[last_active_index] = laser
+        laser.PoolIndex = None
+        laser.ImpactTimeInSeconds = None
+        self.Count -= 1
+
+    ## Moves all lasers along their trajectories, and removes any lasers that have hit a wall or left the map.
+    ## \param[in]   time_since_last_update_in_seconds - The time since the lasers were last
+    ##      updated, in seconds.
+    def Update(self, time_since_last_update_in_seconds):
+        # MOVE THE LASERS.
+        for index in range(self.Count):
+            self.__Lasers[index].Update(time_since_last_update_in_seconds)
+        self.ElapsedTimeInSeconds += time_since_last_update_in_seconds
+
+        # REMOVE LASERS WHOSE IMPACTS HAVE COME.
+        while self.__Impacts and (self.__Impacts[0][0] <= self.ElapsedTimeInSeconds):
+            impact_time_in_seconds, _, laser = heappop(self.__Impacts)
+            impact_up_to_date = (laser.ImpactTimeInSeconds == impact_time_in_seconds)
+            if impact_up_to_date:
+                self.Remove(laser)
+
+    ## Reflects all lasers colliding with a rectangle that haven't already been reflected.
+    ## \param[in]   rectangle - The pygame.Rect to reflect lasers off of.
+    def ReflectLasersCollidingWith(self, rectangle):
+        for index in range(self.Count):
+            laser = self.__Lasers[index]
+            if laser.HasBeenReflected:
+                continue
+            if rectangle.colliderect(laser.Coordinates):
+                # The laser is heading somewhere new, so it will hit a different wall.
+                laser.Reflect()
+                self.__PredictImpact(laser)
+
+    ## Checks if any laser is colliding with a rectangle.
+    ## \param[in]   rectangle - The pygame.Rect to check.
+    ## \param[in]   reflected_only - True to only check lasers that have been reflected.
+    ## \return  True if a laser is colliding with the rectangle; false otherwise.
+    def AnyLaserCollidingWith(self, rectangle, reflected_only = False):
+        for index in range(self.Count):
+            laser = self.__Lasers[index]
+            if reflected_only and not laser.HasBeenReflected:
+                continue
+            if rectangle.colliderect(laser.Coordinates):
+                return True
+        return False
+
+    ## Removes all lasers colliding with a rectangle.
+    ## \param[in]   rectangle - The pygame.Rect to check.
+    ## \return  True if any lasers were removed; false otherwise.
+    def RemoveLasersCollidingWith(self, rectangle):
+        any_collisions = False
+        for index in range(self.Count - 1, -1, -1):
+            laser = self.__Lasers[index]
+            if rectangle.colliderect(laser.Coordinates):
+                self.Remove(laser)
+                any_collisions = True
+        return any_collisions
+
+    ## Draws all lasers to a surface.
+    ## \param[in]   screen - The pygame.Surface to render to.
+    ## \return  A list of the rectangles that were drawn to.
+    def Render(self, screen):
+        return screen.blits(self.GetImagesAndPositions())
+
+    ## Gets what to draw for each laser, without drawing it.
+    ## \return  A list with an (image, top-left position) two-tuple for each laser.
+    def GetImagesAndPositions(self):
+        # Lasers are drawn in relation to their top-left corner.
+        return [(laser.Image, laser.TopLeftCornerPosition) for laser in self]
+
+    ## Predicts when a laser will hit a wall or leave the map, and queues its removal for that time.
+    ## \param[in]   laser - The active Laser to predict the impact of.
+    def __PredictImpact(self, laser):
+        distance_until_impact_in_pixels = self.Map.GetDistanceUntilWallImpact(laser.TopLeftPosition, laser.Trajectory)
+        time_until_impact_in_seconds = distance_until_impact_in_pixels / Laser.MOVE_SPEED_IN_PIXELS_PER_SECOND
+        laser.ImpactTimeInSeconds = self.ElapsedTimeInSeconds + time_until_impact_in_seconds
+        self.__ImpactCount += 1
+        heappush(self.__Impacts, (laser.ImpactTimeInSeconds, self.__ImpactCount, laser))
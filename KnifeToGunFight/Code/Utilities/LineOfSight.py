@@ -0,0 +1,128 @@
+## Checks which grid cells can see each other past the walls of a map.
+## Visibility is found by casting a ray between the centers of two cells the first time they're checked,
+## after which the result is cached, since the same few actors check whether they can see each other over
+## and over.  Only pairs that are actually checked are cast, so the cost doesn't grow with the size of the
+## map.  The cache holds at most a fixed number of pairs and is emptied once full, since the pairs being
+## checked change as the actors move around.  The walls are read from the grid whenever a ray is cast, so
+## Clear() must be called whenever the walls change.
+class LineOfSight(object):
+    ## The default maximum number of pairs of cells whose visibility is cached.
+    DEFAULT_CACHE_CAPACITY = 16384
+
+    ## Constructor.
+    ## \param[in]   wall_grid - A sequence in row-major order of whether each cell contains a wall.
+    ##      It isn't copied, so changes to the walls are seen once Clear() is called.
+    ## \param[in]   width - The number of columns in the grid.
+    ## \param[in]   height - The number of rows in the grid.
+    ## \param[in]   cache_capacity - The maximum number of pairs of cells whose visibility is cached.
+    def __init__(self, wall_grid, width, height, cache_capacity = DEFAULT_CACHE_CAPACITY):
+        ## The number of columns in the grid.
+        self.Width = width
+        ## The number of rows in the grid.
+        self.Height = height
+        ## The maximum number of pairs of cells whose visibility is cached.
+        self.CacheCapacity = cache_capacity
+        ## The number of rays that have been cast.
+        self.RayCount = 0
+        ## Whether each cell contains a wall, in row-major order.
+        self.__WallGrid = wall_grid
+        ## Whether each pair of cells can see each other, keyed by (lower cell index * cell count) + higher cell index.
+        ## Visibility is symmetric, so each pair is only cached once.
+        self.__VisibilityPerPair = {}
+
+    ## Discards all cached visibility, so that it's found again from the current walls.
+    def Clear(self):
+        self.__VisibilityPerPair.clear()
+
+    ## Checks if two grid positions can see each other.
+    ## \param[in]   from_grid_position - The (column, row) two-tuple of one grid position.
+    ## \param[in]   to_grid_position - The (column, row) two-tuple of the other grid position.
+    ## \return  True if a straight line between the centers of the cells doesn't touch a wall; false
+    ##      otherwise, or if either position is outside of the grid.
+    def IsVisible(self, from_grid_position, to_grid_position):
+        # CHECK THAT BOTH POSITIONS ARE IN THE GRID.
+        from_column_index, from_row_index = from_grid_position
+        to_column_index, to_row_index = to_grid_position
+        from_in_grid = (0 <= from_column_index < self.Width) and (0 <= from_row_index < self.Height)
+        to_in_grid = (0 <= to_column_index < self.Width) and (0 <= to_row_index < self.Height)
+        if not (from_in_grid and to_in_grid):
+            return False
+
+        # CHECK IF THE PAIR IS ALREADY CACHED.
+        from_cell_index = (from_row_index * self.Width) + from_column_index
+        to_cell_index = (to_row_index * self.Width) + to_column_index
+        pair_key = (min(from_cell_index, to_cell_index) * self.Width * self.Height) + max(from_cell_index, to_cell_index)
+        visible = self.__VisibilityPerPair.get(pair_key)
+        if visible is not None:
+            return visible
+
+        # CAST A RAY BETWEEN THE CELLS.
+        # Cells containing walls can't see or be seen by anything.
+        # The ray is always cast from the lower cell so that the result doesn't depend on the order of the cells.
+        if self.__WallGrid[from_cell_index] or self.__WallGrid[to_cell_index]:
+            visible = False
+        elif from_cell_index < to_cell_index:
+            self.RayCount += 1
+            visible = LineOfSight.__RayIsClear(self.__WallGrid, self.Width, from_grid_position, to_grid_position)
+        else:
+            self.RayCount += 1
+            visible = LineOfSight.__RayIsClear(self.__WallGrid, self.Width, to_grid_position, from_grid_position)
+
+        # CACHE THE RESULT.
+        if len(self.__VisibilityPerPair) >= self.CacheCapacity:
+            self.__VisibilityPerPair.clear()
+        self.__VisibilityPerPair[pair_key] = visible
+        return visible
+
+    ## Checks if a straight line between the centers of two cells passes only through cells without walls.
+    ## Every cell the line touches is checked (a "supercover" line), rather than just one cell per column
+    ## or row like a Bresenham line, since lasers have width and shouldn't be aimed past the corners of walls.
+    ## Where the line passes exactly through the corner of a cell, both cells beside the corner are checked.
+    ## \param[in]   wall_grid - A sequence in row-major order of whether each cell contains a wall.
+    ## \param[in]   width - The number of columns in the grid.
+    ## \param[in]   from_grid_position - The (column, row) two-tuple of the start of the line.
+    ## \param[in]   to_grid_position - The (column, row) two-tuple of the end of the line.
+    ## \return  True if the line doesn't touch a wall; false otherwise.
+    @staticmethod
+    def __RayIsClear(wall_grid, width, from_grid_position, to_grid_position):
+        # DETERMINE HOW FAR THE LINE GOES IN EACH DIRECTION.
+        column_index, row_index = from_grid_position
+        to_column_index, to_row_index = to_grid_position
+        column_delta = abs(to_column_index - column_index)
+        row_delta = abs(to_row_index - row_index)
+        column_step = 1 if (to_column_index > column_index) else -1
+        row_step = width if (to_row_index > row_index) else -width
+
+        # STEP THROUGH EACH CELL THE LINE PASSES THROUGH.
+        # The error tracks which cell boundary the line crosses next, scaled by two so that
+        # it stays an integer even though the line starts and ends at the centers of cells.
+        cell_index = (row_index * width) + column_index
+        error = column_delta - row_delta
+        column_delta *= 2
+        row_delta *= 2
+        remaining_step_count = (column_delta + row_delta) // 2
+        while remaining_step_count > 0:
+            if error > 0:
+                # The line crosses into the next column.
+                cell_index += column_step
+                error -= row_delta
+                remaining_step_count -= 1
+            elif error < 0:
+                # The line crosses into the next row.
+                cell_index += row_step
+                error += column_delta
+                remaining_step_count -= 1
+            else:
+                # The line passes exactly through a corner, so it touches both cells beside it.
+                if wall_grid[cell_index + column_step] or wall_grid[cell_index + row_step]:
+                    return False
+                cell_index += column_step + row_step
+                error += column_delta - row_delta
+                remaining_step_count -= 2
+
+            # CHECK IF THE CELL CONTAINS A WALL.
+            # The last cell is the destination, which isn't checked since it's never a wall.
+            if (remaining_step_count > 0) and wall_grid[cell_index]:
+                return False
+
+        return True
@@ -0,0 +1,152 @@
+from heapq import heappush, heappop
+import time
+
+## Spreads path searches across frames so that pathfinding stays within a fixed amount of time per frame.
+## Rather than searching for paths immediately, requesters queue requests, which are serviced at the end of
+## each frame until the frame's time budget runs out.  Requests are serviced in the order they were made
+## (so every requester gets a turn), with requests made on the same frame serviced in order of how close
+## the requester is to its destination.  While waiting, requesters keep following the last path found for them.
+##
+## A search is only started if it's expected to fit in what's left of the budget.  If the next search doesn't
+## fit, the unused budget is carried over to the following frames until it does, so even a search expected to
+## take longer than a whole frame's budget eventually runs.  Time spent beyond the budget, such as by a search
+## that took longer than expected, is likewise taken out of the following frames' budgets.
+class PathRequestScheduler(object):
+    ## The default maximum time to spend searching for paths each frame, in milliseconds.
+    DEFAULT_BUDGET_IN_MILLISECONDS = 2.0
+    ## How quickly the estimated cost of a search adapts to the cost of recent searches, from 0 to 1.
+    COST_ESTIMATE_SMOOTHING_FACTOR = 0.2
+
+    ## Constructor.
+    ## \param[in]   find_path - The function to search for paths with.  It's passed the requester, the start
+    ##      and the destination, and must return a list of Vector2 grid positions from the start to the
+    ##      destination (or at least the first part of that path), or None if no path could be found.
+    ## \param[in]   budget_in_milliseconds - The maximum time to spend searching for paths each frame.
+    def __init__(self, find_path, budget_in_milliseconds = DEFAULT_BUDGET_IN_MILLISECONDS):
+        ## The function to search for paths with.
+        self.FindPath = find_path
+        ## The maximum time to spend searching for paths each frame, in milliseconds.
+        self.BudgetInMilliseconds = budget_in_milliseconds
+        ## The number of frames that requests have been serviced for.
+        self.FrameCount = 0
+        ## The estimated time a single search takes, in milliseconds, based on recent searches.
+        self.EstimatedCostInMilliseconds = 0.0
+        ## The number of requests that have been serviced.
+        self.ServicedRequestCount = 0
+        ## The number of frames where requests were left waiting because the budget ran out.
+        self.OverBudgetFrameCount = 0
+        ## The budget carried over from previous frames, in milliseconds.  It's positive while a search is waiting
+        ## for enough budget to build up, or negative if previous frames took longer than their budget.
+        self.CarriedOverBudgetInMilliseconds = 0.0
+
+        # INITIALIZE THE QUEUE.
+        ## The arguments of each requester's queued request, as (sequence number, start, destination, map version).
+        self.__PendingRequests = {}
+        ## The priority queue of requests, as (frame requested, distance, sequence number, requester) tuples.
+        ## Requests aren't removed from the heap when they're updated or forgotten, so entries whose
+        ## sequence number doesn't match the requester's pending request are out of date and skipped.
+        self.__Queue = []
+        ## The number of requests that have ever been queued, used to give each request a unique sequence number.
+        self.__RequestCount = 0
+        ## The last path found for each requester, as (path, index of each grid position along the path,
+        ## destination, map version) tuples.
+        self.__Paths = {}
+
+    ## Gets the number of requests waiting to be serviced.
+    def __len__(self):
+        return len(self.__PendingRequests)
+
+    ## Requests a path and gets the next grid position to move to along the last path found for the requester.
+    ## A new search is only queued if the last path is out of date.
+    ## \param[in]   requester - The object the path is for.  Each requester has at most one queued request.
+    ## \param[in]   start_grid_position - The start as a Vector2 of column and row index.
+    ## \param[in]   destination_grid_position - The destination as a Vector2 of column and row index.
+    ## \param[in]   map_version - The version of the map the path should be found on, such as LevelMap.StaticVersion.
+    ##      The last path is searched for again once the version changes.
+    ## \param[in]   distance_to_destination - How far the requester is from the destination, used to service
+    ##      requests from closer requesters first.
+    ## \return  The next grid position as a Vector2 of column and row index, or None if the last path doesn't
+    ##      pass through the start.
+    def RequestPath(self, requester, start_grid_position, destination_grid_position, map_version, distance_to_destination):
+        # CHECK IF THE LAST PATH IS STILL UP TO DATE.
+        start = start_grid_position.AsXYTuple()
+        destination = destination_grid_position.AsXYTuple()
+        path, index_per_grid_position, path_destination, path_map_version = self.__Paths.get(requester, (None, {}, None, None))
+        start_path_index = index_per_grid_position.get(start)
+        path_up_to_date = (
+            (start_path_index is not None) and
+            (path_destination == destination) and
+            (path_map_version == map_version))
+
+        # QUEUE A NEW SEARCH IF NEEDED.
+        if not path_up_to_date:
+            self.__RequestCount += 1
+            pending_request = self.__PendingRequests.get(requester)
+            if pending_request is None:
+                heappush(self.__Queue, (self.FrameCount, distance_to_destination, self.__RequestCount, requester))
+                sequence_number = self.__RequestCount
+            else:
+                # The request keeps its place in the queue, but is updated with the latest positions.
+                sequence_number = pending_request[0]
+            self.__PendingRequests[requester] = (sequence_number, start_grid_position, destination_grid_position, map_version)
+
+        # FOLLOW THE LAST PATH.
+        if (start_path_index is None) or (start_path_index + 1 >= len(path)):
+            return None
+        return path[start_path_index + 1]
+
+    ## Services queued requests until the frame's time budget runs out.
+    ## A search is only started if it's expected to finish within the budget left for the frame.
+    def ServiceRequests(self):
+        # DETERMINE THE BUDGET FOR THIS FRAME.
+        MILLISECONDS_PER_SECOND = 1000
+        frame_start_time_in_seconds = time.perf_counter()
+        frame_budget_in_milliseconds = self.BudgetInMilliseconds + self.CarriedOverBudgetInMilliseconds
+
+        # SERVICE REQUESTS IN ORDER.
+        while self.__Queue:
+            # SKIP THE REQUEST IF IT'S OUT OF DATE.
+            frame_requested, distance_to_destination, sequence_number, requester = self.__Queue[0]
+            pending_request = self.__PendingRequests.get(requester)
+            if (pending_request is None) or (pending_request[0] != sequence_number):
+                heappop(self.__Queue)
+                continue
+
+            # STOP IF THE SEARCH ISN'T EXPECTED TO FINISH WITHIN THE BUDGET.
+            elapsed_time_in_milliseconds = (time.perf_counter() - frame_start_time_in_seconds) * MILLISECONDS_PER_SECOND
+            expected_time_in_milliseconds = elapsed_time_in_milliseconds + self.EstimatedCostInMilliseconds
+            if expected_time_in_milliseconds > frame_budget_in_milliseconds:
+                self.OverBudgetFrameCount += 1
+                break
+
+            # SEARCH FOR THE PATH.
+            heappop(self.__Queue)
+            del self.__PendingRequests[requester]
+            _, start_grid_position, destination_grid_position, map_version = pending_request
+            search_start_time_in_seconds = time.perf_counter()
+            path = self.FindPath(requester, start_grid_position, destination_grid_position) or []
+            search_time_in_milliseconds = (time.perf_counter() - search_start_time_in_seconds) * MILLISECONDS_PER_SECOND
+            index_per_grid_position = {grid_position.AsXYTuple(): path_index for path_index, grid_position in enumerate(path)}
+            self.__Paths[requester] = (path, index_per_grid_position, destination_grid_position.AsXYTuple(), map_version)
+            self.ServicedRequestCount += 1
+
+            # UPDATE THE ESTIMATED COST OF A SEARCH.
+            self.EstimatedCostInMilliseconds += PathRequestScheduler.COST_ESTIMATE_SMOOTHING_FACTOR * (
+                search_time_in_milliseconds - self.EstimatedCostInMilliseconds)
+
+        # CARRY THE REST OF THE BUDGET OVER TO THE NEXT FRAME.
+        # Unused budget is only saved up while requests are waiting, so that idle frames can't
+        # build up enough budget for a burst of searches later, but overspending is always repaid.
+        elapsed_time_in_milliseconds = (time.perf_counter() - frame_start_time_in_seconds) * MILLISECONDS_PER_SECOND
+        remaining_budget_in_milliseconds = frame_budget_in_milliseconds - elapsed_time_in_milliseconds
+        if self.__PendingRequests:
+            self.CarriedOverBudgetInMilliseconds = remaining_budget_in_milliseconds
+        else:
+            self.CarriedOverBudgetInMilliseconds = min(0.0, remaining_budget_in_milliseconds)
+        self.FrameCount += 1
+
+    ## Discards any queued request and last path for a requester.
+    ## \param[in]   requester - The object to forget about.
+    def Forget(self, requester):
+        self.__PendingRequests.pop(requester, None)
+        self.__Paths.pop(requester, None)
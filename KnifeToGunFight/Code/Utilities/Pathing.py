@@ -1,7 +1,32 @@
+from enum import Enum
 import math
 
 from Math.Vector2 import Vector2
 from ThirdParty.astar import AStar
+from Utilities.GridSearch import GridAStar, JumpPointSearch
+
+## The ways enemies can find their way to the player.
+class EnemyPathingMode(Enum):
+    ## Each enemy searches for its own path to the player.
+    Search = 1
+    ## All enemies share a single FlowField leading to the player.
+    FlowField = 2
+    ## Each enemy keeps its own IncrementalPlanner, which repairs its previous
+    ## path as the enemy, the player and the map change.
+    IncrementalSearch = 3
+    ## All enemies share a HierarchicalPathfinder, which is intended for large maps.
+    Hierarchical = 4
+    ## All enemies share a BackgroundFlowField leading to the player, which is built on a worker thread.
+    BackgroundFlowField = 5
+
+## The algorithms Pathing can use to search for paths.
+class PathingEngine(Enum):
+    ## The generic third-party A* search, using Vector2 grid positions.
+    ThirdPartyAStar = 1
+    ## A* specialized for the grid, using integer cell indices.
+    GridAStar = 2
+    ## Jump Point Search specialized for the grid, using integer cell indices.
+    JumpPointSearch = 3
 
 ## Pathfinding class to determine the shortest path between two
 ## positions on the game map.
@@ -9,9 +34,43 @@ from ThirdParty.astar import AStar
 ## \author  Tom Rogan
 ## \date    09/01/2018
 class Pathing(AStar):
-    def __init__(self, level_map):
+    ## The default maximum number of (start, destination) pairs whose paths are cached.
+    DEFAULT_CACHE_CAPACITY = 16384
+
+    ## Constructor.
+    ## \param[in]   level_map - The LevelMap to find paths through.
+    ## \param[in]   engine - The PathingEngine to search for paths with.
+    ## \param[in]   cache_capacity - The maximum number of (start, destination) pairs whose paths are cached.
+    def __init__(self, level_map, engine = PathingEngine.GridAStar, cache_capacity = DEFAULT_CACHE_CAPACITY):
         self.Map = level_map
         self.Destination = None
+        ## The PathingEngine used to search for paths.
+        self.Engine = engine
+        ## The search used by grid-specialized engines.
+        self.GridSearch = JumpPointSearch(level_map) if (PathingEngine.JumpPointSearch == engine) else GridAStar(level_map)
+
+        # INITIALIZE THE PATH CACHE.
+        ## The maximum number of (start, destination) pairs whose paths are cached.  Paths are cached for every
+        ## destination requested, and the player moves to a new destination with nearly every step, so the cache
+        ## is emptied once full rather than being allowed to grow for as long as the walls don't change.
+        self.CacheCapacity = cache_capacity
+        ## Previously found paths, keyed by two-tuples of the (column, row) start and destination positions.
+        ## Each value is a two-tuple of the full path and the index of the start position within it.
+        ## Every path is cached for each position along it since the remainder of a shortest path
+        ## is also the shortest path from that position.
+        self.__CachedPaths = {}
+        ## The LevelMap.StaticVersion the cached paths were found on.  Paths are kept while only actors move,
+        ## since actors moving around rarely block a path, and are checked to still be clear before being used.
+        self.__CachedPathsStaticVersion = None
+        ## The keys of the paths that couldn't be found.  These are only kept until anything on the map
+        ## moves, since an actor moving out of the way may open up a path.
+        self.__UnreachablePaths = set()
+        ## The LevelMap.Version the unreachable paths were searched for on.
+        self.__UnreachablePathsMapVersion = None
+        ## The number of paths that were found in the cache.
+        self.CacheHitCount = 0
+        ## The number of paths that had to be searched for.
+        self.CacheMissCount = 0
 
     ## Determines the shortest path between two positions on the game map.
     ## \param[in] start_grid_position - A grid position as a Vector2 of column and row index.
@@ -21,8 +80,74 @@ class Pathing(AStar):
     ## \author  Tom Rogan
     ## \date    09/01/2018
     def GetPath(self, start_grid_position, destination_grid_position):
-        self.Destination = destination_grid_position
-        return self.astar(start_grid_position, self.Destination)
+        # DISCARD ANY CACHED PATHS IF THE WALLS HAVE CHANGED.
+        if self.Map.StaticVersion != self.__CachedPathsStaticVersion:
+            self.__CachedPaths.clear()
+            self.__CachedPathsStaticVersion = self.Map.StaticVersion
+        if self.Map.Version != self.__UnreachablePathsMapVersion:
+            self.__UnreachablePaths.clear()
+            self.__UnreachablePathsMapVersion = self.Map.Version
+
+        # USE A CACHED RESULT IF ONE IS AVAILABLE.
+        # Entities usually take many frames to cross a single grid position,
+        # so the same path is often requested over and over.
+        cache_key = (start_grid_position.AsXYTuple(), destination_grid_position.AsXYTuple())
+        if cache_key in self.__UnreachablePaths:
+            self.CacheHitCount += 1
+            return None
+        cached_path = self.__CachedPaths.get(cache_key)
+        if (cached_path is not None) and self.__IsPathClear(*cached_path):
+            self.CacheHitCount += 1
+            path, start_index = cached_path
+            # A copy is returned so the cached path can't be modified.
+            return path[start_index:]
+
+        # SEARCH FOR THE PATH.
+        self.CacheMissCount += 1
+        if PathingEngine.ThirdPartyAStar == self.Engine:
+            self.Destination = destination_grid_position
+            path = self.astar(start_grid_position, self.Destination)
+        else:
+            path = self.GridSearch.FindPath(start_grid_position.AsXYTuple(), destination_grid_position.AsXYTuple())
+            if path is not None:
+                path = [Vector2(column_index, row_index) for column_index, row_index in path]
+        if path is None:
+            if len(self.__UnreachablePaths) >= self.CacheCapacity:
+                self.__UnreachablePaths.clear()
+            self.__UnreachablePaths.add(cache_key)
+            return None
+
+        # CACHE THE PATH FROM EACH POSITION ALONG IT.
+        # Only as many positions as fit in the cache are cached, starting from the start since the
+        # positions the requester reaches first are the ones it will request paths from next.
+        path = list(path)
+        cached_position_count = min(len(path), self.CacheCapacity)
+        if len(self.__CachedPaths) + cached_position_count > self.CacheCapacity:
+            self.__CachedPaths.clear()
+        for path_index, grid_position in enumerate(path[:cached_position_count]):
+            self.__CachedPaths[(grid_position.AsXYTuple(), cache_key[1])] = (path, path_index)
+        return path[:]
+
+    ## Gets the number of (start, destination) pairs whose paths are cached.
+    @property
+    def CachedPathCount(self):
+        return len(self.__CachedPaths) + len(self.__UnreachablePaths)
+
+    ## Discards all cached paths, so that the next path requested for any positions will be searched for.
+    def ClearCache(self):
+        self.__CachedPaths.clear()
+        self.__UnreachablePaths.clear()
+
+    ## Checks if a cached path is still clear of other objects.
+    ## The start and destination are allowed to be occupied, as they are when the path was found.
+    ## \param[in]   path - The full path as a list of Vector2 grid positions.
+    ## \param[in]   start_index - The index of the start position within the path.
+    ## \return  True if none of the positions between the start and destination are occupied; false otherwise.
+    def __IsPathClear(self, path, start_index):
+        for grid_position in path[start_index + 1:-1]:
+            if grid_position in self.Map.Map:
+                return False
+        return True
 
     ## Determines the direct distance between two positions on the game map.
     ## \param[in] start_grid_position - A grid position as a Vector2 of column and row index.
@@ -57,17 +182,20 @@ class Pathing(AStar):
     ## \date    09/01/2018
     def neighbors(self, grid_position):
         # Get the possible neighbors of the position.
+        # The components are unpacked once since vectors are (x, y) tuples.
+        column_index, row_index = grid_position
         neighbors = [
-            Vector2(grid_position.X, grid_position.Y - 1),
-            Vector2(grid_position.X, grid_position.Y + 1),
-            Vector2(grid_position.X - 1, grid_position.Y),
-            Vector2(grid_position.X + 1, grid_position.Y)]
+            Vector2(column_index, row_index - 1),
+            Vector2(column_index, row_index + 1),
+            Vector2(column_index - 1, row_index),
+            Vector2(column_index + 1, row_index)]
         accessible_neighbors = []
         for neighbor in neighbors:
             # Check whether this position is within map bounds and unoccupied.
-            in_x_bounds = (0 <= neighbor.X < self.Map.MapWidth)
-            in_y_bounds = (0 <= neighbor.Y < self.Map.MapHeight)
-            unoccupied = (neighbor.X, neighbor.Y) not in self.Map.Map
+            neighbor_column_index, neighbor_row_index = neighbor
+            in_x_bounds = (0 <= neighbor_column_index < self.Map.MapWidth)
+            in_y_bounds = (0 <= neighbor_row_index < self.Map.MapHeight)
+            unoccupied = neighbor not in self.Map.Map
             is_destination = (neighbor == self.Destination)
             if in_x_bounds and in_y_bounds and (unoccupied or is_destination):
                 accessible_neighbors.append(neighbor)
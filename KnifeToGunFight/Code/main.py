@@ -2,8 +2,31 @@ import os
 import pygame
 
 from GameWindow import GameWindow
+from Graphics.AssetManager import AssetManager
 from StateHandlers.MainMenuHandler import MainMenuHandler
 
+## The images of the game's sprites, which are packed together into a single texture atlas.
+## The much larger menu screens are loaded from their own files.
+SPRITE_IMAGE_FILEPATHS = [
+    '../Images/BlueLaser.gif',
+    '../Images/GreenLaser.gif',
+    '../Images/LittleRobot.gif',
+    '../Images/Player.gif',
+    '../Images/RedLaser.gif',
+    '../Images/Sword.gif',
+    '../Images/Teleporter1.gif',
+    '../Images/Teleporter2.gif',
+    '../Images/Teleporter3.gif',
+    '../Images/Teleporter4.gif',
+    '../Images/Teleporter5.gif',
+    '../Images/Teleporter6.gif',
+    '../Images/Turret.gif',
+    '../Images/Wall.gif']
+## The filepath of the saved texture atlas.  It's packed the first time the game is run, or whenever a sprite image changes.
+ATLAS_FILEPATH = '../Images/SpriteAtlas.png'
+## The filepath of the index of where each sprite image is in the saved texture atlas.
+ATLAS_INDEX_FILEPATH = '../Images/SpriteAtlas.json'
+
 ## Handles the main execution of the game.
 ## \author  Michael Watkinson
 ## \date    09/01/2018
@@ -12,9 +35,13 @@ def RunGame():
     pygame.init()
     WIDTH = 1024
     HEIGHT = 720
-    game_window = GameWindow(WIDTH, HEIGHT)
+    game_window = GameWindow(WIDTH, HEIGHT, use_dirty_rectangles = True, use_sprite_groups = True)
     pygame.mixer.init()
 
+    # LOAD THE SPRITE IMAGES.
+    # This must be done after the game window is created, since the images are converted to its pixel format.
+    AssetManager.LoadAtlas(SPRITE_IMAGE_FILEPATHS, ATLAS_FILEPATH, ATLAS_INDEX_FILEPATH)
+
     # ENTER THE GAME MAIN LOOP.
     current_state = MainMenuHandler(game_window)
     while True: